@@ -0,0 +1,179 @@
+"""initial schema
+
+The tables as first shipped, before any migration existed. Databases that
+were created by `create_db_and_tables` at that point should be stamped
+with this revision (`alembic stamp 5b1d0c2a7e31`) and then upgraded.
+
+Revision ID: 5b1d0c2a7e31
+Revises:
+Create Date: 2026-10-18 13:56:09.143247
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1d0c2a7e31"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    string = sqlmodel.sql.sqltypes.AutoString
+    op.create_table(
+        "businesses",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("legal_name", string(), nullable=False),
+        sa.Column("display_name", string(), nullable=False),
+        sa.Column("logo_url", string(), nullable=True),
+        sa.Column("registration_number", string(), nullable=True),
+        sa.Column("gstn", string(), nullable=True),
+        sa.Column("address", string(), nullable=True),
+        sa.Column("contact_mobile", string(), nullable=True),
+        sa.Column("contact_email", string(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("full_name", string(), nullable=False),
+        sa.Column("mobile", string(), nullable=False),
+        sa.Column("email", string(), nullable=True),
+        sa.Column("location", string(), nullable=True),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("gender", string(), nullable=True),
+        sa.Column("address", string(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_customers_mobile", "customers", ["mobile"])
+    op.create_table(
+        "providers",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("name", string(), nullable=False),
+        sa.Column("status", string(), nullable=False),
+        sa.Column("bio", string(), nullable=True),
+        sa.Column("contact_mobile", string(), nullable=True),
+        sa.Column("contact_email", string(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_providers_status", "providers", ["status"])
+    op.create_table(
+        "availability_configs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("provider_id", sa.Uuid(), nullable=False),
+        sa.Column("month", string(), nullable=False),
+        sa.Column("weekly_template", sa.JSON(), nullable=True),
+        sa.Column("exceptions", sa.JSON(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["provider_id"], ["providers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("provider_id", "month"),
+    )
+    op.create_index("ix_availability_configs_month", "availability_configs", ["month"])
+    op.create_index(
+        "ix_availability_configs_provider_id", "availability_configs", ["provider_id"]
+    )
+    op.create_table(
+        "departments",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("name", string(), nullable=False),
+        sa.Column("description", string(), nullable=True),
+        sa.Column("business_id", sa.Uuid(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_departments_name", "departments", ["name"], unique=True)
+    op.create_table(
+        "slots",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("provider_id", sa.Uuid(), nullable=False),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column("end_datetime", sa.DateTime(), nullable=False),
+        sa.Column("price_cents", sa.Integer(), nullable=False),
+        sa.Column("is_booked", sa.Boolean(), nullable=False),
+        sa.Column("calendar_month", string(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["provider_id"], ["providers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_slots_calendar_month", "slots", ["calendar_month"])
+    op.create_index("ix_slots_provider_id", "slots", ["provider_id"])
+    op.create_index("ix_slots_start_datetime", "slots", ["start_datetime"])
+    op.create_table(
+        "appointments",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("slot_id", sa.Uuid(), nullable=False),
+        sa.Column("provider_id", sa.Uuid(), nullable=False),
+        sa.Column("customer_id", sa.Uuid(), nullable=False),
+        sa.Column("status", string(), nullable=False),
+        sa.Column("notes", string(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"]),
+        sa.ForeignKeyConstraint(["provider_id"], ["providers.id"]),
+        sa.ForeignKeyConstraint(["slot_id"], ["slots.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("slot_id"),
+    )
+    op.create_index("ix_appointments_created_at", "appointments", ["created_at"])
+    op.create_index("ix_appointments_customer_id", "appointments", ["customer_id"])
+    op.create_index("ix_appointments_provider_id", "appointments", ["provider_id"])
+    op.create_index("ix_appointments_status", "appointments", ["status"])
+    op.create_table(
+        "provider_department_link",
+        sa.Column("provider_id", sa.Uuid(), nullable=False),
+        sa.Column("department_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"]),
+        sa.ForeignKeyConstraint(["provider_id"], ["providers.id"]),
+        sa.PrimaryKeyConstraint("provider_id", "department_id"),
+    )
+    op.create_table(
+        "history_logs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("appointment_id", sa.Uuid(), nullable=False),
+        sa.Column("action", string(), nullable=False),
+        sa.Column("performed_by", string(), nullable=False),
+        sa.Column("user_type", string(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("old_status", string(), nullable=True),
+        sa.Column("new_status", string(), nullable=True),
+        sa.Column("details", string(), nullable=True),
+        sa.ForeignKeyConstraint(["appointment_id"], ["appointments.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_history_logs_appointment_id", "history_logs", ["appointment_id"]
+    )
+    op.create_index("ix_history_logs_timestamp", "history_logs", ["timestamp"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in [
+        "history_logs",
+        "provider_department_link",
+        "appointments",
+        "slots",
+        "departments",
+        "availability_configs",
+        "providers",
+        "customers",
+        "businesses",
+    ]:
+        op.drop_table(table)
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""holiday calendars
+
+availability_configs.holiday_calendar names the calendar of closed dates
+applied to a provider's weekly template (see app/store/availability_rules.py).
+Nullable, so existing configs keep their current availability.
+
+Revision ID: a9d3e5c71f04
+Revises: f3a1c9d5b7e2
+Create Date: 2026-10-18 17:20:13.604217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5c71f04"
+down_revision: Union[str, Sequence[str], None] = "f3a1c9d5b7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "availability_configs",
+        sa.Column(
+            "holiday_calendar", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("availability_configs") as batch_op:
+        batch_op.drop_column("holiday_calendar")
\ No newline at end of file
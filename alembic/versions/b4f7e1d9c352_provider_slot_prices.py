@@ -0,0 +1,36 @@
+"""provider slot prices
+
+providers.slot_price_cents is the price of a provider's slots whose
+availability rule sets none, so it no longer has to be inferred from the
+stored slots. Nullable; NULL keeps the default price.
+
+Revision ID: b4f7e1d9c352
+Revises: a9d3e5c71f04
+Create Date: 2026-10-18 19:05:41.220817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4f7e1d9c352"
+down_revision: Union[str, Sequence[str], None] = "a9d3e5c71f04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "providers",
+        sa.Column("slot_price_cents", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("providers") as batch_op:
+        batch_op.drop_column("slot_price_cents")
@@ -0,0 +1,111 @@
+"""hot path indexes
+
+Composite and partial indexes shaped after the repository's range queries
+(see tests/test_query_plans.py):
+
+- slots (provider_id, start_datetime): a provider's slots in a window,
+  ordered by time.
+- slots (provider_id, is_booked, start_datetime): the same, booked or free.
+- appointments (customer_id, provider_id) WHERE status is active: the
+  overlap check for a customer with a provider.
+- appointments (status, created_at): appointments by status in a range.
+
+The single-column slots.provider_id and appointments.status indexes are
+left-prefixes of these and are dropped. appointments.slot_id loses its
+table-wide UNIQUE constraint in favour of a partial unique index over
+non-cancelled appointments, so a cancelled slot can be booked again.
+
+Revision ID: c7e4a9f2d810
+Revises: 5b1d0c2a7e31
+Create Date: 2026-10-18 14:10:41.502118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e4a9f2d810"
+down_revision: Union[str, Sequence[str], None] = "5b1d0c2a7e31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_APPOINTMENT_CLAUSE = "status IN ('Pending', 'Confirmed')"
+# SQLite reports the inline UNIQUE(slot_id) without a name; batch mode
+# needs one to drop it.
+SQLITE_NAMING = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _partial(clause: str) -> dict:
+    return {
+        "sqlite_where": sa.text(clause),
+        "postgresql_where": sa.text(clause),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table(
+            "appointments", naming_convention=SQLITE_NAMING
+        ) as batch_op:
+            batch_op.drop_constraint("uq_appointments_slot_id", type_="unique")
+    else:
+        op.drop_constraint("appointments_slot_id_key", "appointments", type_="unique")
+    op.create_index("ix_appointments_slot_id", "appointments", ["slot_id"])
+    op.create_index(
+        "uq_appointments_active_slot",
+        "appointments",
+        ["slot_id"],
+        unique=True,
+        **_partial("status != 'Cancelled'"),
+    )
+    op.create_index(
+        "ix_appointments_customer_provider_active",
+        "appointments",
+        ["customer_id", "provider_id"],
+        **_partial(ACTIVE_APPOINTMENT_CLAUSE),
+    )
+    op.create_index(
+        "ix_appointments_status_created", "appointments", ["status", "created_at"]
+    )
+    op.drop_index("ix_appointments_status", table_name="appointments")
+    op.create_index(
+        "ix_slots_provider_start", "slots", ["provider_id", "start_datetime"]
+    )
+    op.create_index(
+        "ix_slots_provider_booked_start",
+        "slots",
+        ["provider_id", "is_booked", "start_datetime"],
+    )
+    op.drop_index("ix_slots_provider_id", table_name="slots")
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Fails if a cancelled slot has since been booked again, since the
+    table-wide UNIQUE(slot_id) cannot hold then.
+    """
+    op.create_index("ix_slots_provider_id", "slots", ["provider_id"])
+    op.drop_index("ix_slots_provider_booked_start", table_name="slots")
+    op.drop_index("ix_slots_provider_start", table_name="slots")
+    op.create_index("ix_appointments_status", "appointments", ["status"])
+    for index in [
+        "ix_appointments_status_created",
+        "ix_appointments_customer_provider_active",
+        "uq_appointments_active_slot",
+        "ix_appointments_slot_id",
+    ]:
+        op.drop_index(index, table_name="appointments")
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table(
+            "appointments", naming_convention=SQLITE_NAMING
+        ) as batch_op:
+            batch_op.create_unique_constraint("uq_appointments_slot_id", ["slot_id"])
+    else:
+        op.create_unique_constraint(
+            "appointments_slot_id_key", "appointments", ["slot_id"]
+        )
\ No newline at end of file
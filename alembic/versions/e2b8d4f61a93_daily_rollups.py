@@ -0,0 +1,49 @@
+"""daily rollups
+
+Per provider and day report figures: booked and available slots,
+completed, cancelled and no-show counts and completed revenue. The store
+keeps them current on every booking, status change and reschedule. Rows
+are filled by `python -m app.db.rollups`, or automatically the first time
+the SQL backend loads a database that has appointments but no rollups.
+
+Revision ID: e2b8d4f61a93
+Revises: c7e4a9f2d810
+Create Date: 2026-10-18 14:21:07.318420
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b8d4f61a93"
+down_revision: Union[str, Sequence[str], None] = "c7e4a9f2d810"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("provider_id", sa.Uuid(), nullable=False),
+        sa.Column("business_id", sa.Uuid(), nullable=False),
+        sa.Column("booked_slots", sa.Integer(), nullable=False),
+        sa.Column("available_slots", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("cancelled", sa.Integer(), nullable=False),
+        sa.Column("no_shows", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"]),
+        sa.ForeignKeyConstraint(["provider_id"], ["providers.id"]),
+        sa.PrimaryKeyConstraint("day", "provider_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_rollups")
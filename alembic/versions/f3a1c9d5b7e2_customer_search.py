@@ -0,0 +1,72 @@
+"""customer search
+
+Substring search over customer names and mobiles. On SQLite an
+external-content FTS5 table with the trigram tokenizer, kept in sync by
+triggers and filled from the existing rows; on Postgres pg_trgm GIN
+indexes on lower(full_name) and mobile. The statements match
+CUSTOMER_SEARCH_DDL in app/db/models.py, which creates the same objects
+for databases built with create_all.
+
+Revision ID: f3a1c9d5b7e2
+Revises: e2b8d4f61a93
+Create Date: 2026-10-18 15:02:44.910385
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a1c9d5b7e2"
+down_revision: Union[str, Sequence[str], None] = "e2b8d4f61a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE customers_fts USING fts5(full_name, mobile, "
+    "content='customers', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER customers_fts_insert AFTER INSERT ON customers BEGIN "
+    "INSERT INTO customers_fts(rowid, full_name, mobile) "
+    "VALUES (new.rowid, new.full_name, new.mobile); END",
+    "CREATE TRIGGER customers_fts_delete AFTER DELETE ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, full_name, mobile) "
+    "VALUES ('delete', old.rowid, old.full_name, old.mobile); END",
+    "CREATE TRIGGER customers_fts_update AFTER UPDATE ON customers BEGIN "
+    "INSERT INTO customers_fts(customers_fts, rowid, full_name, mobile) "
+    "VALUES ('delete', old.rowid, old.full_name, old.mobile); "
+    "INSERT INTO customers_fts(rowid, full_name, mobile) "
+    "VALUES (new.rowid, new.full_name, new.mobile); END",
+    "INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER customers_fts_update",
+    "DROP TRIGGER customers_fts_delete",
+    "DROP TRIGGER customers_fts_insert",
+    "DROP TABLE customers_fts",
+]
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_customers_full_name_trgm ON customers "
+    "USING gin (lower(full_name) gin_trgm_ops)",
+    "CREATE INDEX ix_customers_mobile_trgm ON customers "
+    "USING gin (mobile gin_trgm_ops)",
+]
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX ix_customers_mobile_trgm",
+    "DROP INDEX ix_customers_full_name_trgm",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    for statement in SQLITE_UPGRADE if sqlite else POSTGRES_UPGRADE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    for statement in SQLITE_DOWNGRADE if sqlite else POSTGRES_DOWNGRADE:
+        op.execute(statement)
\ No newline at end of file
@@ -14,7 +14,12 @@ from app.pages import (
     archived_providers,
     customer_profile,
 )
-from app.db import create_db_and_tables, seed_database
+from app.db.instrumentation import (
+    DB_INSTRUMENTATION,
+    QueryMetricsMiddleware,
+    metrics_api,
+)
+from app.store import preload_store
 
 
 def page_layout(page_content: rx.Component) -> rx.Component:
@@ -46,7 +51,11 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=metrics_api(),
 )
+if DB_INSTRUMENTATION:
+    app.add_middleware(QueryMetricsMiddleware())
+app.register_lifespan_task(preload_store)
 app.add_page(index, route="/", title="Dashboard | Appointment Manager")
 app.add_page(
     lambda: page_layout(calendar.calendar_page()),
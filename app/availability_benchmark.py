@@ -0,0 +1,181 @@
+"""Times expanding availability rules for many providers the way the store does.
+
+    python -m app.availability_benchmark [--providers 1000] [--days 365] [--max-seconds 1.0] [--max-slot-micros 5.0]
+
+Builds synthetic configs from the generator's weekly templates, with a
+45-minute priced rule plus buffer on every third provider, six closed
+dates each and a holiday calendar on every other one. Then times:
+
+- expanding every provider's rules over `--days` days: compiling each
+  config version through rules_for and streaming each day's slots (start
+  offset, length, id suffix and price) from AvailabilityRules.day_slots;
+- expanding `--days` days into the availability bitmap, as the store
+  does at startup: versioning the configs and setting every provider's
+  offered slots from the compiled rules;
+- streaming every provider's Slot records through expand_slots over the
+  booking horizon, one call per AvailabilityVersions span as
+  get_provider_slots makes them. Slot dicts are only built for that
+  window, so this is reported per slot.
+
+Exits non-zero if the rule expansion or the bitmap takes longer than
+`--max-seconds`, a Slot record takes longer than `--max-slot-micros` on
+average, or the streams and the bitmap disagree on the number of slots.
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+from app.db.synthetic import WEEKLY_TEMPLATES
+from app.store.availability_bits import AvailabilityBitmap
+from app.store.availability_versions import AvailabilityVersions, month_of
+from app.store.availability_rules import (
+    as_rule,
+    register_holiday_calendar,
+    rules_for,
+)
+from app.store.slot_engine import (
+    DEFAULT_SLOT_PRICE_CENTS,
+    booking_horizon,
+    expand_slots,
+    parse_weekly_template,
+)
+
+LONG_RULE = (
+    "13:00:00",
+    "17:00:00",
+    {"duration_minutes": 45, "buffer_minutes": 15, "price_cents": 9000},
+)
+
+
+def synthetic_configs(providers: int, first: date, days: int) -> list[dict]:
+    register_holiday_calendar(
+        "benchmark", [first + timedelta(days=d) for d in range(0, days, 61)]
+    )
+    configs = []
+    for i in range(providers):
+        template = parse_weekly_template(WEEKLY_TEMPLATES[i % len(WEEKLY_TEMPLATES)])
+        if i % 3 == 0:
+            template[2] = [as_rule(LONG_RULE)]
+        closed = {first + timedelta(days=(i * 7 + k * 31) % days) for k in range(6)}
+        configs.append(
+            {
+                "provider_id": str(i),
+                "month": month_of(first),
+                "weekly_template": template,
+                "exceptions": {day.isoformat(): [] for day in closed},
+                "holiday_calendar": "benchmark" if i % 2 else None,
+                "updated_at": datetime.now(),
+            }
+        )
+    return configs
+
+
+def timed(label: str, run) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{elapsed:.3f}s")
+    return elapsed, result
+
+
+def spans(versions: AvailabilityVersions, start: datetime, end: datetime):
+    """Yields (provider_id, config, start, end) for each config version's
+    part of [start, end), as get_provider_slots splits a window."""
+    last = (end - timedelta(microseconds=1)).date()
+    for provider_id in versions.providers():
+        for config, first, until in versions.spans(provider_id, start.date(), last):
+            yield (
+                provider_id,
+                config,
+                max(start, datetime.combine(first, datetime.min.time())),
+                min(
+                    end,
+                    datetime.combine(until + timedelta(days=1), datetime.min.time()),
+                ),
+            )
+
+
+def stream_rules(versions: AvailabilityVersions, start: datetime, end: datetime):
+    """Counts every provider's slots starting in [start, end) as the
+    compiled rules stream them, a day of slots at a time."""
+    count = 0
+    for _, config, span_start, span_end in spans(versions, start, end):
+        for _, timed in rules_for(config).day_slots(span_start, span_end):
+            count += len(timed)
+    return count
+
+
+def stream_slots(versions: AvailabilityVersions, start: datetime, end: datetime):
+    """Counts the Slot records of every provider starting in [start, end)."""
+    count = 0
+    for provider_id, config, span_start, span_end in spans(versions, start, end):
+        for _ in expand_slots(
+            provider_id, config, span_start, span_end, DEFAULT_SLOT_PRICE_CENTS
+        ):
+            count += 1
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    parser.add_argument("--max-slot-micros", type=float, default=5.0)
+    args = parser.parse_args()
+    horizon_start, horizon_end = booking_horizon()
+    first = horizon_start.date()
+    configs = synthetic_configs(args.providers, first, args.days)
+    # first, so that it compiles the rules
+    rules_seconds, expanded = timed(
+        "rule expansion",
+        lambda: stream_rules(
+            AvailabilityVersions(configs),
+            horizon_start,
+            horizon_start + timedelta(days=args.days),
+        ),
+    )
+    bitmap_seconds, bitmap = timed(
+        "availability bitmap",
+        lambda: AvailabilityBitmap.build(
+            AvailabilityVersions(configs), [], first, args.days
+        ),
+    )
+    horizon_days = min((horizon_end - horizon_start).days, args.days)
+    offered = int(np.bitwise_count(bitmap.offered[:, :horizon_days]).sum())
+    versions = AvailabilityVersions(configs)
+    end = horizon_start + timedelta(days=horizon_days)
+    stream_seconds, streamed = timed(
+        "expand_slots stream", lambda: stream_slots(versions, horizon_start, end)
+    )
+    micros = stream_seconds / max(streamed, 1) * 1e6
+    print(
+        f"{args.providers} providers: {expanded} slots of {args.days} days "
+        f"expanded in {rules_seconds:.3f}s; {bitmap.nbytes / 2**20:.1f}MB bitmap of "
+        f"{args.days} days in {bitmap_seconds:.3f}s; {streamed} slots over "
+        f"{horizon_days} days streamed at {micros:.2f}us a slot"
+    )
+    failed = False
+    year_offered = int(np.bitwise_count(bitmap.offered).sum())
+    if expanded != year_offered:
+        print(f"the rules expand to {expanded} slots, the bitmap has {year_offered}")
+        failed = True
+    if rules_seconds > args.max_seconds:
+        print(f"the rule expansion took longer than {args.max_seconds}s")
+        failed = True
+    if streamed != offered:
+        print(f"the stream has {streamed} slots, the bitmap {offered}")
+        failed = True
+    if bitmap_seconds > args.max_seconds:
+        print(f"the bitmap took longer than {args.max_seconds}s")
+        failed = True
+    if micros > args.max_slot_micros:
+        print(f"a slot took longer than {args.max_slot_micros}us")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
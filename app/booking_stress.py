@@ -0,0 +1,238 @@
+"""Fires concurrent bookings and status changes at one SQLite file.
+
+    python -m app.booking_stress [--processes 4] [--threads 4] [--slots 100] [--attempts 500]
+
+Creates a fresh database in a temporary directory through the SQL
+backend, then starts `--processes` workers, each loading its own store on
+the file. Every worker makes `--attempts` bookings of the same `--slots`
+slots, half from a pool of `--threads` threads through the blocking path
+and half as concurrent tasks through the async one. It then sends a
+Cancel and a Complete at once to each appointment it won.
+
+Exits non-zero unless:
+
+- every attempt either booked the slot or got a clean conflict error;
+- no slot has more than one appointment that is not cancelled, and the
+  database holds exactly the bookings the workers reported;
+- exactly one of each pair of status changes went through, and the
+  database agrees with the worker's memory on the outcome;
+- each worker's running aggregates equal a recount of its appointments.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+CONFLICT_ERRORS = (
+    "Error: Slot is already booked.",
+    "Error: Customer has an overlapping appointment with this provider.",
+    "Error: Appointment was changed elsewhere; reload and try again.",
+)
+
+
+def target_slots(store, count: int) -> list[str]:
+    """The first `count` slots of the first provider with availability,
+    from tomorrow on; the same in every worker."""
+    provider_id = sorted(store.availability_configs.providers())[0]
+    start = datetime.combine(
+        datetime.now().date() + timedelta(days=1), datetime.min.time()
+    )
+    slots = store.get_provider_slots(provider_id, start, start + timedelta(days=90))
+    return [slot["id"] for slot in slots[:count]]
+
+
+def nonzero(counter: Counter) -> dict:
+    return {key: n for key, n in counter.items() if n}
+
+
+def worker(number: int, args, barrier, results):
+    import logging
+
+    logging.disable(logging.WARNING)
+    from app.store import get_store
+    from app.store.aggregates import AppointmentAggregates
+
+    store = get_store()
+    slot_ids = target_slots(store, args.slots)
+    customer_ids = sorted(store.customers)
+    attempts = [
+        (
+            customer_ids[(number + i) % len(customer_ids)],
+            slot_ids[(i * 7 + number) % len(slot_ids)],
+        )
+        for i in range(args.attempts)
+    ]
+
+    def book(attempt):
+        return attempt[1], store.book_slot(*attempt, f"worker {number}", "Admin")
+
+    async def book_async(attempt):
+        return attempt[1], await store.book_slot_async(
+            *attempt, f"worker {number}", "Admin"
+        )
+
+    async def book_all():
+        with ThreadPoolExecutor(args.threads) as pool:
+            threaded = pool.map(book, attempts[0::2])
+            awaited = await asyncio.gather(*map(book_async, attempts[1::2]))
+            return list(threaded) + awaited
+
+    async def race(appointment_id):
+        return await asyncio.gather(
+            store.change_appointment_status_async(
+                appointment_id, "Cancelled", f"worker {number}", "Admin"
+            ),
+            store.change_appointment_status_async(
+                appointment_id, "Completed", f"worker {number}", "Admin"
+            ),
+        )
+
+    async def race_all(appointment_ids):
+        return await asyncio.gather(*map(race, appointment_ids))
+
+    loop = asyncio.new_event_loop()
+    loaded = set(store.appointments)
+    barrier.wait()
+    started = time.perf_counter()
+    outcomes = loop.run_until_complete(book_all())
+    booking_seconds = time.perf_counter() - started
+    # lost claims also load the other workers' bookings into memory
+    booked = {slot_id for slot_id, error in outcomes if error is None}
+    won = sorted(
+        a["id"]
+        for a in store.appointments.values()
+        if a["id"] not in loaded and a["slot_id"] in booked
+    )
+    barrier.wait()
+    races = loop.run_until_complete(race_all(won))
+    rebuilt = AppointmentAggregates.build(store.appointments.values(), store.get_slot)
+    results.put(
+        {
+            "worker": number,
+            "booked": [slot_id for slot_id, error in outcomes if error is None],
+            "appointments": won,
+            "errors": Counter(error for _, error in outcomes if error is not None),
+            "booking_seconds": booking_seconds,
+            "races": [[error for error in pair] for pair in races],
+            "statuses": {i: store.appointments[i]["status"] for i in won},
+            "aggregates_match": (
+                nonzero(store.aggregates.status_counts)
+                == nonzero(rebuilt.status_counts)
+                and store.aggregates.revenue_cents == rebuilt.revenue_cents
+                and nonzero(store.aggregates.day_counts) == nonzero(rebuilt.day_counts)
+            ),
+        }
+    )
+
+
+def stored_statuses(path: str) -> dict[str, str]:
+    """Appointment id (hex) -> status, as stored in the file."""
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT id, status FROM appointments"))
+
+
+def check(path: str, seeded: set[str], reports: list[dict]) -> list[str]:
+    """The failed checks of a run, read from the reports and the file."""
+    failures = []
+    errors = sum((report["errors"] for report in reports), Counter())
+    unexpected = {e: n for e, n in errors.items() if e not in CONFLICT_ERRORS}
+    if unexpected:
+        failures.append(f"unexpected booking errors: {unexpected}")
+    with sqlite3.connect(path) as conn:
+        doubled = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT slot_id FROM appointments"
+            " WHERE status != 'Cancelled' GROUP BY slot_id HAVING COUNT(*) > 1)"
+        ).fetchone()[0]
+    if doubled:
+        failures.append(f"{doubled} slots have more than one active appointment")
+    statuses = stored_statuses(path)
+    created = set(statuses) - seeded
+    reported = {uuid.UUID(i).hex for report in reports for i in report["appointments"]}
+    booked = sum(len(report["booked"]) for report in reports)
+    if not booked == len(reported) == len(created) or reported != created:
+        failures.append(
+            f"workers booked {booked} slots and hold {len(reported)} new "
+            f"appointments, the database {len(created)}"
+        )
+    for report in reports:
+        for pair in report["races"]:
+            if sum(error is None for error in pair) != 1:
+                failures.append(f"worker {report['worker']}: status race ended {pair}")
+        for appointment_id, status in report["statuses"].items():
+            stored = statuses.get(uuid.UUID(appointment_id).hex)
+            if stored != status:
+                failures.append(
+                    f"worker {report['worker']}: {appointment_id} is {status} in memory, {stored} stored"
+                )
+        if not report["aggregates_match"]:
+            failures.append(
+                f"worker {report['worker']}: aggregates differ from a recount"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--attempts", type=int, default=500)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stress.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ["DATA_STORE_BACKEND"] = "sql"
+        from app.db import create_db_and_tables, seed_database
+
+        create_db_and_tables()
+        seed_database()
+        seeded = set(stored_statuses(path))
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(args.processes)
+        results = context.Queue()
+        workers = [
+            context.Process(target=worker, args=(n, args, barrier, results))
+            for n in range(args.processes)
+        ]
+        for process in workers:
+            process.start()
+        reports = []
+        while len(reports) < len(workers):
+            try:
+                reports.append(results.get(timeout=1))
+            except queue.Empty:
+                if any(p.exitcode not in (None, 0) for p in workers):
+                    break
+        for process in workers:
+            process.join()
+        if len(reports) < len(workers):
+            print("a worker failed")
+            return 1
+        failures = check(path, seeded, reports)
+    attempts = args.processes * args.attempts
+    booked = sum(len(report["booked"]) for report in reports)
+    seconds = max(report["booking_seconds"] for report in reports)
+    print(
+        f"{attempts} booking attempts on {args.slots} slots from {args.processes} "
+        f"processes: {booked} booked, {attempts - booked} conflicts, "
+        f"{seconds:.2f}s ({attempts / seconds:.0f} attempts/s)"
+    )
+    races = sum(len(report["races"]) for report in reports)
+    print(f"{races} cancel/complete races, one winner each expected")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""Measures the state delta the calendar sends after a booking.
+
+    python -m app.calendar_delta_benchmark [--max-bytes 1024]
+
+Loads the calendar month of the first provider on the mock dataset, then
+books the month's last and first free slots through
+CalendarState.confirm_booking, the calendar's only write. After each
+booking it serializes the root state's delta as Reflex does for the
+websocket and prints its size next to the whole month's payload.
+Status changes and reschedules are made on the appointments page; the
+calendar picks them up from the store's per-day cache invalidation when
+it next loads.
+
+Exits non-zero if a delta is larger than `--max-bytes` or resends
+slots_by_day.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-bytes", type=int, default=1024)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    import app.app  # noqa: F401  registers the states
+    from reflex.state import State
+    from reflex.utils.format import json_dumps
+    from app.states import CalendarState
+
+    root = State(_reflex_internal_init=True)
+    calendar = root.get_substate(CalendarState.get_full_name().split(".")[1:])
+    loop = asyncio.new_event_loop()
+
+    def delta() -> tuple[int, list[str]]:
+        changed = root.get_delta()
+        root._clean()
+        names = sorted(name for var in changed.values() for name in var)
+        return len(json_dumps(changed)), names
+
+    def free_slots() -> list[dict]:
+        return [
+            slot
+            for day in calendar.slots_by_day.values()
+            for slot in day["visible"]
+            if not calendar.slot_booked.get(slot["id"], slot["is_booked"])
+        ]
+
+    async def book(slot: dict):
+        calendar.open_booking_modal(slot)
+        root._clean()
+        async for _ in calendar.confirm_booking():
+            pass
+
+    calendar.on_calendar_load()
+    delta()
+    month_bytes = len(json_dumps(calendar.slots_by_day))
+    print(f"{'whole month payload':<26}{month_bytes:>8,} bytes")
+    steps = []
+    for step, pick in [("last booking", -1), ("first booking", 0)]:
+        loop.run_until_complete(book(free_slots()[pick]))
+        steps.append((step, *delta()))
+    failures = []
+    for step, size, names in steps:
+        print(f"{'delta after ' + step:<26}{size:>8,} bytes  {', '.join(names)}")
+        if size > args.max_bytes:
+            failures.append(f"the {step} delta is over {args.max_bytes} bytes")
+        if any(name.startswith("slots_by_day") for name in names):
+            failures.append(f"the {step} delta resends slots_by_day")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
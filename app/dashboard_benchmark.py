@@ -0,0 +1,88 @@
+"""Times the dashboard and appointments pages as the store grows.
+
+    python -m app.dashboard_benchmark [--providers 300] [--sizes 20000x4000,200000x40000,600000x120000] [--runs 20] [--max-growth 3.0]
+
+For each SLOTSxAPPOINTMENTS size, builds a DataStore from a synthetic
+dataset held in memory, then times the work of a page load, best of
+`--runs`: DashboardState.on_load and AppointmentsState.on_load (the
+first page of cards). Before the id indexes these walked every slot for
+each appointment, so a render grew with slots x appointments.
+
+Exits non-zero if a page's render time at the largest size is more than
+`--max-growth` times its time at the smallest.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+PAGES = ("dashboard", "appointments")
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    slots, _, appointments = value.partition("x")
+    return int(slots), int(appointments)
+
+
+def best_of(runs: int, run) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=300)
+    parser.add_argument(
+        "--sizes",
+        type=lambda v: [parse_size(size) for size in v.split(",")],
+        default="20000x4000,200000x40000,600000x120000",
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    import app.app  # noqa: F401  registers the states
+    from reflex.state import State
+    from app.db.synthetic import SyntheticBackend, SyntheticDataset
+    from app.states import AppointmentsState, DashboardState
+    from app.store import DataStore, data_store
+
+    timings = []
+    for slots, appointments in args.sizes:
+        dataset = SyntheticDataset(
+            args.providers, max(appointments // 4, 100), slots, appointments
+        )
+        started = time.perf_counter()
+        data_store._store = DataStore(SyntheticBackend(dataset))
+        load_seconds = time.perf_counter() - started
+        root = State(_reflex_internal_init=True)
+        dashboard = root.get_substate(DashboardState.get_full_name().split(".")[1:])
+        listing = root.get_substate(AppointmentsState.get_full_name().split(".")[1:])
+        seconds = {
+            "dashboard": best_of(args.runs, dashboard.on_load),
+            "appointments": best_of(args.runs, listing.on_load),
+        }
+        timings.append(seconds)
+        print(
+            f"{slots:>8} slots x {appointments:>7} appointments: "
+            + ", ".join(f"{page} {seconds[page] * 1000:.2f}ms" for page in PAGES)
+            + f" (store built in {load_seconds:.1f}s)"
+        )
+    failures = []
+    for page in PAGES:
+        growth = timings[-1][page] / timings[0][page]
+        print(f"{page}: {growth:.2f}x from the smallest to the largest size")
+        if growth > args.max_growth:
+            failures.append(f"{page} render grew more than {args.max_growth}x")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
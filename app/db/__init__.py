@@ -1,2 +1,24 @@
-from .database import get_engine, get_session, create_db_and_tables
-from .seed import seed_database
\ No newline at end of file
+import importlib
+
+# Re-exports, imported on first access: the app imports app.db.instrumentation
+# at startup and should not pay for the SQLModel tables and engines with it.
+_EXPORTS = {
+    "get_engine": "database",
+    "get_session": "database",
+    "get_async_engine": "database",
+    "get_async_session": "database",
+    "create_db_and_tables": "database",
+    "seed_database": "seed",
+    "bulk_insert": "bulk",
+    "SqlRepository": "repository",
+    "QueryMetricsMiddleware": "instrumentation",
+    "metrics_api": "instrumentation",
+    "track": "instrumentation",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
\ No newline at end of file
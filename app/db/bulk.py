@@ -0,0 +1,124 @@
+import json
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator
+from sqlalchemy import Connection, Table
+from sqlmodel import SQLModel
+
+BULK_BATCH_SIZE = 10000
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _copy_rows(conn: Connection, table: Table, rows: Iterable[dict]) -> int:
+    """Streams rows through COPY ... FROM STDIN (psycopg 3 only)."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    columns = list(first)
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    count = 0
+    with conn.connection.driver_connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for row in chain([first], rows):
+                copy.write_row([row[c] for c in columns])
+                count += 1
+    return count
+
+
+def _sqlite_converter(value) -> Callable[[Any], Any]:
+    """How SQLAlchemy stores a value of this type in SQLite, done in C where
+    possible; column type processing dominates a Core executemany otherwise."""
+    if isinstance(value, datetime):
+        return lambda v: v.isoformat(" ", "microseconds")
+    if isinstance(value, date):
+        return date.isoformat
+    if isinstance(value, uuid.UUID):
+        return attrgetter("hex")
+    if isinstance(value, (dict, list)):
+        return json.dumps
+    return None
+
+
+def _sqlite_executemany(
+    conn: Connection, table: Table, rows: Iterable[dict], batch_size: int
+) -> int:
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    columns = list(first)
+    # picked from each column's first non-None value, which may come from
+    # a later row or batch than the first
+    converters: dict[str, Callable[[Any], Any]] = {}
+    sql = (
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    count = 0
+    for batch in batched(chain([first], rows), batch_size):
+        values = []
+        for column in columns:
+            column_values = [row[column] for row in batch]
+            if column not in converters:
+                value = next((v for v in column_values if v is not None), None)
+                if value is not None:
+                    converters[column] = _sqlite_converter(value)
+            convert = converters.get(column)
+            if convert:
+                column_values = [
+                    None if v is None else convert(v) for v in column_values
+                ]
+            values.append(column_values)
+        conn.exec_driver_sql(sql, list(zip(*values)))
+        count += len(batch)
+    return count
+
+
+def bulk_insert(
+    conn: Connection,
+    model: type[SQLModel],
+    rows: Iterable[dict],
+    batch_size: int = BULK_BATCH_SIZE,
+) -> int:
+    """Inserts column dicts into the model's table inside the caller's transaction.
+
+    Uses COPY on Postgres with psycopg 3, a driver-level executemany on
+    SQLite and one Core executemany per batch elsewhere. Rows are consumed
+    lazily, so generators of any size work; every row must have the keys of
+    the first. Returns the number of rows inserted.
+    """
+    table = model.__table__
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg":
+        return _copy_rows(conn, table, rows)
+    if conn.dialect.name == "sqlite":
+        return _sqlite_executemany(conn, table, rows, batch_size)
+    count = 0
+    statement = table.insert()
+    for batch in batched(rows, batch_size):
+        conn.execute(statement, batch)
+        count += len(batch)
+    return count
+
+
+@contextmanager
+def deferred_indexes(conn: Connection, models: Iterable[type[SQLModel]]):
+    """Drops the models' secondary indexes for a load and rebuilds them after.
+
+    Building an index once over the loaded rows is far cheaper than
+    maintaining it on every insert.
+    """
+    indexes = [index for model in models for index in model.__table__.indexes]
+    for index in indexes:
+        index.drop(conn)
+    yield
+    for index in indexes:
+        index.create(conn)
\ No newline at end of file
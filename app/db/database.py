@@ -1,27 +1,85 @@
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import create_engine, Session, SQLModel
-from contextlib import contextmanager
+from sqlmodel.ext.asyncio.session import AsyncSession
+from contextlib import asynccontextmanager, contextmanager
 import os
 import logging
+import threading
+from typing import Optional
+from app.db.instrumentation import DB_INSTRUMENTATION, instrument
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///appointment.db")
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,
-    connect_args=connect_args,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+DB_ECHO = os.getenv("DB_ECHO", "").lower() in ("1", "true", "yes")
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "postgres": "postgresql+psycopg",
+}
+
+
+def _async_url(url: str) -> str:
+    """The same database addressed through its async driver."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+connect_args = (
+    {"check_same_thread": False, "timeout": 30}
+    if DATABASE_URL.startswith("sqlite")
+    else {}
 )
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
 
 
-def get_engine():
-    return engine
+def get_engine() -> Engine:
+    """The sync engine, created on first use so that importing the app does
+    not load database drivers or build pools."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    DATABASE_URL,
+                    echo=DB_ECHO,
+                    connect_args=connect_args,
+                    pool_pre_ping=True,
+                    pool_size=10,
+                    max_overflow=20,
+                )
+                if DB_INSTRUMENTATION:
+                    instrument(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """The async engine, created on first use."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    echo=DB_ECHO,
+                    connect_args=connect_args,
+                    pool_pre_ping=True,
+                    pool_size=10,
+                    max_overflow=20,
+                )
+                if DB_INSTRUMENTATION:
+                    instrument(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
 
 
 @contextmanager
 def get_session():
-    session = Session(engine)
+    session = Session(get_engine())
     try:
         yield session
         session.commit()
@@ -33,5 +91,20 @@ def get_session():
         session.close()
 
 
+@asynccontextmanager
+async def get_async_session():
+    """Async counterpart of get_session for use inside event handlers."""
+    session = AsyncSession(get_async_engine())
+    try:
+        yield session
+        await session.commit()
+    except Exception as e:
+        logging.exception(f"Error in database session: {e}")
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(get_engine())
\ No newline at end of file
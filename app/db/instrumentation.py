@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from reflex.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+DB_INSTRUMENTATION = os.getenv("DB_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+SLOWEST_KEPT = 5
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with literals and IN-lists folded, for grouping repeats."""
+    shape = _LITERALS.sub("?", statement)
+    shape = _PLACEHOLDER_LISTS.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Queries run while handling one event (or one `track` block)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest: list[tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if len(self.slowest) < SLOWEST_KEPT:
+            heapq.heappush(self.slowest, (seconds, shape))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, shape))
+
+    def repeated_shapes(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """Statement shapes run more than `threshold` times: likely N+1 loops."""
+        return {shape: n for shape, n in self.shapes.items() if n > threshold}
+
+
+class QueryMetrics:
+    """Per-handler totals across all tracked events, safe to read from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: dict[str, dict] = {}
+
+    def add(self, stats: QueryStats, n_plus_one: bool):
+        with self._lock:
+            m = self._handlers.setdefault(
+                stats.name,
+                {
+                    "events": 0,
+                    "queries": 0,
+                    "db_seconds": 0.0,
+                    "max_queries": 0,
+                    "n_plus_one_events": 0,
+                },
+            )
+            m["events"] += 1
+            m["queries"] += stats.count
+            m["db_seconds"] += stats.total_seconds
+            m["max_queries"] = max(m["max_queries"], stats.count)
+            m["n_plus_one_events"] += int(n_plus_one)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: dict(m) for name, m in self._handlers.items()}
+
+    def reset(self):
+        with self._lock:
+            self._handlers.clear()
+
+
+metrics = QueryMetrics()
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument(engine: Engine):
+    """Hooks query timing into a (sync) engine. A no-op if already hooked."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _report(stats: QueryStats):
+    repeated = stats.repeated_shapes()
+    metrics.add(stats, bool(repeated))
+    if stats.count:
+        logger.debug(
+            "%s: %d queries in %.1fms; slowest: %s",
+            stats.name,
+            stats.count,
+            stats.total_seconds * 1000,
+            [
+                f"{seconds * 1000:.1f}ms {shape[:120]}"
+                for seconds, shape in sorted(stats.slowest, reverse=True)
+            ],
+        )
+    for shape, n in repeated.items():
+        logger.warning("Possible N+1 in %s: %dx %s", stats.name, n, shape[:200])
+
+
+@contextmanager
+def track(name: str) -> Iterator[QueryStats]:
+    """Collects the queries run inside the block under `name`."""
+    stats = QueryStats(name)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        _report(stats)
+
+
+class QueryMetricsMiddleware(Middleware):
+    """Tracks the queries each Reflex event handler runs.
+
+    The event is processed in the same task between `preprocess` and the
+    final `postprocess`, so the context variable set here covers the
+    handler and everything it awaits.
+    """
+
+    async def preprocess(self, app, state, event):
+        _current.set(QueryStats(event.name))
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        stats = _current.get()
+        if update.final and stats is not None:
+            _current.set(None)
+            _report(stats)
+        return update
+
+
+async def _metrics_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse(metrics.snapshot())
+
+
+async def _cache_metrics_endpoint(request: Request) -> JSONResponse:
+    from app.store import get_store
+
+    store = await asyncio.to_thread(get_store)
+    return JSONResponse(store.cache_stats())
+
+
+def metrics_api() -> Starlette:
+    """A Starlette app serving the store's cache counters at /metrics/caches
+    and, with DB_INSTRUMENTATION on, the per-handler query totals at
+    /metrics/db."""
+    routes = [Route("/metrics/caches", _cache_metrics_endpoint)]
+    if DB_INSTRUMENTATION:
+        routes.append(Route("/metrics/db", _metrics_endpoint))
+    return Starlette(routes=routes)
\ No newline at end of file
@@ -1,10 +1,9 @@
-from __future__ import annotations
 import datetime
 import uuid
 from typing import TYPE_CHECKING, Any, Optional
 from sqlmodel import Field, Relationship, SQLModel, JSON, Column
-from sqlalchemy import func
-from sqlalchemy.schema import UniqueConstraint
+from sqlalchemy import DDL, event, func, text
+from sqlalchemy.schema import Index, UniqueConstraint
 
 if TYPE_CHECKING:
     from app.db.models import (
@@ -16,8 +15,11 @@ if TYPE_CHECKING:
         AppointmentDB,
         HistoryLogDB,
     )
-WeeklyTemplate = dict[int, list[tuple[str, str]]]
-Exceptions = dict[str, list[tuple[str, str]]]
+# [start, end] or [start, end, rule options]; see app/store/availability_rules.py
+WeeklyTemplate = dict[int, list[list]]
+# Literal so SQLite can match queries against the partial index predicate.
+ACTIVE_APPOINTMENT_CLAUSE = "status IN ('Pending', 'Confirmed')"
+Exceptions = dict[str, list[list]]
 
 
 class BusinessDB(SQLModel, table=True):
@@ -76,6 +78,7 @@ class ProviderDB(SQLModel, table=True):
     bio: Optional[str] = Field(default=None)
     contact_mobile: Optional[str] = Field(default=None)
     contact_email: Optional[str] = Field(default=None)
+    slot_price_cents: Optional[int] = Field(default=None)
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.utcnow, nullable=False
     )
@@ -112,10 +115,51 @@ class CustomerDB(SQLModel, table=True):
     appointments: list["AppointmentDB"] = Relationship(back_populates="customer")
 
 
+# Substring search over customer names and mobiles: an external-content FTS5
+# trigram table kept in sync by triggers on SQLite, pg_trgm GIN indexes on
+# Postgres. Also created by migration f3a1c9d5b7e2 for existing databases.
+CUSTOMER_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE customers_fts USING fts5(full_name, mobile, "
+        "content='customers', content_rowid='rowid', tokenize='trigram')",
+        "CREATE TRIGGER customers_fts_insert AFTER INSERT ON customers BEGIN "
+        "INSERT INTO customers_fts(rowid, full_name, mobile) "
+        "VALUES (new.rowid, new.full_name, new.mobile); END",
+        "CREATE TRIGGER customers_fts_delete AFTER DELETE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, full_name, mobile) "
+        "VALUES ('delete', old.rowid, old.full_name, old.mobile); END",
+        "CREATE TRIGGER customers_fts_update AFTER UPDATE ON customers BEGIN "
+        "INSERT INTO customers_fts(customers_fts, rowid, full_name, mobile) "
+        "VALUES ('delete', old.rowid, old.full_name, old.mobile); "
+        "INSERT INTO customers_fts(rowid, full_name, mobile) "
+        "VALUES (new.rowid, new.full_name, new.mobile); END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_customers_full_name_trgm ON customers "
+        "USING gin (lower(full_name) gin_trgm_ops)",
+        "CREATE INDEX ix_customers_mobile_trgm ON customers "
+        "USING gin (mobile gin_trgm_ops)",
+    ],
+}
+for _dialect, _statements in CUSTOMER_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            CustomerDB.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+event.listen(
+    CustomerDB.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS customers_fts").execute_if(dialect="sqlite"),
+)
+
+
 class SlotDB(SQLModel, table=True):
     __tablename__ = "slots"
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    provider_id: uuid.UUID = Field(foreign_key="providers.id", index=True)
+    provider_id: uuid.UUID = Field(foreign_key="providers.id")
     start_datetime: datetime.datetime = Field(index=True)
     end_datetime: datetime.datetime
     price_cents: int
@@ -131,15 +175,35 @@ class SlotDB(SQLModel, table=True):
     )
     provider: "ProviderDB" = Relationship(back_populates="slots")
     appointment: Optional["AppointmentDB"] = Relationship(back_populates="slot")
+    __table_args__ = (
+        Index("ix_slots_provider_start", "provider_id", "start_datetime"),
+        Index(
+            "ix_slots_provider_booked_start",
+            "provider_id",
+            "is_booked",
+            "start_datetime",
+        ),
+    )
+
+
+# one appointment per slot that is not cancelled; a violation is a lost
+# slot claim (see repository._flush)
+ACTIVE_SLOT_INDEX = Index(
+    "uq_appointments_active_slot",
+    "slot_id",
+    unique=True,
+    sqlite_where=text("status != 'Cancelled'"),
+    postgresql_where=text("status != 'Cancelled'"),
+)
 
 
 class AppointmentDB(SQLModel, table=True):
     __tablename__ = "appointments"
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    slot_id: uuid.UUID = Field(foreign_key="slots.id", unique=True)
+    slot_id: uuid.UUID = Field(foreign_key="slots.id", index=True)
     provider_id: uuid.UUID = Field(foreign_key="providers.id", index=True)
     customer_id: uuid.UUID = Field(foreign_key="customers.id", index=True)
-    status: str = Field(default="Pending", index=True)
+    status: str = Field(default="Pending")
     notes: Optional[str] = Field(default=None)
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.utcnow, nullable=False, index=True
@@ -153,6 +217,17 @@ class AppointmentDB(SQLModel, table=True):
     provider: "ProviderDB" = Relationship(back_populates="appointments")
     customer: "CustomerDB" = Relationship(back_populates="appointments")
     history_logs: list["HistoryLogDB"] = Relationship(back_populates="appointment")
+    __table_args__ = (
+        ACTIVE_SLOT_INDEX,
+        Index(
+            "ix_appointments_customer_provider_active",
+            "customer_id",
+            "provider_id",
+            sqlite_where=text(ACTIVE_APPOINTMENT_CLAUSE),
+            postgresql_where=text(ACTIVE_APPOINTMENT_CLAUSE),
+        ),
+        Index("ix_appointments_status_created", "status", "created_at"),
+    )
 
 
 class AvailabilityConfigDB(SQLModel, table=True):
@@ -164,6 +239,7 @@ class AvailabilityConfigDB(SQLModel, table=True):
         default=None, sa_column=Column(JSON)
     )
     exceptions: Optional[Exceptions] = Field(default=None, sa_column=Column(JSON))
+    holiday_calendar: Optional[str] = None
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.utcnow, nullable=False
     )
@@ -188,4 +264,20 @@ class HistoryLogDB(SQLModel, table=True):
     old_status: Optional[str] = Field(default=None)
     new_status: Optional[str] = Field(default=None)
     details: Optional[str] = Field(default=None)
-    appointment: "AppointmentDB" = Relationship(back_populates="history_logs")
\ No newline at end of file
+    appointment: "AppointmentDB" = Relationship(back_populates="history_logs")
+
+
+class DailyRollupDB(SQLModel, table=True):
+    __tablename__ = "daily_rollups"
+    day: datetime.date = Field(primary_key=True)
+    provider_id: uuid.UUID = Field(foreign_key="providers.id", primary_key=True)
+    business_id: uuid.UUID = Field(foreign_key="businesses.id")
+    booked_slots: int = Field(default=0)
+    available_slots: int = Field(default=0)
+    completed: int = Field(default=0)
+    cancelled: int = Field(default=0)
+    no_shows: int = Field(default=0)
+    revenue_cents: int = Field(default=0)
+    updated_at: datetime.datetime = Field(
+        default_factory=datetime.datetime.utcnow, nullable=False
+    )
\ No newline at end of file
@@ -0,0 +1,434 @@
+import asyncio
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Optional
+from sqlalchemy import Index, or_, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, Session, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.database import (
+    create_db_and_tables,
+    get_async_engine,
+    get_engine,
+    get_session,
+)
+from app.db.models import (
+    ACTIVE_APPOINTMENT_CLAUSE,
+    ACTIVE_SLOT_INDEX,
+    BusinessDB,
+    DepartmentDB,
+    ProviderDB,
+    ProviderDepartmentLinkDB,
+    CustomerDB,
+    SlotDB,
+    AppointmentDB,
+    AvailabilityConfigDB,
+    HistoryLogDB,
+    DailyRollupDB,
+)
+from app.db.seed import seed_database
+from app.store.availability_rules import rule_entry
+from app.store.backends import (
+    BookingOverlapError,
+    SlotConflictError,
+    StaleRecordError,
+    StoreBackend,
+    write_changes,
+)
+from app.store.rollups import rollup_id
+from app.store.slot_engine import parse_weekly_template, slot_id_for, slot_uuid
+
+LOAD_BATCH_SIZE = 1000
+# ids per DELETE ... IN, under SQLite's bound parameter limit
+DELETE_BATCH_SIZE = 500
+TABLE_MODELS: dict[str, type[SQLModel]] = {
+    "businesses": BusinessDB,
+    "departments": DepartmentDB,
+    "providers": ProviderDB,
+    "customers": CustomerDB,
+    "slots": SlotDB,
+    "appointments": AppointmentDB,
+    "availability_configs": AvailabilityConfigDB,
+    "history_logs": HistoryLogDB,
+    "daily_rollups": DailyRollupDB,
+}
+UUID_FIELDS = {
+    "id",
+    "business_id",
+    "provider_id",
+    "customer_id",
+    "appointment_id",
+}
+
+
+def to_record(table: str, row: SQLModel, slot_ids: Optional[dict] = None) -> dict:
+    """Maps a DB row to the TypedDict shape used by the store and the UI."""
+    record = {
+        column.name: getattr(row, column.name) for column in row.__table__.columns
+    }
+    for field in UUID_FIELDS & record.keys():
+        if record[field] is not None:
+            record[field] = str(record[field])
+    if table == "slots":
+        record["id"] = slot_id_for(record["provider_id"], row.start_datetime)
+    elif table == "appointments":
+        record["slot_id"] = (slot_ids or {}).get(row.slot_id, str(row.slot_id))
+    elif table == "availability_configs":
+        record["weekly_template"] = parse_weekly_template(row.weekly_template)
+        record["exceptions"] = row.exceptions or {}
+    elif table == "daily_rollups":
+        record["id"] = rollup_id(record["provider_id"], row.day)
+    return record
+
+
+def to_row(table: str, record: dict) -> SQLModel:
+    """Maps a TypedDict record to its DB model."""
+    model = TABLE_MODELS[table]
+    values = {k: v for k, v in record.items() if k in model.model_fields}
+    for field in UUID_FIELDS & values.keys():
+        if values[field] is not None and not (table == "slots" and field == "id"):
+            values[field] = uuid.UUID(values[field])
+    if table == "slots":
+        values["id"] = slot_uuid(record["id"])
+    elif table == "appointments":
+        values["slot_id"] = slot_uuid(record["slot_id"])
+    elif table == "availability_configs":
+        values["weekly_template"] = {
+            str(day): [rule_entry(entry) for entry in entries]
+            for day, entries in record["weekly_template"].items()
+        }
+        values["exceptions"] = {
+            day: [rule_entry(entry) for entry in entries]
+            for day, entries in (record.get("exceptions") or {}).items()
+        }
+    return model(**values)
+
+
+def _violates(error: IntegrityError, index: Index) -> bool:
+    """Whether `error` is a violation of the unique `index`: by constraint
+    name where the driver reports one (psycopg's diag, asyncpg's error
+    behind the adapter), else by SQLite's "UNIQUE constraint failed:
+    <table>.<column>, ..." naming exactly the index's columns."""
+    orig = error.orig
+    name = getattr(getattr(orig, "diag", None), "constraint_name", None) or getattr(
+        orig.__cause__, "constraint_name", None
+    )
+    if name is not None:
+        return name == index.name
+    columns = ", ".join(f"{index.table.name}.{c.name}" for c in index.columns)
+    return str(orig) == f"UNIQUE constraint failed: {columns}"
+
+
+def _flush(session: Session):
+    """Flushes pending writes, reporting a taken slot as SlotConflictError."""
+    try:
+        session.flush()
+    except IntegrityError as e:
+        if _violates(e, ACTIVE_SLOT_INDEX):
+            raise SlotConflictError(str(e.orig)) from e
+        raise
+
+
+def active_appointments_query(customer_id: str, provider_id: str):
+    """The customer's pending or confirmed appointments with a provider."""
+    return select(AppointmentDB).where(
+        AppointmentDB.customer_id == uuid.UUID(customer_id),
+        AppointmentDB.provider_id == uuid.UUID(provider_id),
+        text(ACTIVE_APPOINTMENT_CLAUSE),
+    )
+
+
+def overlapping_appointments_query(
+    customer_id: str,
+    provider_id: str,
+    start: datetime,
+    end: datetime,
+    appointment_id: str,
+):
+    """Other active appointments of the customer with the provider whose
+    slot overlaps [start, end)."""
+    return (
+        active_appointments_query(customer_id, provider_id)
+        .join(SlotDB, SlotDB.id == AppointmentDB.slot_id)
+        .where(
+            AppointmentDB.id != uuid.UUID(appointment_id),
+            SlotDB.start_datetime < end,
+            SlotDB.end_datetime > start,
+        )
+        .limit(1)
+    )
+
+
+def appointments_by_id_or_slot_query(
+    appointment_ids: Iterable[str], slot_keys: Iterable[uuid.UUID]
+):
+    """The appointments with one of the ids or on one of the slot rows."""
+    return select(AppointmentDB).where(
+        or_(
+            AppointmentDB.id.in_([uuid.UUID(a_id) for a_id in appointment_ids]),
+            AppointmentDB.slot_id.in_(list(slot_keys)),
+        )
+    )
+
+
+def reread_rows(
+    session: Session,
+    appointment_ids: Iterable[str],
+    slot_ids: Iterable[str],
+    bookings: Iterable[tuple[dict, dict]],
+) -> dict:
+    """The stored rows StoreBackend.reread describes, read in `session`."""
+    slot_keys = {slot_uuid(slot_id) for slot_id in slot_ids}
+    appointments = {}
+    if appointment_ids or slot_keys:
+        query = appointments_by_id_or_slot_query(appointment_ids, slot_keys)
+        for row in session.exec(query):
+            appointments[row.id] = row
+    for appointment, slot in bookings:
+        query = overlapping_appointments_query(
+            appointment["customer_id"],
+            appointment["provider_id"],
+            slot["start_datetime"],
+            slot["end_datetime"],
+            appointment["id"],
+        ).limit(None)
+        for row in session.exec(query):
+            appointments[row.id] = row
+    slot_keys |= {row.slot_id for row in appointments.values()}
+    slots = {}
+    if slot_keys:
+        for row in session.exec(select(SlotDB).where(SlotDB.id.in_(slot_keys))):
+            slots[row.id] = to_record("slots", row)
+    slot_ids_by_key = {key: slot["id"] for key, slot in slots.items()}
+    return {
+        "appointments": [
+            to_record("appointments", row, slot_ids_by_key)
+            for row in appointments.values()
+        ],
+        "slots": list(slots.values()),
+    }
+
+
+class SqlTransaction:
+    """Stages store writes in one session; committed when the block exits."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def save(self, table: str, record: dict):
+        self.session.merge(to_row(table, record))
+        if table == "providers":
+            provider_id = uuid.UUID(record["id"])
+            self.session.execute(
+                delete(ProviderDepartmentLinkDB).where(
+                    ProviderDepartmentLinkDB.provider_id == provider_id
+                )
+            )
+            self.session.add_all(
+                [
+                    ProviderDepartmentLinkDB(
+                        provider_id=provider_id, department_id=uuid.UUID(d_id)
+                    )
+                    for d_id in record["department_ids"]
+                ]
+            )
+
+    def claim_slot(self, slot: dict):
+        """Books the slot row with `UPDATE ... WHERE is_booked = false`.
+
+        The row is inserted first if it was never materialized. The update
+        only matches a free slot, and both SQLite (database write lock) and
+        Postgres (row lock, WHERE re-checked after the competing commit)
+        serialize concurrent claims, so exactly one booking per slot wins.
+        The partial unique index on appointments.slot_id backs this up.
+        """
+        row = to_row("slots", dict(slot, is_booked=False))
+        values = {c.name: getattr(row, c.name) for c in SlotDB.__table__.columns}
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        self.session.execute(
+            insert(SlotDB)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        result = self.session.execute(
+            update(SlotDB)
+            .where(SlotDB.id == row.id, SlotDB.is_booked == False)
+            .values(is_booked=True, updated_at=slot["updated_at"])
+        )
+        if result.rowcount != 1:
+            raise SlotConflictError(slot["id"])
+
+    def update(self, table: str, record: dict, expected: dict):
+        """Writes the record with `UPDATE ... WHERE id = :id AND <field> =
+        :expected ...`, so a change planned from a record another worker has
+        since changed matches no row and raises StaleRecordError."""
+        model = TABLE_MODELS[table]
+        row = to_row(table, record)
+        old = to_row(table, dict(record, **expected))
+        columns = model.__table__.columns
+        result = self.session.execute(
+            update(model)
+            .where(
+                model.id == row.id,
+                *(getattr(model, field) == getattr(old, field) for field in expected),
+            )
+            .values({c.name: getattr(row, c.name) for c in columns if c.name != "id"})
+        )
+        if result.rowcount != 1:
+            raise StaleRecordError(record["id"])
+
+    def check_overlap(self, appointment: dict, slot: dict):
+        """Looks for another active appointment of the customer with the
+        provider overlapping the slot, through the partial customer/provider
+        index.
+
+        Runs after the slot claim, whose write lock serializes it on SQLite;
+        on Postgres the customer row is locked first so two bookings of one
+        customer cannot both pass.
+        """
+        customer_id = uuid.UUID(appointment["customer_id"])
+        if self.session.get_bind().dialect.name == "postgresql":
+            self.session.execute(
+                select(CustomerDB.id)
+                .where(CustomerDB.id == customer_id)
+                .with_for_update()
+            )
+        query = overlapping_appointments_query(
+            appointment["customer_id"],
+            appointment["provider_id"],
+            slot["start_datetime"],
+            slot["end_datetime"],
+            appointment["id"],
+        )
+        if self.session.execute(query).first() is not None:
+            raise BookingOverlapError(appointment["id"])
+
+    def increment(self, table: str, record: dict, deltas: dict[str, int]):
+        """Upserts the record, adding `deltas` to the stored counters if the
+        row already exists."""
+        model = TABLE_MODELS[table]
+        row = to_row(table, record)
+        columns = model.__table__.c
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        self.session.execute(
+            insert(model)
+            .values(**{c.name: getattr(row, c.name) for c in columns})
+            .on_conflict_do_update(
+                index_elements=[c.name for c in model.__table__.primary_key],
+                set_={
+                    **{name: columns[name] + n for name, n in deltas.items()},
+                    "updated_at": record["updated_at"],
+                },
+            )
+        )
+
+    def delete(self, table: str, record_id: str):
+        model = TABLE_MODELS[table]
+        key = slot_uuid(record_id) if table == "slots" else uuid.UUID(record_id)
+        row = self.session.get(model, key)
+        if row is not None:
+            self.session.delete(row)
+
+    def delete_many(self, table: str, record_ids: list[str]):
+        """Deletes the records with one DELETE ... WHERE id IN per batch."""
+        model = TABLE_MODELS[table]
+        to_key = slot_uuid if table == "slots" else uuid.UUID
+        keys = [to_key(record_id) for record_id in record_ids]
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            self.session.execute(
+                delete(model).where(model.id.in_(keys[i : i + DELETE_BATCH_SIZE]))
+            )
+
+
+class SqlRepository(StoreBackend):
+    """DataStore backend persisting to the SQLModel tables in app/db/models.py.
+
+    Tables are read once at startup with one batched query per table (no
+    per-row relationship loads); every store operation afterwards is written
+    back in a single transaction, through the async engine when the store
+    is driven from an event handler.
+    """
+
+    supports_async = True
+
+    def __init__(self):
+        # SQLite has a single writer; queueing async writers here avoids its
+        # busy-timeout backoff, which otherwise dominates tail latency.
+        self._write_lock = (
+            asyncio.Lock() if get_engine().dialect.name == "sqlite" else None
+        )
+
+    def load(self) -> dict:
+        from app.db.rollups import rebuild_rollups, rollups_missing
+
+        create_db_and_tables()
+        seed_database()
+        with get_engine().begin() as conn:
+            if rollups_missing(conn):
+                rebuild_rollups(conn)
+        with get_session() as session:
+            department_ids = defaultdict(list)
+            for link in session.exec(select(ProviderDepartmentLinkDB)):
+                department_ids[str(link.provider_id)].append(str(link.department_id))
+            data = {}
+            slot_ids = {}
+            for table_name, model in TABLE_MODELS.items():
+                rows = session.exec(
+                    select(model).execution_options(yield_per=LOAD_BATCH_SIZE)
+                )
+                records = []
+                for row in rows:
+                    record = to_record(table_name, row, slot_ids)
+                    if table_name == "slots":
+                        slot_ids[row.id] = record["id"]
+                    elif table_name == "providers":
+                        record["department_ids"] = department_ids[record["id"]]
+                    records.append(record)
+                data[table_name] = records
+        return data
+
+    @contextmanager
+    def transaction(self) -> Iterator[SqlTransaction]:
+        with Session(get_engine()) as session, session.begin():
+            yield SqlTransaction(session)
+            _flush(session)
+
+    async def persist_async(
+        self, saves, deletes=(), claims=(), increments=(), updates=(), bookings=()
+    ):
+        def write(session: Session):
+            write_changes(
+                SqlTransaction(session),
+                saves,
+                deletes,
+                claims,
+                increments,
+                updates,
+                bookings,
+            )
+            _flush(session)
+
+        if self._write_lock is None:
+            await self._write_async(write)
+            return
+        async with self._write_lock:
+            await self._write_async(write)
+
+    async def _write_async(self, write: Callable[[Session], None]):
+        async with AsyncSession(get_async_engine()) as session, session.begin():
+            await session.run_sync(write)
+
+    def reread(self, appointment_ids=(), slot_ids=(), bookings=()) -> dict:
+        with get_session() as session:
+            return reread_rows(session, appointment_ids, slot_ids, bookings)
+
+    async def reread_async(self, appointment_ids=(), slot_ids=(), bookings=()) -> dict:
+        async with AsyncSession(get_async_engine()) as session:
+            return await session.run_sync(
+                reread_rows, appointment_ids, slot_ids, bookings
+            )
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""Rebuilds the daily_rollups report table from appointments and slots.
+
+    python -m app.db.rollups [--from 2024-01-01] [--to 2026-12-31]
+
+The store keeps the rollups current incrementally; run this after a bulk
+load, a migration or an availability change that predates the rollups.
+Appointment activity is aggregated by the database in one GROUP BY, so the
+rebuild reads the appointments once and writes one row per provider-day.
+"""
+
+import argparse
+import time as timer
+import uuid
+from datetime import date, timedelta
+from typing import Iterator, Optional
+from sqlalchemy import Connection, create_engine, delete, func, select
+from app.db.bulk import bulk_insert
+from app.db.database import DATABASE_URL
+from app.db.models import (
+    AppointmentDB,
+    AvailabilityConfigDB,
+    BusinessDB,
+    DailyRollupDB,
+    DepartmentDB,
+    ProviderDepartmentLinkDB,
+    SlotDB,
+)
+from app.store.availability_versions import AvailabilityVersions
+from app.store.rollups import Activity, build_rollups
+from app.store.slot_engine import booking_horizon, parse_weekly_template
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def appointment_activity(conn: Connection) -> Iterator[Activity]:
+    """Appointment counts and slot price totals per provider, day and status."""
+    day = func.date(SlotDB.start_datetime)
+    rows = conn.execute(
+        select(
+            AppointmentDB.provider_id,
+            day,
+            AppointmentDB.status,
+            func.count(),
+            func.sum(SlotDB.price_cents),
+        )
+        .join(SlotDB, SlotDB.id == AppointmentDB.slot_id)
+        .group_by(AppointmentDB.provider_id, day, AppointmentDB.status)
+    )
+    for provider_id, day, status, count, price_cents in rows:
+        yield str(provider_id), _as_date(day), status, count, price_cents or 0
+
+
+def _availability_configs(conn: Connection) -> AvailabilityVersions:
+    return AvailabilityVersions(
+        {
+            "provider_id": str(row.provider_id),
+            "month": row.month,
+            "weekly_template": parse_weekly_template(row.weekly_template),
+            "exceptions": row.exceptions or {},
+            "holiday_calendar": row.holiday_calendar,
+        }
+        for row in conn.execute(select(AvailabilityConfigDB))
+    )
+
+
+def _business_ids(conn: Connection) -> dict[str, str]:
+    rows = conn.execute(
+        select(ProviderDepartmentLinkDB.provider_id, DepartmentDB.business_id).join(
+            DepartmentDB, DepartmentDB.id == ProviderDepartmentLinkDB.department_id
+        )
+    )
+    return {str(provider_id): str(business_id) for provider_id, business_id in rows}
+
+
+def rollups_missing(conn: Connection) -> bool:
+    """True when there are appointments but no rollups, e.g. right after
+    the table was added."""
+    has_rollups = conn.execute(select(DailyRollupDB.day).limit(1)).first()
+    return not has_rollups and bool(
+        conn.execute(select(AppointmentDB.id).limit(1)).first()
+    )
+
+
+def rebuild_rollups(
+    conn: Connection,
+    first_day: Optional[date] = None,
+    last_day: Optional[date] = None,
+) -> int:
+    """Replaces every rollup inside the caller's transaction.
+
+    Capacity rows cover [first_day, last_day], by default from the first
+    appointment to the end of the booking horizon; days with appointments
+    always get a row. Returns the number of rows written.
+    """
+    activity = list(appointment_activity(conn))
+    first_day = first_day or min((a[1] for a in activity), default=date.today())
+    last_day = last_day or booking_horizon()[1].date() - timedelta(days=1)
+    business_ids = _business_ids(conn)
+    default_business = conn.execute(select(BusinessDB.id).limit(1)).scalar()
+    rollups = build_rollups(
+        activity,
+        _availability_configs(conn),
+        lambda provider_id: business_ids.get(provider_id, str(default_business)),
+        first_day,
+        last_day,
+    )
+    conn.execute(delete(DailyRollupDB))
+    return bulk_insert(conn, DailyRollupDB, (_row(r) for r in rollups))
+
+
+def _row(rollup: dict) -> dict:
+    row = {c.name: rollup[c.name] for c in DailyRollupDB.__table__.columns}
+    row["provider_id"] = uuid.UUID(row["provider_id"])
+    row["business_id"] = uuid.UUID(row["business_id"])
+    return row
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--from", dest="first_day", type=date.fromisoformat)
+    parser.add_argument("--to", dest="last_day", type=date.fromisoformat)
+    args = parser.parse_args(argv)
+    engine = create_engine(args.database_url)
+    DailyRollupDB.__table__.create(engine, checkfirst=True)
+    started = timer.perf_counter()
+    with engine.begin() as conn:
+        count = rebuild_rollups(conn, args.first_day, args.last_day)
+    print(f"Rebuilt {count:,} daily rollups in {timer.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,422 @@
+"""Synthetic dataset generator for benchmarking at production scale.
+
+    python -m app.db.synthetic --providers 1000 --customers 1000000 \
+        --slots 10000000 --appointments 5000000 --database-url sqlite:///big.db
+
+Rows are generated lazily and written with `bulk_insert` in one
+transaction, with secondary indexes rebuilt once at the end.
+"""
+
+import argparse
+import random
+import time as timer
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Connection, create_engine
+from sqlmodel import SQLModel, select
+from app.db.bulk import BULK_BATCH_SIZE, batched, bulk_insert, deferred_indexes
+from app.db.database import DATABASE_URL
+from app.db.models import (
+    BusinessDB,
+    DepartmentDB,
+    ProviderDB,
+    ProviderDepartmentLinkDB,
+    CustomerDB,
+    SlotDB,
+    AppointmentDB,
+    AvailabilityConfigDB,
+    HistoryLogDB,
+)
+from app.store.availability_rules import SLOT_DURATION
+from app.store.backends import StoreBackend
+from app.store.slot_engine import parse_weekly_template, slot_id_for, slot_uuid
+
+FIRST_NAMES = [
+    "John", "Jane", "Peter", "Mary", "Ravi", "Anita", "Chen", "Aisha", "Lucas",
+    "Sofia", "Omar", "Priya", "Mateo", "Emma", "Kenji", "Zara", "David", "Fatima",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Doe", "Jones", "Kumar", "Patel", "Wang", "Khan", "Garcia", "Rossi",
+    "Müller", "Silva", "Tanaka", "Brown", "Okafor", "Novak", "Ali", "Reddy", "Lee",
+]  # fmt: skip
+DEPARTMENT_NAMES = [
+    "General Medicine", "Dental Care", "Pediatrics", "Dermatology", "Cardiology",
+    "Orthopedics", "Physiotherapy", "Ophthalmology", "Nutrition", "Psychiatry",
+]  # fmt: skip
+WEEKLY_TEMPLATES = [
+    {
+        str(day): [("09:00:00", "12:00:00"), ("13:00:00", "17:00:00")]
+        for day in range(5)
+    },
+    {str(day): [("10:00:00", "18:00:00")] for day in (0, 1, 3, 5)},
+    {str(day): [("08:00:00", "14:00:00")] for day in range(6)},
+]
+SLOT_PRICES_CENTS = [5000, 7500, 10000, 15000]
+PAST_STATUSES = [(0.7, "Completed"), (0.8, "No-Show"), (1.0, "Cancelled")]
+FUTURE_STATUSES = [(0.4, "Pending"), (0.85, "Confirmed"), (1.0, "Cancelled")]
+_ENTITY_KINDS = {
+    "businesses": 1,
+    "departments": 2,
+    "providers": 3,
+    "customers": 4,
+    "appointments": 5,
+    "history_logs": 6,
+    "availability_configs": 7,
+}
+
+
+def entity_id(table: str, n: int) -> uuid.UUID:
+    """Deterministic id for the n-th generated row of a table, so rows can
+    reference each other without keeping every id in memory."""
+    return uuid.UUID(int=(_ENTITY_KINDS[table] << 96) | n)
+
+
+def _pick_status(statuses: list[tuple[float, str]], roll: float) -> str:
+    return next(status for upto, status in statuses if roll < upto)
+
+
+def _template_ranges(template: dict) -> dict[int, list[tuple[time, time]]]:
+    return {
+        int(day): [(time.fromisoformat(s), time.fromisoformat(e)) for s, e in ranges]
+        for day, ranges in template.items()
+    }
+
+
+def _provider_slot_starts(
+    template: dict[int, list[tuple[time, time]]], first_day: date, count: int
+) -> Iterator[datetime]:
+    day = first_day
+    while count > 0:
+        for range_start, range_end in template.get(day.weekday(), []):
+            current = datetime.combine(day, range_start)
+            range_end_dt = datetime.combine(day, range_end)
+            while current + SLOT_DURATION <= range_end_dt and count > 0:
+                yield current
+                current += SLOT_DURATION
+                count -= 1
+        day += timedelta(days=1)
+
+
+class SyntheticDataset:
+    """Row generators for one synthetic dataset, sized by the constructor."""
+
+    def __init__(
+        self,
+        providers: int,
+        customers: int,
+        slots: int,
+        appointments: int,
+        departments: int = len(DEPARTMENT_NAMES),
+        seed: int = 0,
+    ):
+        if appointments > slots:
+            raise ValueError("Cannot book more appointments than there are slots.")
+        self.providers = providers
+        self.customers = customers
+        self.slots = slots
+        self.appointments = appointments
+        self.departments = departments
+        self.rng = random.Random(seed)
+        self.now = datetime.now().replace(microsecond=0)
+        self.business_id = entity_id("businesses", 0)
+
+    def business_rows(self) -> list[dict]:
+        return [
+            {
+                "id": self.business_id,
+                "legal_name": "Synthetic Health Group Inc.",
+                "display_name": "Synthetic Health Group",
+                "logo_url": "/placeholder.svg",
+                "contact_email": "contact@synthetic.example",
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+        ]
+
+    def department_rows(self) -> Iterator[dict]:
+        for i in range(self.departments):
+            base = DEPARTMENT_NAMES[i % len(DEPARTMENT_NAMES)]
+            suffix = i // len(DEPARTMENT_NAMES)
+            yield {
+                "id": entity_id("departments", i),
+                "name": f"{base} {suffix + 1}" if suffix else base,
+                "description": f"{base} services.",
+                "business_id": self.business_id,
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def provider_rows(self) -> Iterator[dict]:
+        for i in range(self.providers):
+            name = f"Dr. {self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            yield {
+                "id": entity_id("providers", i),
+                "name": name,
+                "status": "Active" if i % 20 else "Inactive",
+                "bio": "Synthetic provider.",
+                "contact_mobile": f"555-{i:07d}",
+                "contact_email": f"provider{i}@synthetic.example",
+                "slot_price_cents": SLOT_PRICES_CENTS[i % len(SLOT_PRICES_CENTS)],
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def provider_department_rows(self) -> Iterator[dict]:
+        for i in range(self.providers):
+            first = i % self.departments
+            for d in {first, (first + i // self.departments) % self.departments}:
+                yield {
+                    "provider_id": entity_id("providers", i),
+                    "department_id": entity_id("departments", d),
+                }
+
+    def availability_rows(self) -> Iterator[dict]:
+        for i in range(self.providers):
+            yield {
+                "id": entity_id("availability_configs", i),
+                "provider_id": entity_id("providers", i),
+                "month": self.now.strftime("%Y-%m"),
+                "weekly_template": WEEKLY_TEMPLATES[i % len(WEEKLY_TEMPLATES)],
+                "exceptions": {},
+                "holiday_calendar": None,
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def customer_rows(self) -> Iterator[dict]:
+        rng = self.rng
+        for i in range(self.customers):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                "id": entity_id("customers", i),
+                "full_name": f"{first} {last}",
+                "mobile": f"9{i:09d}",
+                "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "age": rng.randint(18, 90),
+                "gender": rng.choice(["Male", "Female", "Other"]),
+                "created_at": self.now,
+                "updated_at": self.now,
+            }
+
+    def slot_bookings(self) -> Iterator[tuple[dict, Optional[str]]]:
+        """Yields (slot row, appointment status or None), spreading exactly
+        `appointments` bookings evenly over `slots` slots.
+
+        Each provider's slots start far enough in the past that about half
+        of them have already happened, so past and future statuses mix.
+        """
+        per_provider, extra = divmod(self.slots, self.providers)
+        booked_acc = 0
+        rng = self.rng
+        for i in range(self.providers):
+            count = per_provider + (i < extra)
+            template = WEEKLY_TEMPLATES[i % len(WEEKLY_TEMPLATES)]
+            ranges = _template_ranges(template)
+            per_week = sum(
+                (
+                    (datetime.combine(date.min, e) - datetime.combine(date.min, s))
+                    // SLOT_DURATION
+                    for day in ranges.values()
+                    for s, e in day
+                )
+            )
+            first_day = self.now.date() - timedelta(days=count * 7 // per_week // 2)
+            provider_id = entity_id("providers", i)
+            provider_key = str(provider_id)
+            price = SLOT_PRICES_CENTS[i % len(SLOT_PRICES_CENTS)]
+            month_start = month_end = None
+            for start in _provider_slot_starts(ranges, first_day, count):
+                if not month_start or not month_start <= start < month_end:
+                    month_start = start.replace(day=1, hour=0, minute=0)
+                    month_end = month_start + relativedelta(months=1)
+                    month = start.strftime("%Y-%m")
+                status = None
+                booked_acc += self.appointments
+                if booked_acc >= self.slots:
+                    booked_acc -= self.slots
+                    status = _pick_status(
+                        PAST_STATUSES if start < self.now else FUTURE_STATUSES,
+                        rng.random(),
+                    )
+                yield {
+                    "id": slot_uuid(slot_id_for(provider_key, start)),
+                    "provider_id": provider_id,
+                    "start_datetime": start,
+                    "end_datetime": start + SLOT_DURATION,
+                    "price_cents": price,
+                    "is_booked": status not in (None, "Cancelled"),
+                    "calendar_month": month,
+                    "created_at": self.now,
+                    "updated_at": self.now,
+                }, status
+
+    def appointment_rows(self, booked: list[tuple[dict, str]], first: int):
+        """Appointment and history log rows for one batch of booked slots."""
+        rng = self.rng
+        appointments, logs = [], []
+        for n, (slot, status) in enumerate(booked, start=first):
+            appointment_id = entity_id("appointments", n)
+            created_at = min(
+                slot["start_datetime"] - timedelta(days=rng.randint(1, 30)), self.now
+            )
+            appointments.append(
+                {
+                    "id": appointment_id,
+                    "slot_id": slot["id"],
+                    "provider_id": slot["provider_id"],
+                    "customer_id": entity_id(
+                        "customers", rng.randrange(self.customers)
+                    ),
+                    "status": status,
+                    "notes": f"This is a {status.lower()} appointment.",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+            logs.append(
+                {
+                    "id": entity_id("history_logs", n),
+                    "appointment_id": appointment_id,
+                    "action": "create",
+                    "performed_by": "System",
+                    "user_type": "System",
+                    "timestamp": created_at,
+                    "new_status": status,
+                    "details": "Appointment created by the synthetic generator",
+                }
+            )
+        return appointments, logs
+
+
+def _record(row: dict, **fields) -> dict:
+    """A generated row with its UUIDs as strings, as the store keeps them."""
+    record = {k: str(v) if isinstance(v, uuid.UUID) else v for k, v in row.items()}
+    record.update(fields)
+    return record
+
+
+class SyntheticBackend(StoreBackend):
+    """Serves a dataset from memory in the shape SqlRepository loads it, so
+    benchmarks can build a large DataStore without writing a database.
+    Like MemoryBackend, it keeps writes in process memory only."""
+
+    def __init__(self, dataset: SyntheticDataset):
+        self.dataset = dataset
+
+    def load(self) -> dict:
+        dataset = self.dataset
+        department_ids = defaultdict(list)
+        for link in dataset.provider_department_rows():
+            department_ids[str(link["provider_id"])].append(str(link["department_id"]))
+        slots, appointments, history_logs = [], [], []
+        for batch in batched(dataset.slot_bookings(), BULK_BATCH_SIZE):
+            slot_ids = {}
+            for slot, _ in batch:
+                record = _record(slot)
+                record["id"] = slot_ids[slot["id"]] = slot_id_for(
+                    record["provider_id"], slot["start_datetime"]
+                )
+                slots.append(record)
+            booked = [(slot, status) for slot, status in batch if status]
+            rows, logs = dataset.appointment_rows(booked, len(appointments))
+            appointments += [_record(r, slot_id=slot_ids[r["slot_id"]]) for r in rows]
+            history_logs += [_record(log, old_status=None) for log in logs]
+        return {
+            "businesses": [_record(row) for row in dataset.business_rows()],
+            "departments": [_record(row) for row in dataset.department_rows()],
+            "providers": [
+                _record(row, department_ids=department_ids[str(row["id"])])
+                for row in dataset.provider_rows()
+            ],
+            "customers": [_record(row) for row in dataset.customer_rows()],
+            "slots": slots,
+            "appointments": appointments,
+            "availability_configs": [
+                _record(
+                    row, weekly_template=parse_weekly_template(row["weekly_template"])
+                )
+                for row in dataset.availability_rows()
+            ],
+            "history_logs": history_logs,
+        }
+
+
+BULK_MODELS = [
+    BusinessDB,
+    DepartmentDB,
+    ProviderDB,
+    ProviderDepartmentLinkDB,
+    CustomerDB,
+    SlotDB,
+    AppointmentDB,
+    AvailabilityConfigDB,
+    HistoryLogDB,
+]
+
+
+def load_dataset(conn: Connection, dataset: SyntheticDataset) -> dict[str, int]:
+    """Writes the dataset through `conn`; the caller owns the transaction."""
+    counts = {}
+    with deferred_indexes(conn, BULK_MODELS):
+        counts["businesses"] = bulk_insert(conn, BusinessDB, dataset.business_rows())
+        counts["departments"] = bulk_insert(
+            conn, DepartmentDB, dataset.department_rows()
+        )
+        counts["providers"] = bulk_insert(conn, ProviderDB, dataset.provider_rows())
+        counts["provider_department_link"] = bulk_insert(
+            conn, ProviderDepartmentLinkDB, dataset.provider_department_rows()
+        )
+        counts["availability_configs"] = bulk_insert(
+            conn, AvailabilityConfigDB, dataset.availability_rows()
+        )
+        counts["customers"] = bulk_insert(conn, CustomerDB, dataset.customer_rows())
+        counts["slots"] = counts["appointments"] = counts["history_logs"] = 0
+        for batch in batched(dataset.slot_bookings(), BULK_BATCH_SIZE):
+            counts["slots"] += bulk_insert(conn, SlotDB, [slot for slot, _ in batch])
+            booked = [(slot, status) for slot, status in batch if status]
+            appointments, logs = dataset.appointment_rows(
+                booked, counts["appointments"]
+            )
+            counts["appointments"] += bulk_insert(conn, AppointmentDB, appointments)
+            counts["history_logs"] += bulk_insert(conn, HistoryLogDB, logs)
+    return counts
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("--providers", type=int, default=1000)
+    parser.add_argument("--departments", type=int, default=len(DEPARTMENT_NAMES))
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--slots", type=int, default=1000000)
+    parser.add_argument("--appointments", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    dataset = SyntheticDataset(
+        args.providers,
+        args.customers,
+        args.slots,
+        args.appointments,
+        args.departments,
+        args.seed,
+    )
+    engine = create_engine(args.database_url)
+    SQLModel.metadata.create_all(engine)
+    started = timer.perf_counter()
+    with engine.begin() as conn:
+        if conn.execute(select(BusinessDB.id).limit(1)).first():
+            parser.error("The target database already has data.")
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        counts = load_dataset(conn, dataset)
+    elapsed = timer.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table:>26}: {count:>10,}")
+    print(f"Loaded {sum(counts.values()):,} rows in {elapsed:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
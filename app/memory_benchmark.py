@@ -0,0 +1,169 @@
+"""Measures the memory of the compact slot, appointment and log tables.
+
+    python -m app.memory_benchmark [--providers 200] [--slots 200000] [--appointments 150000] [--logs 300000] [--min-reduction 5.0]
+
+Generates rows shaped like SqlRepository.load returns them, with fresh id
+strings and datetimes per row and a distinct note per appointment, then
+measures with tracemalloc what each table takes:
+
+- as dicts of row dicts by id (the history log as a list of dicts), as
+  the store kept them before;
+- as SlotTable, AppointmentTable and HistoryLogTable.
+
+Exits non-zero if the total reduction is below `--min-reduction`.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from app.store.records import AppointmentTable, HistoryLogTable, SlotTable
+from app.store.slot_engine import slot_id_for
+
+STATUSES = ["Pending", "Confirmed", "Completed", "Cancelled", "No-Show"]
+
+
+class Rows:
+    """Row generators for one dataset; each call builds new row objects."""
+
+    def __init__(self, args):
+        rng = random.Random(0)
+        self.args = args
+        # UUIDs, turned into a new string per row as SqlRepository does
+        self.providers = [uuid.uuid4() for _ in range(args.providers)]
+        self.customers = [uuid.uuid4() for _ in range(args.slots // 10)]
+        self.appointment_ids = [uuid.uuid4() for _ in range(args.appointments)]
+        self.log_ids = [uuid.uuid4() for _ in range(args.logs)]
+        base = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        self.starts = [
+            base + timedelta(minutes=30 * (i // args.providers))
+            for i in range(args.slots)
+        ]
+        self.refs = [rng.randrange(10**6) for _ in range(args.appointments)]
+
+    def provider(self, i: int) -> str:
+        return str(self.providers[i % len(self.providers)])
+
+    def slots(self) -> list[dict]:
+        now = datetime.now()
+        return [
+            {
+                "id": slot_id_for(self.provider(i), start),
+                "provider_id": self.provider(i),
+                "start_datetime": start + timedelta(0),
+                "end_datetime": start + timedelta(minutes=30),
+                "price_cents": 7500,
+                "is_booked": i < self.args.appointments,
+                "calendar_month": start.strftime("%Y-%m"),
+                "created_at": now + timedelta(0),
+                "updated_at": now + timedelta(0),
+            }
+            for i, start in enumerate(self.starts)
+        ]
+
+    def appointments(self) -> list[dict]:
+        now = datetime.now()
+        return [
+            {
+                "id": str(appointment_id),
+                "slot_id": slot_id_for(self.provider(i), self.starts[i]),
+                "provider_id": self.provider(i),
+                "customer_id": str(self.customers[i % len(self.customers)]),
+                "status": STATUSES[i % len(STATUSES)],
+                "notes": f"Booked by phone, reference {self.refs[i]}.",
+                "created_at": now + timedelta(0),
+                "updated_at": now + timedelta(0),
+            }
+            for i, appointment_id in enumerate(self.appointment_ids)
+        ]
+
+    def history_logs(self) -> list[dict]:
+        now = datetime.now()
+        return [
+            {
+                "id": str(log_id),
+                "appointment_id": str(
+                    self.appointment_ids[i % len(self.appointment_ids)]
+                ),
+                "action": "status_change",
+                "performed_by": "Admin",
+                "user_type": "WebApp",
+                "timestamp": now + timedelta(0),
+                "old_status": "Pending",
+                "new_status": "Confirmed",
+                "details": None,
+            }
+            for i, log_id in enumerate(self.log_ids)
+        ]
+
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def measure(make, store) -> tuple[int, float, object]:
+    """Bytes held by `store(make())` once the rows are dropped, and the
+    seconds `store` took."""
+    before = traced()
+    rows = make()
+    started = time.perf_counter()
+    stored = store(rows)
+    seconds = time.perf_counter() - started
+    del rows
+    return traced() - before, seconds, stored
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--slots", type=int, default=200000)
+    parser.add_argument("--appointments", type=int, default=150000)
+    parser.add_argument("--logs", type=int, default=300000)
+    parser.add_argument("--min-reduction", type=float, default=5.0)
+    args = parser.parse_args()
+    rows = Rows(args)
+    by_id = lambda records: {r["id"]: r for r in records}  # noqa: E731
+    tables = [
+        ("slots", rows.slots, by_id, SlotTable.build, args.slots),
+        (
+            "appointments",
+            rows.appointments,
+            by_id,
+            AppointmentTable.build,
+            args.appointments,
+        ),
+        ("history_logs", rows.history_logs, list, HistoryLogTable.build, args.logs),
+    ]
+    tracemalloc.start()
+    total_dicts = total_compact = 0
+    for name, make, as_dicts, as_table, count in tables:
+        dicts, _, stored = measure(make, as_dicts)
+        del stored
+        compact, seconds, stored = measure(make, as_table)
+        del stored
+        total_dicts += dicts
+        total_compact += compact
+        print(
+            f"{name:<13}{count:>8} rows: dicts {dicts / count:.0f} B/row, "
+            f"compact {compact / count:.0f} B/row, {dicts / compact:.1f}x "
+            f"(built in {seconds:.2f}s)"
+        )
+    tracemalloc.stop()
+    reduction = total_dicts / total_compact
+    print(
+        f"total: dicts {total_dicts / 2**20:.1f}MB, "
+        f"compact {total_compact / 2**20:.1f}MB, {reduction:.1f}x"
+    )
+    if reduction < args.min_reduction:
+        print(f"the reduction is below {args.min_reduction}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
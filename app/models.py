@@ -40,6 +40,9 @@ class Provider(TypedDict):
     bio: Optional[str]
     contact_mobile: Optional[str]
     contact_email: Optional[str]
+    # price of the slots whose availability rule sets none; None for the
+    # default price
+    slot_price_cents: Optional[int]
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
@@ -84,8 +87,11 @@ class AvailabilityConfig(TypedDict):
     id: str
     provider_id: str
     month: str
-    weekly_template: dict[int, list[tuple[datetime.time, datetime.time]]]
-    exceptions: dict
+    # weekday -> rules; see app/store/availability_rules.py
+    weekly_template: dict[int, list[tuple]]
+    # ISO date -> rules replacing that day's; an empty list closes it
+    exceptions: dict[str, list[tuple]]
+    holiday_calendar: Optional[str]
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
@@ -99,4 +105,18 @@ class HistoryLog(TypedDict):
     timestamp: datetime.datetime
     old_status: Optional[str]
     new_status: Optional[str]
-    details: Optional[str]
\ No newline at end of file
+    details: Optional[str]
+
+
+class DailyRollup(TypedDict):
+    id: str
+    business_id: str
+    provider_id: str
+    day: datetime.date
+    booked_slots: int
+    available_slots: int
+    completed: int
+    cancelled: int
+    no_shows: int
+    revenue_cents: int
+    updated_at: datetime.datetime
\ No newline at end of file
@@ -1,6 +1,6 @@
 import reflex as rx
 from app.states.appointments_state import AppointmentsState
-from app.models import Appointment
+from app.store.appointment_rows import AppointmentRow
 
 
 def status_badge(status: rx.Var[str]) -> rx.Component:
@@ -33,25 +33,23 @@ def status_badge(status: rx.Var[str]) -> rx.Component:
     )
 
 
-def appointment_card(appointment: Appointment) -> rx.Component:
+def appointment_card(appointment: AppointmentRow) -> rx.Component:
     """A card displaying a single appointment's information."""
-    customer_name = AppointmentsState.customer_details.get(
-        appointment["customer_id"], {}
-    ).get("name", "N/A")
-    customer_avatar = AppointmentsState.customer_details.get(
-        appointment["customer_id"], {}
-    ).get("avatar", "")
-    provider_name = AppointmentsState.provider_details.get(
-        appointment["provider_id"], "N/A"
-    )
     return rx.el.div(
         rx.el.div(
             rx.el.div(
-                rx.image(src=customer_avatar, class_name="h-10 w-10 rounded-full"),
+                rx.image(
+                    src=appointment["customer_avatar"],
+                    class_name="h-10 w-10 rounded-full",
+                ),
                 rx.el.div(
-                    rx.el.h3(customer_name, class_name="font-semibold text-gray-800"),
+                    rx.el.h3(
+                        appointment["customer_name"],
+                        class_name="font-semibold text-gray-800",
+                    ),
                     rx.el.p(
-                        f"with {provider_name}", class_name="text-sm text-gray-600"
+                        f"with {appointment['provider_name']}",
+                        class_name="text-sm text-gray-600",
                     ),
                 ),
                 class_name="flex items-center gap-3",
@@ -63,7 +61,7 @@ def appointment_card(appointment: Appointment) -> rx.Component:
             rx.el.div(
                 rx.icon("calendar", class_name="h-4 w-4 text-gray-500"),
                 rx.el.span(
-                    AppointmentsState.appointment_datetimes[appointment["id"]]["date"],
+                    appointment["date"],
                     class_name="text-sm text-gray-600",
                 ),
                 class_name="flex items-center gap-2",
@@ -71,7 +69,7 @@ def appointment_card(appointment: Appointment) -> rx.Component:
             rx.el.div(
                 rx.icon("clock", class_name="h-4 w-4 text-gray-500"),
                 rx.el.span(
-                    AppointmentsState.appointment_datetimes[appointment["id"]]["time"],
+                    appointment["time"],
                     class_name="text-sm text-gray-600",
                 ),
                 class_name="flex items-center gap-2",
@@ -79,7 +77,7 @@ def appointment_card(appointment: Appointment) -> rx.Component:
             rx.el.div(
                 rx.icon("dollar-sign", class_name="h-4 w-4 text-gray-500"),
                 rx.el.span(
-                    AppointmentsState.appointment_prices[appointment["id"]],
+                    appointment["price"],
                     class_name="text-sm text-gray-600",
                 ),
                 class_name="flex items-center gap-2",
@@ -147,7 +145,7 @@ def filter_controls() -> rx.Component:
                 class_name="absolute left-3 top-1/2 -translate-y-1/2 h-5 w-5 text-gray-400",
             ),
             rx.el.input(
-                placeholder="Search by customer name...",
+                placeholder="Search by customer name or mobile...",
                 on_change=AppointmentsState.set_search_term,
                 class_name="w-full max-w-sm pl-10 pr-4 py-2 border rounded-lg",
                 debounce_timeout=300,
@@ -168,14 +166,47 @@ def filter_controls() -> rx.Component:
     )
 
 
+def pagination_controls() -> rx.Component:
+    """Previous/next buttons for the keyset-paged appointment list."""
+    return rx.el.div(
+        rx.el.button(
+            rx.icon("chevron-left", class_name="h-4 w-4"),
+            "Previous",
+            on_click=AppointmentsState.previous_page,
+            disabled=AppointmentsState.page_number <= 1,
+            class_name="flex items-center gap-1 px-3 py-2 border rounded-lg text-sm disabled:opacity-50",
+        ),
+        rx.el.span(
+            f"Page {AppointmentsState.page_number}",
+            class_name="text-sm text-gray-600",
+        ),
+        rx.el.button(
+            "Next",
+            rx.icon("chevron-right", class_name="h-4 w-4"),
+            on_click=AppointmentsState.next_page,
+            disabled=~AppointmentsState.has_next_page,
+            class_name="flex items-center gap-1 px-3 py-2 border rounded-lg text-sm disabled:opacity-50",
+        ),
+        class_name="flex items-center justify-center gap-4 mt-6",
+    )
+
+
 def appointments_page() -> rx.Component:
     return rx.el.div(
         rx.el.h1("Appointments", class_name="text-2xl font-bold text-gray-900 mb-6"),
         filter_controls(),
         rx.cond(
-            AppointmentsState.filtered_appointments.length() > 0,
+            AppointmentsState.customers_capped,
+            rx.el.p(
+                "Showing the appointments of the first matching customers only. Refine the search to narrow them down.",
+                class_name="text-sm text-gray-500 mb-4",
+            ),
+            None,
+        ),
+        rx.cond(
+            AppointmentsState.appointment_rows.length() > 0,
             rx.el.div(
-                rx.foreach(AppointmentsState.filtered_appointments, appointment_card),
+                rx.foreach(AppointmentsState.appointment_rows, appointment_card),
                 class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6",
             ),
             rx.el.div(
@@ -183,6 +214,7 @@ def appointments_page() -> rx.Component:
                 class_name="text-center py-12 text-gray-500 bg-gray-50 rounded-lg",
             ),
         ),
+        pagination_controls(),
         class_name="max-w-[1600px] w-full mx-auto",
         on_mount=AppointmentsState.on_load,
     )
\ No newline at end of file
@@ -69,4 +69,5 @@ def archived_providers_page() -> rx.Component:
             )
         ),
         class_name="max-w-[1200px] w-full mx-auto",
+        on_mount=ManagementState.on_management_load,
     )
\ No newline at end of file
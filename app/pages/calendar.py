@@ -1,5 +1,12 @@
 import reflex as rx
-from app.states.calendar_state import CalendarState, FormattedSlot
+from app.states.calendar_state import (
+    AvailabilityDay,
+    AvailabilityRange,
+    CalendarState,
+    FormattedSlot,
+    ProviderColumn,
+    ViewSlot,
+)
 from typing import Optional
 
 
@@ -16,7 +23,7 @@ def booking_modal() -> rx.Component:
                 rx.el.div(
                     rx.el.div(
                         rx.el.p("Provider:", class_name="font-medium"),
-                        rx.el.p(CalendarState.selected_provider_name),
+                        rx.el.p(CalendarState.booking_provider_name),
                         class_name="flex justify-between",
                     ),
                     rx.el.div(
@@ -37,6 +44,13 @@ def booking_modal() -> rx.Component:
                     ),
                     rx.el.div(
                         rx.el.label("Customer", class_name="font-medium"),
+                        rx.el.input(
+                            placeholder="Search customers by name or mobile...",
+                            value=CalendarState.booking_customer_search,
+                            on_change=CalendarState.set_booking_customer_search,
+                            class_name="w-full mt-1 p-2 border rounded-md",
+                            debounce_timeout=300,
+                        ),
                         rx.el.select(
                             rx.foreach(
                                 CalendarState.customers,
@@ -82,27 +96,107 @@ def booking_modal() -> rx.Component:
     )
 
 
+def availability_field(
+    row: AvailabilityRange,
+    day: int,
+    index: int,
+    field: str,
+    width: str = "w-24",
+    **props,
+) -> rx.Component:
+    return rx.el.input(
+        value=row[field],
+        on_change=lambda value: CalendarState.set_availability_field(
+            day, index, field, value
+        ),
+        class_name=f"p-1 border rounded-md text-sm {width}",
+        **props,
+    )
+
+
+def availability_range(row: AvailabilityRange, day: int, index: int) -> rx.Component:
+    return rx.el.div(
+        availability_field(row, day, index, "start", type="time", step=1800),
+        rx.el.span("-"),
+        availability_field(row, day, index, "end", type="time", step=1800),
+        availability_field(
+            row, day, index, "duration", type="number", title="Minutes", width="w-16"
+        ),
+        availability_field(
+            row,
+            day,
+            index,
+            "buffer",
+            type="number",
+            title="Buffer minutes",
+            width="w-16",
+        ),
+        availability_field(row, day, index, "price", placeholder="Price", width="w-20"),
+        rx.el.button(
+            rx.icon("x", size=14),
+            on_click=CalendarState.remove_availability_range(day, index),
+            class_name="p-1 text-gray-500 hover:text-red-600",
+        ),
+        class_name="flex items-center gap-2",
+    )
+
+
+def availability_day(day: AvailabilityDay, index: int) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(day["name"], class_name="font-medium text-sm"),
+            rx.el.button(
+                "Add range",
+                on_click=CalendarState.add_availability_range(index),
+                class_name="text-xs text-emerald-700",
+            ),
+            class_name="flex justify-between items-center",
+        ),
+        rx.foreach(
+            day["ranges"],
+            lambda row, position: availability_range(row, index, position),
+        ),
+        class_name="space-y-1",
+    )
+
+
 def availability_modal() -> rx.Component:
     return rx.dialog.root(
         rx.dialog.content(
             rx.dialog.title("Edit Availability", class_name="text-lg font-semibold"),
             rx.el.div(
                 rx.el.p(
-                    f"Editing for: {CalendarState.selected_month}",
+                    f"Editing for: {CalendarState.availability_month}",
                     class_name="text-sm text-gray-600 mb-4",
                 ),
                 rx.el.p(
-                    "Availability editing form will be implemented in a future phase."
+                    "Start, end, slot minutes, buffer minutes and price; an empty price is the provider's.",
+                    class_name="text-xs text-gray-500 mb-2",
                 ),
+                rx.foreach(CalendarState.availability_days, availability_day),
+                rx.cond(
+                    CalendarState.availability_error != "",
+                    rx.el.p(
+                        CalendarState.availability_error,
+                        class_name="text-sm text-red-600 mt-2",
+                    ),
+                    None,
+                ),
+                class_name="space-y-3",
             ),
             rx.el.div(
                 rx.dialog.close(
                     rx.el.button(
-                        "Close",
+                        "Cancel",
                         class_name="px-4 py-2 bg-gray-200 text-gray-800 rounded-lg hover:bg-gray-300",
                         on_click=CalendarState.close_availability_modal,
                     )
                 ),
+                rx.el.button(
+                    "Save",
+                    on_click=CalendarState.save_availability,
+                    class_name="px-4 py-2 bg-emerald-600 text-white rounded-lg hover:bg-emerald-700",
+                ),
                 class_name="flex justify-end gap-3 mt-6",
             ),
         ),
@@ -110,32 +204,69 @@ def availability_modal() -> rx.Component:
     )
 
 
+def month_navigation() -> rx.Component:
+    return rx.el.div(
+        rx.el.select(
+            rx.foreach(
+                CalendarState.providers,
+                lambda p: rx.el.option(p["name"], value=p["id"]),
+            ),
+            value=CalendarState.selected_provider_id,
+            on_change=CalendarState.handle_provider_change,
+            class_name="p-2 border rounded-md shadow-sm",
+        ),
+        rx.el.div(
+            rx.el.button(
+                rx.icon("chevron-left"),
+                on_click=lambda: CalendarState.change_month(-1),
+            ),
+            rx.el.span(
+                CalendarState.selected_month,
+                class_name="font-semibold text-lg w-28 text-center",
+            ),
+            rx.el.button(
+                rx.icon("chevron-right"),
+                on_click=lambda: CalendarState.change_month(1),
+            ),
+            class_name="flex items-center gap-4",
+        ),
+        class_name="flex items-center gap-6",
+    )
+
+
+def window_navigation() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.icon("chevron-left"),
+            on_click=lambda: CalendarState.shift_view(-1),
+        ),
+        rx.el.span(
+            CalendarState.view_date,
+            class_name="font-semibold text-lg w-32 text-center",
+        ),
+        rx.el.button(
+            rx.icon("chevron-right"),
+            on_click=lambda: CalendarState.shift_view(1),
+        ),
+        class_name="flex items-center gap-4",
+    )
+
+
 def calendar_controls() -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.select(
-                rx.foreach(
-                    CalendarState.providers,
-                    lambda p: rx.el.option(p["name"], value=p["id"]),
-                ),
-                value=CalendarState.selected_provider_id,
-                on_change=CalendarState.handle_provider_change,
+                rx.el.option("Month", value="month"),
+                rx.el.option("Week", value="week"),
+                rx.el.option("Day", value="day"),
+                value=CalendarState.calendar_view,
+                on_change=CalendarState.set_calendar_view,
                 class_name="p-2 border rounded-md shadow-sm",
             ),
-            rx.el.div(
-                rx.el.button(
-                    rx.icon("chevron-left"),
-                    on_click=lambda: CalendarState.change_month(-1),
-                ),
-                rx.el.span(
-                    CalendarState.selected_month,
-                    class_name="font-semibold text-lg w-28 text-center",
-                ),
-                rx.el.button(
-                    rx.icon("chevron-right"),
-                    on_click=lambda: CalendarState.change_month(1),
-                ),
-                class_name="flex items-center gap-4",
+            rx.cond(
+                CalendarState.calendar_view == "month",
+                month_navigation(),
+                window_navigation(),
             ),
             class_name="flex items-center gap-6",
         ),
@@ -148,14 +279,32 @@ def calendar_controls() -> rx.Component:
     )
 
 
+def provider_picker() -> rx.Component:
+    """Toggles the provider rows of the week and day views."""
+    return rx.el.div(
+        rx.foreach(
+            CalendarState.providers,
+            lambda p: rx.el.button(
+                p["name"],
+                on_click=CalendarState.toggle_view_provider(p["id"]),
+                class_name=rx.cond(
+                    CalendarState.view_provider_ids.contains(p["id"]),
+                    "px-2 py-1 text-xs rounded-full bg-emerald-600 text-white",
+                    "px-2 py-1 text-xs rounded-full bg-gray-100 text-gray-700 hover:bg-gray-200",
+                ),
+            ),
+        ),
+        class_name="flex flex-wrap gap-2 mb-4",
+    )
+
+
 def slot_chip(slot: FormattedSlot) -> rx.Component:
+    is_booked = CalendarState.slot_booked.get(slot["id"], slot["is_booked"])
     return rx.el.div(
         rx.el.span(slot["time_str"]),
-        on_click=rx.cond(
-            slot["is_booked"], rx.noop(), CalendarState.open_booking_modal(slot)
-        ),
+        on_click=rx.cond(is_booked, rx.noop(), CalendarState.open_booking_modal(slot)),
         class_name=rx.cond(
-            slot["is_booked"],
+            is_booked,
             "px-1.5 py-0.5 text-xs text-gray-600 bg-gray-200 rounded-md cursor-not-allowed w-fit",
             "px-1.5 py-0.5 text-xs text-emerald-800 bg-emerald-100 rounded-md cursor-pointer hover:bg-emerald-200 w-fit",
         ),
@@ -210,15 +359,135 @@ def calendar_grid() -> rx.Component:
     )
 
 
+def view_slot_chip(provider_id: rx.Var[str], slot: ViewSlot) -> rx.Component:
+    slot_id = provider_id + "@" + slot["start"]
+    is_booked = CalendarState.slot_booked.get(slot_id, slot["is_booked"])
+    return rx.el.div(
+        rx.el.span(slot["time_str"]),
+        on_click=rx.cond(
+            is_booked, rx.noop(), CalendarState.open_view_booking(slot_id)
+        ),
+        class_name=rx.cond(
+            is_booked,
+            "px-1.5 py-0.5 text-xs text-gray-600 bg-gray-200 rounded-md cursor-not-allowed w-fit",
+            "px-1.5 py-0.5 text-xs text-emerald-800 bg-emerald-100 rounded-md cursor-pointer hover:bg-emerald-200 w-fit",
+        ),
+    )
+
+
+def provider_row(column: ProviderColumn) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            column["name"],
+            class_name="p-2 text-sm font-medium text-gray-800 align-top w-40",
+        ),
+        rx.foreach(
+            column["days"],
+            lambda slots: rx.el.td(
+                rx.el.div(
+                    rx.foreach(
+                        slots, lambda slot: view_slot_chip(column["provider_id"], slot)
+                    ),
+                    class_name="flex flex-wrap gap-1",
+                ),
+                class_name="p-2 border-l border-gray-200 align-top",
+            ),
+        ),
+        class_name="border-t border-gray-200",
+    )
+
+
+def window_grid() -> rx.Component:
+    """The week or day view: one row per chosen provider, every slot shown."""
+    return rx.el.div(
+        provider_picker(),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("Provider", class_name="p-2 text-left"),
+                        rx.foreach(
+                            CalendarState.view_days,
+                            lambda label: rx.el.th(label, class_name="p-2 text-center"),
+                        ),
+                        class_name="text-sm font-semibold bg-gray-50",
+                    )
+                ),
+                rx.el.tbody(rx.foreach(CalendarState.view_columns, provider_row)),
+                class_name="w-full border border-gray-200 rounded-lg",
+            ),
+            class_name="overflow-x-auto",
+        ),
+    )
+
+
+def first_available_search() -> rx.Component:
+    """Finds the earliest free slots across a department's providers."""
+    return rx.el.div(
+        rx.el.div(
+            rx.el.select(
+                rx.el.option("All Departments", value=""),
+                rx.foreach(
+                    CalendarState.department_options,
+                    lambda option: rx.el.option(option["label"], value=option["value"]),
+                ),
+                value=CalendarState.search_department_id,
+                on_change=CalendarState.set_search_department_id,
+                class_name="p-2 border rounded-md shadow-sm text-sm",
+            ),
+            rx.el.input(
+                type="date",
+                value=CalendarState.search_after,
+                on_change=CalendarState.set_search_after,
+                class_name="p-2 border rounded-md shadow-sm text-sm",
+            ),
+            rx.el.select(
+                rx.foreach(
+                    CalendarState.window_options,
+                    lambda option: rx.el.option(option["label"], value=option["value"]),
+                ),
+                value=CalendarState.search_window,
+                on_change=CalendarState.set_search_window,
+                class_name="p-2 border rounded-md shadow-sm text-sm",
+            ),
+            rx.el.button(
+                "Find First Available",
+                on_click=CalendarState.find_first_available,
+                class_name="px-4 py-2 bg-emerald-600 text-white rounded-md text-sm hover:bg-emerald-700",
+            ),
+            class_name="flex flex-wrap items-center gap-3",
+        ),
+        rx.el.div(
+            rx.foreach(
+                CalendarState.search_results,
+                lambda result: rx.el.button(
+                    rx.el.span(result["date_str"], class_name="font-medium"),
+                    rx.el.span(result["time_str"]),
+                    rx.el.span(result["provider_name"], class_name="text-gray-500"),
+                    on_click=CalendarState.open_view_booking(result["id"]),
+                    class_name="flex gap-2 px-2 py-1 text-xs text-emerald-800 bg-emerald-50 rounded-md hover:bg-emerald-100",
+                ),
+            ),
+            class_name="flex flex-wrap gap-2 mt-3",
+        ),
+        class_name="p-4 mb-6 bg-white rounded-xl border border-gray-200 shadow-sm",
+    )
+
+
 def calendar_page() -> rx.Component:
     """The UI for the calendar page."""
     return rx.el.div(
         booking_modal(),
         availability_modal(),
         rx.el.h1("Calendar", class_name="text-2xl font-bold text-gray-900 mb-6"),
+        first_available_search(),
         rx.el.div(
             calendar_controls(),
-            calendar_grid(),
+            rx.cond(
+                CalendarState.calendar_view == "month",
+                calendar_grid(),
+                window_grid(),
+            ),
             class_name="p-6 bg-white rounded-xl border border-gray-200 shadow-sm",
         ),
         class_name="max-w-[1200px] w-full mx-auto",
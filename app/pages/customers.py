@@ -55,6 +55,7 @@ def customers_page() -> rx.Component:
                     placeholder="Search customers by name or mobile...",
                     on_change=ManagementState.set_customer_search_term,
                     class_name="w-full pl-10 pr-4 py-2 border rounded-lg",
+                    debounce_timeout=300,
                 ),
                 class_name="relative w-full max-w-md",
             ),
@@ -64,6 +65,14 @@ def customers_page() -> rx.Component:
             rx.foreach(ManagementState.filtered_customers, customer_card),
             class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6",
         ),
+        rx.cond(
+            ManagementState.customers_capped,
+            rx.el.p(
+                "Showing the first matches only. Refine the search to narrow them down.",
+                class_name="text-sm text-gray-500 text-center mt-6",
+            ),
+            None,
+        ),
         class_name="max-w-[1200px] w-full mx-auto",
-        on_mount=ManagementState.on_management_load,
+        on_mount=ManagementState.on_customers_load,
     )
\ No newline at end of file
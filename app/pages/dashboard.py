@@ -1,6 +1,6 @@
 import reflex as rx
 from app.states.dashboard_state import DashboardState
-from app.models import Appointment
+from app.store.appointment_rows import AppointmentRow
 from app.pages.appointments import status_badge
 
 
@@ -30,25 +30,23 @@ def status_card(status: str, count: rx.Var[int], icon: str) -> rx.Component:
     )
 
 
-def recent_appointment_row(appointment: Appointment) -> rx.Component:
+def recent_appointment_row(appointment: AppointmentRow) -> rx.Component:
     """A row for the recent appointments list."""
-    customer_name = DashboardState.customer_details.get(
-        appointment["customer_id"], {}
-    ).get("name", "N/A")
-    provider_name = DashboardState.provider_details.get(
-        appointment["provider_id"], "N/A"
-    )
     return rx.el.div(
         rx.el.div(
-            rx.el.p(customer_name, class_name="font-semibold text-gray-800 truncate"),
             rx.el.p(
-                f"with {provider_name}", class_name="text-xs text-gray-500 truncate"
+                appointment["customer_name"],
+                class_name="font-semibold text-gray-800 truncate",
+            ),
+            rx.el.p(
+                f"with {appointment['provider_name']}",
+                class_name="text-xs text-gray-500 truncate",
             ),
             class_name="flex-1 min-w-0",
         ),
         rx.el.div(
             rx.el.p(
-                DashboardState.appointment_dates[appointment["id"]],
+                appointment["date"],
                 class_name="text-sm text-gray-600",
             ),
             class_name="hidden md:block w-32 text-right",
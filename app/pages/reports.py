@@ -1,5 +1,86 @@
 import reflex as rx
 from app.states.base_state import AppState
+from app.states.reports_state import ReportsState
+from app.pages.dashboard import kpi_card
+
+REPORT_COLUMNS = [
+    ("Booked", "booked"),
+    ("Utilization", "utilization"),
+    ("Completed", "completed"),
+    ("Cancelled", "cancelled"),
+    ("No-Shows", "no_shows"),
+    ("No-Show Rate", "no_show_rate"),
+    ("Revenue", "revenue"),
+]
+
+
+def report_filters() -> rx.Component:
+    """The date range and department selectors."""
+    return rx.el.div(
+        rx.el.select(
+            rx.foreach(
+                ReportsState.range_options,
+                lambda option: rx.el.option(option["label"], value=option["value"]),
+            ),
+            value=ReportsState.report_range,
+            on_change=ReportsState.set_report_range,
+            class_name="py-2 px-4 border rounded-lg bg-white shadow-sm",
+        ),
+        rx.el.select(
+            rx.el.option("All Departments", value=""),
+            rx.foreach(
+                ReportsState.department_options,
+                lambda option: rx.el.option(option["label"], value=option["value"]),
+            ),
+            value=ReportsState.selected_department_id,
+            on_change=ReportsState.set_report_department,
+            class_name="py-2 px-4 border rounded-lg bg-white shadow-sm",
+        ),
+        class_name="flex items-center gap-4 mb-6",
+    )
+
+
+def report_table(title: str, rows: rx.Var[list[dict]]) -> rx.Component:
+    """A table of report figures, one row per provider or department."""
+    return rx.el.div(
+        rx.el.h2(title, class_name="text-lg font-semibold text-gray-800 mb-4"),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("Name", class_name="px-3 py-2 text-left"),
+                        *[
+                            rx.el.th(label, class_name="px-3 py-2 text-right")
+                            for label, _ in REPORT_COLUMNS
+                        ],
+                        class_name="text-xs font-medium text-gray-500 uppercase border-b",
+                    )
+                ),
+                rx.el.tbody(
+                    rx.foreach(
+                        rows,
+                        lambda row: rx.el.tr(
+                            rx.el.td(
+                                row["name"],
+                                class_name="px-3 py-2 font-medium text-gray-800",
+                            ),
+                            *[
+                                rx.el.td(
+                                    row[key],
+                                    class_name="px-3 py-2 text-right text-gray-600",
+                                )
+                                for _, key in REPORT_COLUMNS
+                            ],
+                            class_name="text-sm border-b border-gray-100",
+                        ),
+                    )
+                ),
+                class_name="w-full",
+            ),
+            class_name="overflow-x-auto",
+        ),
+        class_name="p-6 bg-white rounded-xl border border-gray-200 shadow-sm",
+    )
 
 
 def reports_page() -> rx.Component:
@@ -8,9 +89,39 @@ def reports_page() -> rx.Component:
             AppState.current_page_title,
             class_name="text-2xl font-bold text-gray-900 mb-6",
         ),
+        report_filters(),
+        rx.el.div(
+            kpi_card(
+                "Revenue",
+                ReportsState.summary.get("revenue", "$0.00"),
+                "dollar-sign",
+                "text-emerald-600",
+            ),
+            kpi_card(
+                "Booked Slots",
+                ReportsState.summary.get("booked", "0"),
+                "calendar-check-2",
+                "text-blue-600",
+            ),
+            kpi_card(
+                "Utilization",
+                ReportsState.summary.get("utilization", "-"),
+                "gauge",
+                "text-amber-600",
+            ),
+            kpi_card(
+                "No-Show Rate",
+                ReportsState.summary.get("no_show_rate", "-"),
+                "user-x",
+                "text-red-600",
+            ),
+            class_name="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6 mb-6",
+        ),
         rx.el.div(
-            rx.el.p("Reports page content will be here."),
-            class_name="p-6 bg-white rounded-xl border border-gray-200 shadow-sm",
+            report_table("By Provider", ReportsState.provider_rows),
+            report_table("By Department", ReportsState.department_rows),
+            class_name="flex flex-col gap-6",
         ),
         class_name="max-w-[1200px] w-full mx-auto",
+        on_mount=ReportsState.on_load,
     )
\ No newline at end of file
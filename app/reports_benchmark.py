@@ -0,0 +1,203 @@
+"""Times the reports page's rollup sums against per-appointment loops.
+
+    python -m app.reports_benchmark [--providers 1000] [--days 730] [--appointments 1000000] [--max-seconds 0.25]
+
+The appointment-level analytics frame this was first measured with was
+replaced by daily rollups, which the store keeps up to date as
+appointments change. This compares the two ways to answer a report:
+
+- the baseline: a Python loop over every appointment, looking its slot
+  up by id and filtering by date, as the dashboard computed its figures
+  before the running aggregates, plus a loop over the days for the slots
+  offered;
+- the rollups: the same appointments and offered slots built into one
+  rollup per provider and day, summed with RollupTable.provider_totals
+  as the reports page does.
+
+Each provider offers a fixed number of slots a day; appointments take
+distinct slots with a random status. Both sum a two-year and a one-month
+range per provider. Exits non-zero if they disagree or the vectorized
+two-year sum takes longer than `--max-seconds`.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from app.store.rollups import (
+    ROLLUP_COUNTERS,
+    RollupTable,
+    new_rollup,
+    rollup_id,
+    status_counters,
+)
+
+STATUSES = ("Pending", "Confirmed", "Completed", "Cancelled", "No-Show")
+PRICES_CENTS = (5000, 7500, 9000)
+
+
+def synthetic_tables(
+    providers: int, first: date, days: int, appointments: int
+) -> tuple[dict[str, int], dict[str, dict], list[dict]]:
+    """Slots offered a day per provider, and the booked slots by id with
+    their appointments."""
+    rng = random.Random(12)
+    offered = {str(i): 10 + i % 7 for i in range(providers)}
+    slots, records = {}, []
+    while len(records) < appointments:
+        provider = rng.randrange(providers)
+        provider_id = str(provider)
+        start = datetime.combine(
+            first + timedelta(days=rng.randrange(days)), datetime.min.time()
+        ) + timedelta(hours=8, minutes=30 * rng.randrange(offered[provider_id]))
+        slot_id = f"{provider_id}@{start:%Y%m%d%H%M}"
+        if slot_id in slots:
+            continue
+        slots[slot_id] = {
+            "id": slot_id,
+            "provider_id": provider_id,
+            "start_datetime": start,
+            "end_datetime": start + timedelta(minutes=30),
+            "price_cents": PRICES_CENTS[provider % len(PRICES_CENTS)],
+            "is_booked": True,
+        }
+        records.append(
+            {
+                "id": str(len(records)),
+                "slot_id": slot_id,
+                "provider_id": provider_id,
+                "customer_id": str(rng.randrange(appointments // 4 + 1)),
+                "status": rng.choice(STATUSES),
+            }
+        )
+    return offered, slots, records
+
+
+def rollups_of(
+    offered: dict[str, int],
+    slots: dict[str, dict],
+    appointments: list[dict],
+    first: date,
+    days: int,
+) -> list[dict]:
+    """One rollup per provider and day, as build_rollups computes them."""
+    now = datetime.now()
+    rows = {
+        (provider_id, first + timedelta(days=d)): new_rollup(
+            str(int(provider_id) % 10),
+            provider_id,
+            first + timedelta(days=d),
+            count,
+            now,
+        )
+        for provider_id, count in offered.items()
+        for d in range(days)
+    }
+    for appointment in appointments:
+        slot = slots[appointment["slot_id"]]
+        rollup = rows[appointment["provider_id"], slot["start_datetime"].date()]
+        counters = status_counters(appointment["status"], 1, slot["price_cents"])
+        for name, n in counters.items():
+            rollup[name] += n
+    for rollup in rows.values():
+        rollup["id"] = rollup_id(rollup["provider_id"], rollup["day"])
+    return list(rows.values())
+
+
+def appointment_loop_totals(
+    offered: dict[str, int],
+    slots: dict[str, dict],
+    appointments: list[dict],
+    first: date,
+    last: date,
+) -> dict[str, dict[str, int]]:
+    totals: dict[str, dict[str, int]] = {}
+
+    def figures(provider_id: str) -> dict[str, int]:
+        return totals.setdefault(
+            provider_id, dict.fromkeys(ROLLUP_COUNTERS + ("offered_slots",), 0)
+        )
+
+    day = first
+    while day <= last:
+        for provider_id, count in offered.items():
+            provider = figures(provider_id)
+            provider["offered_slots"] += count
+            provider["available_slots"] += count
+        day += timedelta(days=1)
+    for appointment in appointments:
+        slot = slots.get(appointment["slot_id"])
+        if not slot or not first <= slot["start_datetime"].date() <= last:
+            continue
+        provider = figures(appointment["provider_id"])
+        status = appointment["status"]
+        if status == "Cancelled":
+            provider["cancelled"] += 1
+            continue
+        provider["booked_slots"] += 1
+        provider["available_slots"] -= 1
+        if status == "Completed":
+            provider["completed"] += 1
+            provider["revenue_cents"] += slot["price_cents"]
+        elif status == "No-Show":
+            provider["no_shows"] += 1
+    return totals
+
+
+def timed(label: str, run) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34}{elapsed:.3f}s")
+    return elapsed, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--appointments", type=int, default=1_000_000)
+    parser.add_argument("--max-seconds", type=float, default=0.25)
+    args = parser.parse_args()
+    last = date.today()
+    first = last - timedelta(days=args.days - 1)
+    offered, slots, appointments = synthetic_tables(
+        args.providers, first, args.days, args.appointments
+    )
+    _, rollups = timed(
+        "build rollups",
+        lambda: rollups_of(offered, slots, appointments, first, args.days),
+    )
+    _, table = timed("load RollupTable", lambda: RollupTable(rollups))
+    failed = False
+    for label, range_first in (
+        ("full range", first),
+        ("last 30 days", last - timedelta(days=29)),
+    ):
+        loop_seconds, expected = timed(
+            f"{label}, appointment loop",
+            lambda: appointment_loop_totals(
+                offered, slots, appointments, range_first, last
+            ),
+        )
+        seconds, totals = timed(
+            f"{label}, rollups vectorized",
+            lambda: table.provider_totals(range_first, last),
+        )
+        print(f"{label + ', speedup':<34}{loop_seconds / seconds:.1f}x")
+        if totals != expected:
+            print(f"{label}: rollup totals differ from the appointment loop")
+            failed = True
+        if range_first == first and seconds > args.max_seconds:
+            print(f"summing the full range took longer than {args.max_seconds}s")
+            failed = True
+    print(
+        f"{len(appointments)} appointments, {len(table)} rollups of "
+        f"{args.providers} providers x {args.days} days"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Compares the store on the SQL repository with the in-memory backend.
+
+    python -m app.repository_benchmark [--bookings 200] [--reads 1000] [--max-read-ratio 1.5] [--max-write-ms 25]
+
+Builds one DataStore on MemoryBackend and one on SqlRepository over a
+fresh SQLite file in a temporary directory, both holding the mock
+dataset, and runs the same operations on each:
+
+- booking free slots of one provider, through the blocking and the
+  async path;
+- confirming the pending appointments those bookings made;
+- reading a provider's month of slots, as the calendar does.
+
+Prints the mean and 95th percentile per operation. Exits non-zero if a
+month read on SQL takes more than `--max-read-ratio` times its in-memory
+time, or a write on SQL takes longer than `--max-write-ms` on average.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def timings(run, arguments) -> list[float]:
+    seconds = []
+    for argument in arguments:
+        start = time.perf_counter()
+        run(argument)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def measure(store, args) -> dict[str, list[float]]:
+    provider_id = sorted(store.availability_configs.providers())[0]
+    customer_ids = sorted(store.customers)
+    start = datetime.combine(
+        datetime.now().date() + timedelta(days=1), datetime.min.time()
+    )
+    free = [
+        slot["id"]
+        for slot in store.get_provider_slots(
+            provider_id, start, start + timedelta(days=90)
+        )
+        if not slot["is_booked"]
+    ][: 2 * args.bookings]
+    loop = asyncio.new_event_loop()
+    before = set(store.appointments)
+
+    def book(i):
+        error = store.book_slot(
+            customer_ids[i % len(customer_ids)], free[i], "benchmark", "Admin"
+        )
+        assert error is None, error
+
+    def book_async(i):
+        error = loop.run_until_complete(
+            store.book_slot_async(
+                customer_ids[i % len(customer_ids)], free[i], "benchmark", "Admin"
+            )
+        )
+        assert error is None, error
+
+    def confirm(appointment_id):
+        error = loop.run_until_complete(
+            store.change_appointment_status_async(
+                appointment_id, "Confirmed", "benchmark", "Admin"
+            )
+        )
+        assert error is None, error
+
+    results = {
+        "book": timings(book, range(0, len(free), 2)),
+        "book (async)": timings(book_async, range(1, len(free), 2)),
+        "confirm (async)": timings(confirm, sorted(set(store.appointments) - before)),
+        "month read": timings(
+            lambda _: store.get_provider_slots(
+                provider_id, start, start + timedelta(days=31)
+            ),
+            range(args.reads),
+        ),
+    }
+    loop.close()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--max-read-ratio", type=float, default=1.5)
+    parser.add_argument("--max-write-ms", type=float, default=25.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = (
+            f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        )
+        from app.db.repository import SqlRepository
+        from app.store import DataStore, MemoryBackend
+
+        results = {
+            "memory": measure(DataStore(MemoryBackend()), args),
+            "sql": measure(DataStore(SqlRepository()), args),
+        }
+    print(f"{'':<18}{'memory mean/p95':>20}{'sql mean/p95':>20}")
+    for operation in results["memory"]:
+        cells = []
+        for backend in results:
+            seconds = results[backend][operation]
+            p95 = statistics.quantiles(seconds, n=20)[-1]
+            cells.append(f"{statistics.mean(seconds) * 1000:.3f}/{p95 * 1000:.3f}ms")
+        print(f"{operation:<18}" + "".join(f"{cell:>20}" for cell in cells))
+    failures = []
+    read_ratio = statistics.mean(results["sql"]["month read"]) / statistics.mean(
+        results["memory"]["month read"]
+    )
+    if read_ratio > args.max_read_ratio:
+        failures.append(
+            f"month reads on SQL are {read_ratio:.1f}x slower than in memory"
+        )
+    for operation, seconds in results["sql"].items():
+        if (
+            operation != "month read"
+            and statistics.mean(seconds) * 1000 > args.max_write_ms
+        ):
+            failures.append(
+                f"{operation} on SQL takes longer than {args.max_write_ms}ms"
+            )
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
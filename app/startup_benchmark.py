@@ -0,0 +1,73 @@
+"""Times a cold start of the app: importing it and serving its first request.
+
+    python -m app.startup_benchmark [--runs 3] [--max-import 2.0] [--max-first-request 2.0]
+
+Each run starts a fresh interpreter. One probe times `import app.app`;
+another imports the app and times loading the data store plus the reads
+the dashboard's first request makes, under the DATA_STORE_BACKEND and
+DATABASE_URL of the environment. Prints the best of `--runs` and exits
+non-zero if a limit is exceeded or if importing the app already loaded
+the store or the mock dataset.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.app
+elapsed = time.perf_counter() - start
+from app.store import data_store
+loaded = data_store._store is not None or "app.store.mock_data" in sys.modules
+print(json.dumps({"seconds": elapsed, "loaded_data": loaded}))
+"""
+FIRST_REQUEST_PROBE = """
+import json, time
+import app.app
+from app.store import get_store
+start = time.perf_counter()
+store = get_store()
+recent = [store.appointments[i] for i in store.aggregates.recent_ids]
+store.appointment_rows(recent)
+store.appointments_page(20)
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+
+def run_probe(probe: str) -> dict:
+    """Runs a probe in a new interpreter and returns its JSON report."""
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-import", type=float, default=2.0)
+    parser.add_argument("--max-first-request", type=float, default=2.0)
+    args = parser.parse_args()
+    imports = [run_probe(IMPORT_PROBE) for _ in range(args.runs)]
+    first_requests = [run_probe(FIRST_REQUEST_PROBE) for _ in range(args.runs)]
+    import_seconds = min(r["seconds"] for r in imports)
+    first_request_seconds = min(r["seconds"] for r in first_requests)
+    print(f"import app.app:  {import_seconds:.3f}s (best of {args.runs})")
+    print(f"first request:   {first_request_seconds:.3f}s (best of {args.runs})")
+    failures = []
+    if any(r["loaded_data"] for r in imports):
+        failures.append("importing the app loaded the data store")
+    if import_seconds > args.max_import:
+        failures.append(f"import took longer than {args.max_import}s")
+    if first_request_seconds > args.max_first_request:
+        failures.append(f"first request took longer than {args.max_first_request}s")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
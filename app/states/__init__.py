@@ -3,4 +3,5 @@ from .data_state import DataState
 from .management_state import ManagementState
 from .calendar_state import CalendarState
 from .appointments_state import AppointmentsState
-from .dashboard_state import DashboardState
\ No newline at end of file
+from .dashboard_state import DashboardState
+from .reports_state import ReportsState
\ No newline at end of file
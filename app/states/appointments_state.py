@@ -1,8 +1,12 @@
 import reflex as rx
 from app.states.data_state import DataState
-from app.models import Appointment, Customer
+from app.store.appointment_index import AppointmentKey
+from app.store.appointment_rows import AppointmentRow
+from app.store.customer_search import CUSTOMER_SEARCH_LIMIT
 from typing import Optional
 
+APPOINTMENTS_PAGE_SIZE = 20
+
 
 class AppointmentsState(DataState):
     """State for managing the appointments page."""
@@ -16,74 +20,90 @@ class AppointmentsState(DataState):
         "Cancelled",
         "No-Show",
     ]
+    appointment_rows: list[AppointmentRow] = []
+    page_number: int = 1
+    has_next_page: bool = False
+    # the search term matched more customers than the filter takes
+    customers_capped: bool = False
+    # the cursor each page was read from, None for the first page
+    _page_cursors: list[Optional[AppointmentKey]] = [None]
+    # the key of the last row shown, the cursor of the next page
+    _last_key: Optional[AppointmentKey] = None
 
     @rx.event
     def on_load(self):
         """Event handler for page load."""
-        pass
+        self._load_appointments()
 
-    @rx.var
-    def filtered_appointments(self) -> list[Appointment]:
-        """Returns appointments filtered by search term and status."""
-        appointments = self.appointments
-        if self.status_filter != "all":
-            appointments = [
-                a for a in appointments if a["status"] == self.status_filter
-            ]
-        if self.search_term.strip():
-            term = self.search_term.lower()
-            customer_ids_to_match = {
-                c["id"] for c in self.customers if term in c["full_name"].lower()
-            }
-            appointments = [
-                a for a in appointments if a["customer_id"] in customer_ids_to_match
-            ]
-        return sorted(appointments, key=lambda a: a["created_at"], reverse=True)
+    @rx.event
+    def next_page(self):
+        if not self.has_next_page or self._last_key is None:
+            return
+        self._page_cursors = self._page_cursors + [self._last_key]
+        self.page_number = len(self._page_cursors)
+        self._load_page()
+
+    @rx.event
+    def previous_page(self):
+        if len(self._page_cursors) <= 1:
+            return
+        self._page_cursors = self._page_cursors[:-1]
+        self.page_number = len(self._page_cursors)
+        self._load_page()
 
-    @rx.var
-    def customer_details(self) -> dict[str, dict]:
-        """A map of customer IDs to their name and avatar URL."""
-        return {
-            c["id"]: {
-                "name": c["full_name"],
-                "avatar": f"https://api.dicebear.com/9.x/initials/svg?seed={c['full_name']}",
-            }
-            for c in self.customers
-        }
+    @rx.event
+    def set_search_term(self, term: str):
+        self.search_term = term
+        self._load_appointments()
 
-    @rx.var
-    def provider_details(self) -> dict[str, str]:
-        """A map of provider IDs to their name."""
-        return {p["id"]: p["name"] for p in self.providers}
+    @rx.event
+    def set_status_filter(self, status: str):
+        self.status_filter = status
+        self._load_appointments()
 
-    @rx.var
-    def appointment_datetimes(self) -> dict[str, dict]:
-        """A map of appointment IDs to formatted date and time strings."""
-        details = {}
-        for appt in self.appointments:
-            slot = self._get_slot_by_id(appt["slot_id"])
-            if slot:
-                details[appt["id"]] = {
-                    "date": slot["start_datetime"].strftime("%B %d, %Y"),
-                    "time": f"{slot['start_datetime'].strftime('%I:%M %p')} - {slot['end_datetime'].strftime('%I:%M %p')}",
-                }
-        return details
+    def _load_appointments(self):
+        """Loads the first page of appointments for the current filters."""
+        self._page_cursors = [None]
+        self.page_number = 1
+        self._load_page()
 
-    @rx.var
-    def appointment_prices(self) -> dict[str, str]:
-        """A map of appointment IDs to formatted price strings."""
-        prices = {}
-        for appt in self.appointments:
-            slot = self._get_slot_by_id(appt["slot_id"])
-            if slot:
-                prices[appt["id"]] = f"${slot['price_cents'] / 100:.2f}"
-        return prices
+    def _load_page(self):
+        """Loads one page of appointments, newest first, filtered by search
+        term and status, as the store's display rows. The page is read by
+        keyset from the store's (created_at, id) index, so no more than a
+        page is ever built or sent. A search term filters on the customers
+        it matches in the search index, capped at CUSTOMER_SEARCH_LIMIT as on
+        the customers page."""
+        store = self._store
+        customer_ids = None
+        self.customers_capped = False
+        if self.search_term.strip():
+            customers = store.search_customers(
+                self.search_term, CUSTOMER_SEARCH_LIMIT + 1
+            )
+            self.customers_capped = len(customers) > CUSTOMER_SEARCH_LIMIT
+            customer_ids = [c["id"] for c in customers[:CUSTOMER_SEARCH_LIMIT]]
+        appointments = store.appointments_page(
+            APPOINTMENTS_PAGE_SIZE + 1,
+            self._page_cursors[-1],
+            None if self.status_filter == "all" else self.status_filter,
+            customer_ids,
+        )
+        self.has_next_page = len(appointments) > APPOINTMENTS_PAGE_SIZE
+        appointments = appointments[:APPOINTMENTS_PAGE_SIZE]
+        self._last_key = (
+            (appointments[-1]["created_at"], appointments[-1]["id"])
+            if appointments
+            else None
+        )
+        self.appointment_rows = store.appointment_rows(appointments)
 
     @rx.event
-    def update_status(self, appointment_id: str, new_status: str):
-        result = self.change_appointment_status(
+    async def update_status(self, appointment_id: str, new_status: str):
+        result = await self.change_appointment_status(
             appointment_id, new_status, performed_by="Admin", user_type="WebApp"
         )
         if result:
             return rx.toast(result, duration=4000)
+        self._load_page()
         return rx.toast(f"Appointment status updated to {new_status}.")
\ No newline at end of file
@@ -1,8 +1,11 @@
 import reflex as rx
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from app.states.data_state import DataState
-from app.models import Slot, Customer
+from app.models import Slot, Customer, Provider
+from app.store.availability_rules import SLOT_DURATION, as_rule
+from app.store.customer_search import CUSTOMER_SEARCH_LIMIT
 import calendar
+from itertools import islice
 from typing import Optional, TypedDict
 from dateutil.relativedelta import relativedelta
 
@@ -19,71 +22,181 @@ class DaySlots(TypedDict):
     overflow: int
 
 
+class ViewSlot(TypedDict):
+    # the slot id without its "provider_id@" prefix, which the row carries
+    start: str
+    time_str: str
+    is_booked: bool
+
+
+class ProviderColumn(TypedDict):
+    provider_id: str
+    name: str
+    days: list[list[ViewSlot]]
+
+
+class AvailabilityRange(TypedDict):
+    # form strings: "HH:MM" times, minutes, and a price in dollars that is
+    # empty for the provider's price
+    start: str
+    end: str
+    duration: str
+    buffer: str
+    price: str
+
+
+class AvailabilityDay(TypedDict):
+    name: str
+    ranges: list[AvailabilityRange]
+
+
+class SearchResult(TypedDict):
+    id: str
+    provider_name: str
+    date_str: str
+    time_str: str
+
+
+# days shown by each window view
+VIEW_DAYS = {"week": 7, "day": 1}
+MAX_VIEW_PROVIDERS = 20
+# label and time-of-day window of the first-available search
+SEARCH_WINDOWS = {
+    "any": ("Any time", None),
+    "morning": ("Morning", (time(0), time(12))),
+    "afternoon": ("Afternoon", (time(12), time(17))),
+    "evening": ("Evening", (time(17), time.max)),
+}
+SEARCH_RESULTS = 10
+
+
 class CalendarState(DataState):
     """State for managing the calendar and booking UI."""
 
+    providers: list[Provider] = []
+    customers: list[Customer] = []
     show_booking_modal: bool = False
     show_availability_modal: bool = False
     booking_slot: Optional[Slot] = None
     booking_customer_id: str = ""
+    # the typeahead of the booking modal's customer picker; `customers`
+    # holds its matches, at most CUSTOMER_SEARCH_LIMIT of them
+    booking_customer_search: str = ""
     booking_error: str = ""
     availability_provider_id: str = ""
     availability_month: str = ""
-    weekly_template: dict[int, list[tuple[str, str]]] = {}
+    availability_days: list[AvailabilityDay] = []
+    availability_error: str = ""
     calendar_weeks: list[list[Optional[int]]] = []
     slots_by_day: dict[int, DaySlots] = {}
-
-    @rx.var
-    def selected_provider_name(self) -> str:
-        if not self.selected_provider_id:
-            return "Provider not selected"
-        provider = self._get_provider_by_id(self.selected_provider_id)
-        return provider["name"] if provider else "Unknown Provider"
+    slot_booked: dict[str, bool] = {}
+    booking_provider_name: str = ""
+    view_date: str = date.today().isoformat()
+    view_provider_ids: list[str] = []
+    view_days: list[str] = []
+    view_columns: list[ProviderColumn] = []
+    department_options: list[dict[str, str]] = []
+    window_options: list[dict[str, str]] = [
+        {"value": value, "label": label} for value, (label, _) in SEARCH_WINDOWS.items()
+    ]
+    search_department_id: str = ""
+    search_after: str = ""
+    search_window: str = "any"
+    search_results: list[SearchResult] = []
 
     def _build_calendar_data(self):
-        """Pre-computes calendar grid and formatted slots data."""
+        """Sets the calendar grid and the formatted slots of the selected
+        provider and month, built once and then served from the store's
+        calendar cache. Booked flags patched since the last build are dropped."""
+        if self.calendar_view in VIEW_DAYS:
+            self._build_view_data()
+            return
         year, month = map(int, self.selected_month.split("-"))
         cal = calendar.Calendar()
         self.calendar_weeks = cal.monthdayscalendar(year, month)
-        slots_map: dict[int, DaySlots] = {}
+        if self.slot_booked:
+            self.slot_booked = {}
         if not self.selected_provider_id:
             self.slots_by_day = {}
             return
-        day_slots: dict[int, list[Slot]] = {}
-        for slot in self.slots:
-            is_correct_provider = slot["provider_id"] == self.selected_provider_id
-            slot_dt = slot["start_datetime"]
-            if (
-                is_correct_provider
-                and slot_dt.year == year
-                and (slot_dt.month == month)
-            ):
-                day = slot_dt.day
-                if day not in day_slots:
-                    day_slots[day] = []
-                day_slots[day].append(slot)
-        for day, slots in day_slots.items():
-            slots.sort(key=lambda s: s["start_datetime"])
-            formatted_slots = [
-                FormattedSlot(
-                    id=s["id"],
-                    time_str=s["start_datetime"].strftime("%H:%M"),
-                    is_booked=s["is_booked"],
-                    raw_slot=s,
+        provider_id = self.selected_provider_id
+        store = self._store
+        self.slots_by_day = store.calendar_month(
+            provider_id,
+            self.selected_month,
+            lambda start, end: format_day_slots(
+                store.get_provider_slots(provider_id, start, end)
+            ),
+        )
+
+    def _build_view_data(self):
+        """Sets the week or day grid: every slot in the window for each of
+        the chosen providers, read through the slot index so the work and
+        the payload follow the window, not the month."""
+        if self.slot_booked:
+            self.slot_booked = {}
+        first_day = date.fromisoformat(self.view_date)
+        if self.calendar_view == "week":
+            first_day -= timedelta(days=first_day.weekday())
+        day_count = VIEW_DAYS[self.calendar_view]
+        start = datetime.combine(first_day, datetime.min.time())
+        end = start + timedelta(days=day_count)
+        self.view_days = [
+            (first_day + timedelta(days=offset)).strftime("%a %d %b")
+            for offset in range(day_count)
+        ]
+        store = self._store
+        columns = []
+        for provider_id in self.view_provider_ids:
+            provider = store.get_provider(provider_id)
+            if not provider:
+                continue
+            days: list[list[ViewSlot]] = [[] for _ in range(day_count)]
+            for slot in store.get_provider_slots(provider_id, start, end):
+                days[(slot["start_datetime"] - start).days].append(
+                    ViewSlot(
+                        start=slot["id"].rpartition("@")[2],
+                        time_str=slot["start_datetime"].strftime("%H:%M"),
+                        is_booked=slot["is_booked"],
+                    )
                 )
-                for s in slots
-            ]
-            slots_map[day] = {
-                "visible": formatted_slots[:4],
-                "overflow": max(0, len(formatted_slots) - 4),
-            }
-        self.slots_by_day = slots_map
+            columns.append(
+                ProviderColumn(
+                    provider_id=provider_id, name=provider["name"], days=days
+                )
+            )
+        self.view_columns = columns
+
+    def _patch_calendar_slots(self, slot_ids: list[str]):
+        """Records the booked flag of the given slots in `slot_booked`.
+
+        Booking, cancelling and rescheduling only flip `is_booked`, never the
+        slots of a day, so `slots_by_day` is left untouched and the update
+        sent to the browser carries a few flags instead of the whole month.
+        """
+        if self.calendar_view in VIEW_DAYS:
+            shown = set(self.view_provider_ids)
+        else:
+            shown = {self.selected_provider_id}
+        patches = dict(self.slot_booked)
+        for slot_id in slot_ids:
+            slot = self._get_slot_by_id(slot_id)
+            if slot and slot["provider_id"] in shown:
+                patches[slot_id] = slot["is_booked"]
+        if patches != self.slot_booked:
+            self.slot_booked = patches
 
     @rx.event
     def on_calendar_load(self):
         """Loads data and builds the calendar on page load."""
+        self.providers = self._list_providers()
         if not self.selected_provider_id and self.providers:
             self.selected_provider_id = self.providers[0]["id"]
+        if not self.view_provider_ids and self.selected_provider_id:
+            self.view_provider_ids = [self.selected_provider_id]
+        self.department_options = [
+            {"value": d["id"], "label": d["name"]} for d in self._list_departments()
+        ]
         self._build_calendar_data()
 
     @rx.event
@@ -100,14 +213,106 @@ class CalendarState(DataState):
         self.selected_month = new_date.strftime("%Y-%m")
         self._build_calendar_data()
 
+    @rx.event
+    def set_calendar_view(self, view: str):
+        """Switches between the month grid and the week and day views."""
+        if view != "month" and view not in VIEW_DAYS:
+            return
+        self.calendar_view = view
+        if view == "month":
+            self.selected_month = self.view_date[:7]
+        self._build_calendar_data()
+
+    @rx.event
+    def toggle_view_provider(self, provider_id: str):
+        """Adds or removes a provider column of the week and day views."""
+        if provider_id in self.view_provider_ids:
+            self.view_provider_ids = [
+                p for p in self.view_provider_ids if p != provider_id
+            ]
+        elif len(self.view_provider_ids) >= MAX_VIEW_PROVIDERS:
+            yield rx.toast(
+                f"At most {MAX_VIEW_PROVIDERS} providers can be shown at once.",
+                duration=3000,
+            )
+            return
+        else:
+            self.view_provider_ids = self.view_provider_ids + [provider_id]
+        self._build_view_data()
+
+    @rx.event
+    def shift_view(self, amount: int):
+        """Moves the week or day window by `amount` windows."""
+        new_date = date.fromisoformat(self.view_date) + timedelta(
+            days=amount * VIEW_DAYS.get(self.calendar_view, 1)
+        )
+        self.view_date = new_date.isoformat()
+        self.selected_month = self.view_date[:7]
+        self._build_calendar_data()
+
+    @rx.event
+    def find_first_available(self):
+        """Lists the earliest free slots across the providers of the chosen
+        department, from the chosen date on and inside the chosen time of day."""
+        after = datetime.fromisoformat(self.search_after) if self.search_after else None
+        _, window = SEARCH_WINDOWS.get(self.search_window, SEARCH_WINDOWS["any"])
+        slots = self._store.first_available_slots(
+            SEARCH_RESULTS, after, self.search_department_id, window
+        )
+        results = []
+        for slot in slots:
+            provider = self._get_provider_by_id(slot["provider_id"])
+            results.append(
+                SearchResult(
+                    id=slot["id"],
+                    provider_name=provider["name"] if provider else "Unknown Provider",
+                    date_str=slot["start_datetime"].strftime("%a %d %b"),
+                    time_str=slot["start_datetime"].strftime("%H:%M"),
+                )
+            )
+        self.search_results = results
+        if not results:
+            yield rx.toast("No free slots match the search.", duration=3000)
+
     @rx.event
     def open_booking_modal(self, slot_data: FormattedSlot):
-        self.booking_slot = slot_data["raw_slot"]
-        if self.customers:
-            self.booking_customer_id = self.customers[0]["id"]
+        self._open_booking(slot_data["raw_slot"])
+
+    @rx.event
+    def open_view_booking(self, slot_id: str):
+        slot = self._get_slot_by_id(slot_id)
+        if slot:
+            self._open_booking(dict(slot))
+
+    def _open_booking(self, slot: Slot):
+        self.booking_slot = slot
+        provider = self._get_provider_by_id(slot["provider_id"])
+        self.booking_provider_name = (
+            provider["name"] if provider else "Unknown Provider"
+        )
+        self.booking_customer_search = ""
+        self._load_booking_customers()
         self.booking_error = ""
         self.show_booking_modal = True
 
+    def _load_booking_customers(self):
+        """Lists the customers matching the picker's typeahead from the
+        store's search index, or the first customers while it is empty,
+        capped at CUSTOMER_SEARCH_LIMIT, and selects the first of them."""
+        store = self._store
+        term = self.booking_customer_search.strip()
+        if term:
+            customers = store.search_customers(term, CUSTOMER_SEARCH_LIMIT)
+        else:
+            customers = list(islice(store.customers.values(), CUSTOMER_SEARCH_LIMIT))
+        self.customers = [dict(c) for c in customers]
+        self.booking_customer_id = customers[0]["id"] if customers else ""
+
+    @rx.event
+    def set_booking_customer_search(self, term: str):
+        self.booking_customer_search = term
+        self._load_booking_customers()
+
     @rx.event
     def close_booking_modal(self):
         self.show_booking_modal = False
@@ -115,20 +320,25 @@ class CalendarState(DataState):
         self.booking_error = ""
 
     @rx.event
-    def confirm_booking(self):
+    async def confirm_booking(self):
         if not self.booking_slot or not self.booking_customer_id:
             self.booking_error = "Slot or customer not selected."
             return
-        result = self.book_slot(
-            self.booking_customer_id, self.booking_slot["id"], "WebApp", "Admin"
+        slot_id = self.booking_slot["id"]
+        result = await self.book_slot(
+            self.booking_customer_id, slot_id, "WebApp", "Admin"
         )
+        self._patch_calendar_slots([slot_id])
         if result:
             self.booking_error = result
             yield rx.toast(result, duration=5000)
         else:
+            if any(r["id"] == slot_id for r in self.search_results):
+                self.search_results = [
+                    r for r in self.search_results if r["id"] != slot_id
+                ]
             yield rx.toast("Appointment booked successfully!")
             yield CalendarState.close_booking_modal()
-        self._build_calendar_data()
 
     @rx.event
     def open_availability_modal(self):
@@ -137,21 +347,132 @@ class CalendarState(DataState):
             return
         self.availability_provider_id = self.selected_provider_id
         self.availability_month = self.selected_month
-        config = self.availability_configs.get(self.availability_provider_id)
-        if config and config.get("weekly_template"):
-            current_template_raw = config["weekly_template"]
-            self.weekly_template = {
-                day: [
-                    (start.strftime("%H:%M"), end.strftime("%H:%M"))
-                    for start, end in ranges
-                ]
-                for day, ranges in current_template_raw.items()
-            }
-        else:
-            self.weekly_template = {}
+        config = self._store.availability_configs.for_month(
+            self.availability_provider_id, self.availability_month
+        )
+        template = {
+            int(day): entries
+            for day, entries in (config["weekly_template"] if config else {}).items()
+        }
+        self.availability_days = [
+            AvailabilityDay(
+                name=calendar.day_name[day],
+                ranges=[range_row(as_rule(entry)) for entry in template.get(day, [])],
+            )
+            for day in range(7)
+        ]
+        self.availability_error = ""
         self.show_availability_modal = True
 
+    @rx.event
+    def add_availability_range(self, day: int):
+        days = list(self.availability_days)
+        ranges = days[day]["ranges"]
+        start = ranges[-1]["end"] if ranges else "09:00"
+        duration = str(SLOT_DURATION // timedelta(minutes=1))
+        days[day] = AvailabilityDay(
+            name=days[day]["name"],
+            ranges=ranges
+            + [
+                AvailabilityRange(
+                    start=start, end=start, duration=duration, buffer="0", price=""
+                )
+            ],
+        )
+        self.availability_days = days
+
+    @rx.event
+    def remove_availability_range(self, day: int, index: int):
+        days = list(self.availability_days)
+        ranges = list(days[day]["ranges"])
+        del ranges[index]
+        days[day] = AvailabilityDay(name=days[day]["name"], ranges=ranges)
+        self.availability_days = days
+
+    @rx.event
+    def set_availability_field(self, day: int, index: int, field: str, value: str):
+        days = list(self.availability_days)
+        ranges = list(days[day]["ranges"])
+        ranges[index] = AvailabilityRange(**{**ranges[index], field: value})
+        days[day] = AvailabilityDay(name=days[day]["name"], ranges=ranges)
+        self.availability_days = days
+
+    @rx.event
+    async def save_availability(self):
+        """Saves the weekly template for the modal's month only; the
+        month's closed dates and holiday calendar are kept."""
+        try:
+            template = {
+                day: [range_entry(row) for row in entries["ranges"]]
+                for day, entries in enumerate(self.availability_days)
+            }
+        except ValueError as e:
+            self.availability_error = f"Invalid time range: {e}"
+            return
+        provider_id, month = self.availability_provider_id, self.availability_month
+        config = self._store.availability_configs.for_month(provider_id, month)
+        result = await self._store.set_availability_async(
+            provider_id,
+            month,
+            template,
+            config["exceptions"] if config else None,
+            config["holiday_calendar"] if config else None,
+        )
+        if result:
+            self.availability_error = result
+            return
+        self._build_calendar_data()
+        yield rx.toast(f"Availability for {month} saved.")
+        yield CalendarState.close_availability_modal()
+
     @rx.event
     def close_availability_modal(self):
         self.show_availability_modal = False
-        self.weekly_template = {}
\ No newline at end of file
+        self.availability_days = []
+        self.availability_error = ""
+
+
+def range_row(rule) -> AvailabilityRange:
+    """A template rule as strings for the availability form."""
+    return AvailabilityRange(
+        start=rule.start.strftime("%H:%M"),
+        end=rule.end.strftime("%H:%M"),
+        duration=str(rule.duration // timedelta(minutes=1)),
+        buffer=str(rule.buffer // timedelta(minutes=1)),
+        price="" if rule.price_cents is None else f"{rule.price_cents / 100:.2f}",
+    )
+
+
+def range_entry(row: AvailabilityRange) -> tuple:
+    """The template entry of an availability form row; raises ValueError
+    for malformed fields."""
+    options = {
+        "duration_minutes": int(row["duration"]),
+        "buffer_minutes": int(row["buffer"] or 0),
+    }
+    if row["price"].strip():
+        options["price_cents"] = round(float(row["price"]) * 100)
+    return (row["start"], row["end"], options)
+
+
+def format_day_slots(slots: list[Slot]) -> dict[int, DaySlots]:
+    """Groups slots by day of month, formatted for the calendar cells."""
+    day_slots: dict[int, list[Slot]] = {}
+    for slot in slots:
+        day_slots.setdefault(slot["start_datetime"].day, []).append(slot)
+    slots_map: dict[int, DaySlots] = {}
+    for day, slots in day_slots.items():
+        formatted_slots = [
+            FormattedSlot(
+                id=s["id"],
+                time_str=s["start_datetime"].strftime("%H:%M"),
+                is_booked=s["is_booked"],
+                raw_slot=dict(s),
+            )
+            for s in slots
+        ]
+        slots_map[day] = {
+            "visible": formatted_slots[:4],
+            "overflow": max(0, len(formatted_slots) - 4),
+        }
+    return slots_map
\ No newline at end of file
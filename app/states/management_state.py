@@ -1,14 +1,19 @@
 import reflex as rx
 import uuid
 from datetime import datetime
+from itertools import islice
 from typing import Optional
 from app.states.data_state import DataState
 from app.models import Department, Provider, Customer
+from app.store.customer_search import CUSTOMER_SEARCH_LIMIT
 
 
 class ManagementState(DataState):
     """State for managing departments, providers, customers and business settings."""
 
+    departments: list[Department] = []
+    providers: list[Provider] = []
+    filtered_customers: list[Customer] = []
     show_department_modal: bool = False
     department_form_id: str = ""
     department_name: str = ""
@@ -28,6 +33,7 @@ class ManagementState(DataState):
     delete_item_type: str = ""
     delete_warning_message: str = ""
     customer_search_term: str = ""
+    customers_capped: bool = False
     business_display_name: str = ""
     business_legal_name: str = ""
     business_registration_number: str = ""
@@ -55,8 +61,8 @@ class ManagementState(DataState):
 
     def _get_department_names_for_provider(self, dept_ids: list[str]) -> str:
         """A helper method to get a comma-separated string of department names for a provider."""
-        names = [d["name"] for d in self.departments if d["id"] in dept_ids]
-        return ", ".join(names)
+        departments = (self._get_department_by_id(d_id) for d_id in dept_ids)
+        return ", ".join(d["name"] for d in departments if d)
 
     @rx.var
     def provider_department_names(self) -> dict[str, str]:
@@ -85,9 +91,9 @@ class ManagementState(DataState):
         self.provider_error = ""
 
     def _load_business_data(self):
-        if not self.businesses:
+        business = self._get_business()
+        if not business:
             return
-        business = self.businesses[0]
         self.business_display_name = business.get("display_name", "")
         self.business_legal_name = business.get("legal_name", "")
         self.business_registration_number = business.get("registration_number", "")
@@ -97,11 +103,39 @@ class ManagementState(DataState):
         self.business_contact_email = business.get("contact_email", "")
         self.business_logo_url = business.get("logo_url", "/placeholder.svg")
 
+    def _load_management_data(self):
+        self.departments = self._list_departments()
+        self.providers = self._list_providers()
+
+    def _load_customers(self):
+        """Loads the customers matching the search term from the store's
+        search index, capped at CUSTOMER_SEARCH_LIMIT."""
+        store = self._store
+        term = self.customer_search_term.strip()
+        if term:
+            customers = store.search_customers(term, CUSTOMER_SEARCH_LIMIT + 1)
+        else:
+            customers = list(
+                islice(store.customers.values(), CUSTOMER_SEARCH_LIMIT + 1)
+            )
+        self.customers_capped = len(customers) > CUSTOMER_SEARCH_LIMIT
+        self.filtered_customers = [dict(c) for c in customers[:CUSTOMER_SEARCH_LIMIT]]
+
     @rx.event
     def on_management_load(self):
         """Load all necessary data for management pages."""
+        self._load_management_data()
         self._load_business_data()
 
+    @rx.event
+    def on_customers_load(self):
+        self._load_customers()
+
+    @rx.event
+    def set_customer_search_term(self, term: str):
+        self.customer_search_term = term
+        self._load_customers()
+
     @rx.event
     def on_business_settings_load(self):
         return ManagementState.on_management_load
@@ -131,32 +165,37 @@ class ManagementState(DataState):
             self.department_error = "Department name is required."
             return
         if not self.department_form_is_edit:
-            if any((d["name"].lower() == name.lower() for d in self.departments)):
+            if any(
+                (
+                    d["name"].lower() == name.lower()
+                    for d in self._store.departments.values()
+                )
+            ):
                 self.department_error = "A department with this name already exists."
                 return
             new_dept = Department(
                 id=str(uuid.uuid4()),
-                business_id=self.businesses[0]["id"],
+                business_id=self._get_business()["id"],
                 name=name.strip(),
                 description=description.strip(),
                 created_at=datetime.now(),
                 updated_at=datetime.now(),
             )
-            self.departments.append(new_dept)
+            self._store.insert_record("departments", new_dept)
             yield rx.toast("Department added successfully!")
-        else:
-            department = self._get_department_by_id(self.department_form_id)
-            if department:
-                department["name"] = name
-                department["description"] = description
-                department["updated_at"] = datetime.now()
-                yield rx.toast("Department updated successfully!")
+        elif self._store.update_record(
+            "departments", self.department_form_id, name=name, description=description
+        ):
+            yield rx.toast("Department updated successfully!")
+        self._load_management_data()
         yield ManagementState.close_department_modal()
 
     @rx.event
     def confirm_delete_department(self, department_id: str):
         providers_in_dept = [
-            p for p in self.providers if department_id in p["department_ids"]
+            p
+            for p in self._store.providers.values()
+            if department_id in p["department_ids"]
         ]
         if providers_in_dept:
             self.delete_warning_message = f"Cannot delete department. It is assigned to {len(providers_in_dept)} provider(s). Reassign them first."
@@ -171,9 +210,7 @@ class ManagementState(DataState):
     def execute_delete(self):
         if self.item_to_delete_id:
             if self.delete_item_type == "department":
-                self.departments = [
-                    d for d in self.departments if d["id"] != self.item_to_delete_id
-                ]
+                self._store.delete_record("departments", self.item_to_delete_id)
                 yield rx.toast("Department deleted successfully!")
             elif self.delete_item_type == "provider":
                 result = self.archive_provider(self.item_to_delete_id)
@@ -181,6 +218,7 @@ class ManagementState(DataState):
                     yield rx.toast(result, duration=5000)
                 else:
                     yield rx.toast("Provider archived successfully!")
+            self._load_management_data()
         else:
             yield rx.toast(self.delete_warning_message, duration=5000)
         self.show_delete_confirmation = False
@@ -227,27 +265,29 @@ class ManagementState(DataState):
             new_provider = Provider(
                 id=str(uuid.uuid4()),
                 name=name,
-                department_ids=self.provider_department_ids,
+                department_ids=list(self.provider_department_ids),
                 status=self.provider_status,
                 bio=bio,
                 contact_mobile=contact_mobile,
                 contact_email=contact_email,
+                slot_price_cents=None,
                 created_at=datetime.now(),
                 updated_at=datetime.now(),
             )
-            self.providers.append(new_provider)
+            self._store.insert_record("providers", new_provider)
             yield rx.toast("Provider added successfully!")
-        else:
-            provider = self._get_provider_by_id(self.provider_form_id)
-            if provider:
-                provider["name"] = name
-                provider["department_ids"] = self.provider_department_ids
-                provider["status"] = self.provider_status
-                provider["bio"] = bio
-                provider["contact_mobile"] = contact_mobile
-                provider["contact_email"] = contact_email
-                provider["updated_at"] = datetime.now()
-                yield rx.toast("Provider updated successfully!")
+        elif self._store.update_record(
+            "providers",
+            self.provider_form_id,
+            name=name,
+            department_ids=list(self.provider_department_ids),
+            status=self.provider_status,
+            bio=bio,
+            contact_mobile=contact_mobile,
+            contact_email=contact_email,
+        ):
+            yield rx.toast("Provider updated successfully!")
+        self._load_management_data()
         yield ManagementState.close_provider_modal()
 
     @rx.event
@@ -255,14 +295,7 @@ class ManagementState(DataState):
         provider = self._get_provider_by_id(provider_id)
         if not provider:
             return
-        has_active_appointments = any(
-            (
-                a["provider_id"] == provider_id
-                and a["status"] in ["Pending", "Confirmed"]
-                for a in self.appointments
-            )
-        )
-        if has_active_appointments:
+        if self._store.provider_has_active_appointments(provider_id):
             self.delete_warning_message = (
                 "Cannot archive provider with pending or confirmed appointments."
             )
@@ -275,10 +308,8 @@ class ManagementState(DataState):
 
     @rx.event
     def change_provider_status(self, provider_id: str, new_status: str):
-        provider = self._get_provider_by_id(provider_id)
-        if provider:
-            provider["status"] = new_status
-            provider["updated_at"] = datetime.now()
+        if self._store.update_record("providers", provider_id, status=new_status):
+            self._load_management_data()
             yield rx.toast(f"Provider status changed to {new_status}")
 
     @rx.event
@@ -286,8 +317,8 @@ class ManagementState(DataState):
         """Restores an archived provider back to Inactive status."""
         provider = self._get_provider_by_id(provider_id)
         if provider and provider["status"] == "Archived":
-            provider["status"] = "Inactive"
-            provider["updated_at"] = datetime.now()
+            self._store.update_record("providers", provider_id, status="Inactive")
+            self._load_management_data()
             yield rx.toast(f"{provider['name']} has been restored.")
 
     @rx.event
@@ -298,31 +329,19 @@ class ManagementState(DataState):
         elif department_id in self.provider_department_ids:
             self.provider_department_ids.remove(department_id)
 
-    @rx.var
-    def filtered_customers(self) -> list[Customer]:
-        """Returns customers filtered by the search term."""
-        if not self.customer_search_term.strip():
-            return self.customers
-        term = self.customer_search_term.lower()
-        return [
-            c
-            for c in self.customers
-            if term in c["full_name"].lower() or term in c["mobile"]
-        ]
-
     @rx.event
     def save_business_settings(self, form_data: dict):
-        business = self.businesses[0]
-        business["display_name"] = form_data.get("display_name", "").strip()
-        business["legal_name"] = form_data.get("legal_name", "").strip()
-        business["registration_number"] = form_data.get(
-            "registration_number", ""
-        ).strip()
-        business["gstn"] = form_data.get("gstn", "").strip()
-        business["address"] = form_data.get("address", "").strip()
-        business["contact_mobile"] = form_data.get("contact_mobile", "").strip()
-        business["contact_email"] = form_data.get("contact_email", "").strip()
-        business["updated_at"] = datetime.now()
+        self._store.update_record(
+            "businesses",
+            self._get_business()["id"],
+            display_name=form_data.get("display_name", "").strip(),
+            legal_name=form_data.get("legal_name", "").strip(),
+            registration_number=form_data.get("registration_number", "").strip(),
+            gstn=form_data.get("gstn", "").strip(),
+            address=form_data.get("address", "").strip(),
+            contact_mobile=form_data.get("contact_mobile", "").strip(),
+            contact_email=form_data.get("contact_email", "").strip(),
+        )
         self._load_business_data()
         yield rx.toast("Business settings saved successfully!")
 
@@ -337,6 +356,8 @@ class ManagementState(DataState):
         file_path = upload_dir / file.name
         with file_path.open("wb") as f:
             f.write(upload_data)
-        self.businesses[0]["logo_url"] = file.name
+        self._store.update_record(
+            "businesses", self._get_business()["id"], logo_url=file.name
+        )
         self.business_logo_url = file.name
         yield rx.toast("Logo uploaded successfully!")
\ No newline at end of file
@@ -0,0 +1,118 @@
+import reflex as rx
+from app.states.data_state import DataState
+from datetime import datetime, timedelta
+
+# label, first and last day relative to today
+REPORT_RANGES = {
+    "last-7": ("Last 7 days", -6, 0),
+    "last-30": ("Last 30 days", -29, 0),
+    "last-90": ("Last 90 days", -89, 0),
+    "last-365": ("Last 12 months", -364, 0),
+    "last-730": ("Last 2 years", -729, 0),
+    "next-30": ("Next 30 days", 0, 29),
+}
+
+
+class ReportsState(DataState):
+    """State for the reports page, read from the store's daily rollups."""
+
+    report_range: str = "last-30"
+    range_options: list[dict[str, str]] = [
+        {"value": value, "label": label}
+        for value, (label, _, _) in REPORT_RANGES.items()
+    ]
+    department_options: list[dict[str, str]] = []
+    summary: dict[str, str] = {}
+    provider_rows: list[dict] = []
+    department_rows: list[dict] = []
+
+    @rx.event
+    def on_load(self):
+        self._load_report()
+
+    @rx.event
+    def set_report_range(self, value: str):
+        self.report_range = value
+        self._load_report()
+
+    @rx.event
+    def set_report_department(self, department_id: str):
+        self.selected_department_id = department_id
+        self._load_report()
+
+    def _load_report(self):
+        """Sums the rollups for the selected days per provider in one
+        vectorized pass, then per department, so the cost follows
+        providers x days, not appointments."""
+        store = self._store
+        today = datetime.now().date()
+        _, first_offset, last_offset = REPORT_RANGES[self.report_range]
+        first_day = today + timedelta(days=first_offset)
+        last_day = today + timedelta(days=last_offset)
+        department_id = self.selected_department_id
+        totals = {
+            provider_id: figures
+            for provider_id, figures in store.report_totals(first_day, last_day).items()
+            if provider_id in store.providers
+            and (
+                not department_id
+                or department_id in store.providers[provider_id]["department_ids"]
+            )
+        }
+        self.provider_rows = [
+            _report_row(store.providers[provider_id]["name"], figures)
+            for provider_id, figures in sorted(
+                totals.items(), key=lambda item: -item[1]["revenue_cents"]
+            )
+        ]
+        by_department: dict[str, dict[str, int]] = {}
+        for provider_id, figures in totals.items():
+            for d_id in store.providers[provider_id]["department_ids"]:
+                if not department_id or d_id == department_id:
+                    _merge(by_department.setdefault(d_id, _empty_figures()), figures)
+        self.department_rows = [
+            _report_row(store.departments[d_id]["name"], figures)
+            for d_id, figures in by_department.items()
+            if d_id in store.departments
+        ]
+        overall = _empty_figures()
+        for figures in totals.values():
+            _merge(overall, figures)
+        self.summary = _report_row("All providers", overall)
+        self.department_options = [
+            {"value": d["id"], "label": d["name"]} for d in store.departments.values()
+        ]
+
+
+def _empty_figures() -> dict[str, int]:
+    return dict.fromkeys(
+        [
+            "booked_slots",
+            "offered_slots",
+            "completed",
+            "cancelled",
+            "no_shows",
+            "revenue_cents",
+        ],
+        0,
+    )
+
+
+def _merge(into: dict[str, int], figures: dict[str, int]):
+    for name in into:
+        into[name] += figures[name]
+
+
+def _report_row(name: str, figures: dict[str, int]) -> dict[str, str]:
+    offered = figures["offered_slots"]
+    seen = figures["completed"] + figures["no_shows"]
+    return {
+        "name": name,
+        "booked": str(figures["booked_slots"]),
+        "utilization": f"{figures['booked_slots'] / offered:.0%}" if offered else "-",
+        "completed": str(figures["completed"]),
+        "cancelled": str(figures["cancelled"]),
+        "no_shows": str(figures["no_shows"]),
+        "no_show_rate": f"{figures['no_shows'] / seen:.0%}" if seen else "-",
+        "revenue": f"${figures['revenue_cents'] / 100:,.2f}",
+    }
\ No newline at end of file
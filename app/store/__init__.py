@@ -0,0 +1,3 @@
+from .slot_index import ProviderSlotIndex
+from .backends import StoreBackend, MemoryBackend, SlotConflictError
+from .data_store import DataStore, get_store, preload_store
\ No newline at end of file
@@ -0,0 +1,85 @@
+import heapq
+from collections import Counter, deque
+from datetime import date, timedelta
+from typing import Callable, Iterable, Optional
+from app.models import Appointment, Slot
+
+RECENT_APPOINTMENTS = 5
+
+
+class AppointmentAggregates:
+    """Running dashboard figures over all appointments.
+
+    Built once from the loaded tables, then kept current by the store: each
+    booking, status change or reschedule retracts the appointment's old
+    contribution and adds the new one, so updates are O(1) and reads never
+    scan appointment history.
+    """
+
+    def __init__(self):
+        self.status_counts: Counter = Counter()
+        self.revenue_cents = 0
+        self.provider_counts: Counter = Counter()
+        self.day_counts: Counter = Counter()
+        self.month_counts: Counter = Counter()
+        self.recent_ids: deque = deque(maxlen=RECENT_APPOINTMENTS)
+
+    @classmethod
+    def build(
+        cls,
+        appointments: Iterable[Appointment],
+        get_slot: Callable[[str], Optional[Slot]],
+    ) -> "AppointmentAggregates":
+        aggregates = cls()
+        appointments = list(appointments)
+        for appointment in appointments:
+            aggregates._apply(appointment, get_slot(appointment["slot_id"]), 1)
+        aggregates.recent_ids.extend(
+            a["id"]
+            for a in heapq.nlargest(
+                RECENT_APPOINTMENTS, appointments, key=lambda a: a["created_at"]
+            )
+        )
+        return aggregates
+
+    def _apply(self, appointment: Appointment, slot: Optional[Slot], sign: int):
+        self.status_counts[appointment["status"]] += sign
+        self.provider_counts[appointment["provider_id"]] += sign
+        if not slot:
+            return
+        if appointment["status"] == "Completed":
+            self.revenue_cents += sign * slot["price_cents"]
+        day = slot["start_datetime"].date()
+        self.day_counts[day] += sign
+        self.month_counts[day.year, day.month] += sign
+
+    def add(self, appointment: Appointment, slot: Optional[Slot]):
+        """Counts a newly booked appointment."""
+        self._apply(appointment, slot, 1)
+        self.recent_ids.appendleft(appointment["id"])
+
+    def replace(
+        self,
+        old: Appointment,
+        old_slot: Optional[Slot],
+        new: Appointment,
+        new_slot: Optional[Slot],
+    ):
+        """Moves an appointment's contribution after a status or time change."""
+        self._apply(old, old_slot, -1)
+        self._apply(new, new_slot, 1)
+
+    @property
+    def total(self) -> int:
+        return sum(self.status_counts.values())
+
+    def count_on(self, day: date) -> int:
+        return self.day_counts[day]
+
+    def count_between(self, first_day: date, last_day: date) -> int:
+        """Appointments whose slot falls on first_day..last_day inclusive."""
+        days = (last_day - first_day).days + 1
+        return sum(self.day_counts[first_day + timedelta(days=i)] for i in range(days))
+
+    def count_in_month(self, year: int, month: int) -> int:
+        return self.month_counts[year, month]
\ No newline at end of file
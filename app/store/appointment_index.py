@@ -0,0 +1,111 @@
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from app.models import Appointment
+
+# Keyset pagination cursor: the (created_at, id) of the last row served.
+AppointmentKey = tuple[datetime, str]
+# above this many customers a page walks the newest keys and checks the
+# customer instead of merging one list per customer
+MERGE_CUSTOMERS = 64
+
+
+class AppointmentKeyIndex:
+    """Appointment (created_at, id) keys kept sorted overall, per status and
+    per customer.
+
+    A page newest-first is a bisect to the cursor plus a walk over at most
+    one page of keys, so paging never sorts or scans the appointment table.
+    created_at never changes after booking; a status change only moves the
+    key between status lists.
+    """
+
+    def __init__(self):
+        self._all: list[AppointmentKey] = []
+        self._by_status: dict[str, list[AppointmentKey]] = {}
+        self._by_customer: dict[str, list[AppointmentKey]] = {}
+        self._status: dict[str, str] = {}
+        self._customer: dict[str, str] = {}
+
+    @classmethod
+    def build(cls, appointments: Iterable[Appointment]) -> "AppointmentKeyIndex":
+        index = cls()
+        for appointment in sorted(appointments, key=_key):
+            key = _key(appointment)
+            index._all.append(key)
+            index._by_status.setdefault(appointment["status"], []).append(key)
+            index._by_customer.setdefault(appointment["customer_id"], []).append(key)
+            index._status[appointment["id"]] = appointment["status"]
+            index._customer[appointment["id"]] = appointment["customer_id"]
+        return index
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def add(self, appointment: Appointment):
+        key = _key(appointment)
+        insort(self._all, key)
+        insort(self._by_status.setdefault(appointment["status"], []), key)
+        insort(self._by_customer.setdefault(appointment["customer_id"], []), key)
+        self._status[appointment["id"]] = appointment["status"]
+        self._customer[appointment["id"]] = appointment["customer_id"]
+
+    def set_status(self, appointment: Appointment):
+        """Moves the appointment's key to the list of its new status."""
+        old_status = self._status.get(appointment["id"])
+        if old_status == appointment["status"]:
+            return
+        key = _key(appointment)
+        if old_status is not None:
+            keys = self._by_status[old_status]
+            del keys[bisect_left(keys, key)]
+        insort(self._by_status.setdefault(appointment["status"], []), key)
+        self._status[appointment["id"]] = appointment["status"]
+
+    def page(
+        self,
+        limit: int,
+        before: Optional[AppointmentKey] = None,
+        status: Optional[str] = None,
+        customer_ids: Optional[Iterable[str]] = None,
+    ) -> list[AppointmentKey]:
+        """Up to `limit` keys older than `before`, newest first, optionally of
+        one status and of the given customers only."""
+        keys = self._all if status is None else self._by_status.get(status, [])
+        if customer_ids is None:
+            hi = bisect_left(keys, before) if before else len(keys)
+            return keys[max(hi - limit, 0) : hi][::-1]
+        customer_ids = set(customer_ids)
+        if len(customer_ids) > MERGE_CUSTOMERS:
+            matches = (
+                key
+                for key in _older(keys, before)
+                if self._customer[key[1]] in customer_ids
+            )
+        else:
+            streams = [
+                _older(self._by_customer[c], before)
+                for c in customer_ids
+                if c in self._by_customer
+            ]
+            matches = (
+                key
+                for key in heapq.merge(*streams, reverse=True)
+                if status is None or self._status[key[1]] == status
+            )
+        return list(islice(matches, limit))
+
+
+def _key(appointment: Appointment) -> AppointmentKey:
+    return appointment["created_at"], appointment["id"]
+
+
+def _older(
+    keys: list[AppointmentKey], before: Optional[AppointmentKey]
+) -> Iterator[AppointmentKey]:
+    """Keys older than `before`, newest first."""
+    hi = bisect_left(keys, before) if before else len(keys)
+    for position in range(hi - 1, -1, -1):
+        yield keys[position]
\ No newline at end of file
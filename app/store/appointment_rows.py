@@ -0,0 +1,105 @@
+import os
+from collections import OrderedDict
+from typing import Callable, Iterable, TypedDict
+from app.models import Appointment
+
+APPOINTMENT_ROWS_CACHED = int(os.getenv("APPOINTMENT_ROWS_CACHED", "50000"))
+
+
+class AppointmentRow(TypedDict):
+    """What an appointment card or list row shows, already formatted."""
+
+    id: str
+    status: str
+    customer_name: str
+    customer_avatar: str
+    provider_name: str
+    date: str
+    time: str
+    price: str
+
+
+RowBuilder = Callable[[Appointment], AppointmentRow]
+
+
+class AppointmentRowCache:
+    """Display rows per appointment id, built on first read and evicting the
+    least recently used.
+
+    Each cached row remembers the slot, customer and provider it was built
+    from, so a change to any of them drops just the rows that show it; the
+    next read rebuilds those. Rows are replaced, never mutated, so a page
+    handed out earlier keeps its values.
+    """
+
+    def __init__(self, max_rows: int = APPOINTMENT_ROWS_CACHED):
+        self.max_rows = max_rows
+        self._rows: OrderedDict[str, AppointmentRow] = OrderedDict()
+        # appointment id -> the (slot, customer, provider) ids of its row
+        self._sources: dict[str, tuple[str, str, str]] = {}
+        self._by_slot: dict[str, set[str]] = {}
+        self._by_customer: dict[str, set[str]] = {}
+        self._by_provider: dict[str, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def rows(
+        self, appointments: Iterable[Appointment], build: RowBuilder
+    ) -> list[AppointmentRow]:
+        return [self.get(appointment, build) for appointment in appointments]
+
+    def get(self, appointment: Appointment, build: RowBuilder) -> AppointmentRow:
+        appointment_id = appointment["id"]
+        row = self._rows.get(appointment_id)
+        if row is not None:
+            self.hits += 1
+            self._rows.move_to_end(appointment_id)
+            return row
+        self.misses += 1
+        row = self._rows[appointment_id] = build(appointment)
+        sources = (
+            appointment["slot_id"],
+            appointment["customer_id"],
+            appointment["provider_id"],
+        )
+        self._sources[appointment_id] = sources
+        for ids, source_id in zip(
+            (self._by_slot, self._by_customer, self._by_provider), sources
+        ):
+            ids.setdefault(source_id, set()).add(appointment_id)
+        while len(self._rows) > self.max_rows:
+            evicted, _ = self._rows.popitem(last=False)
+            self._forget(evicted)
+        return row
+
+    def invalidate_appointment(self, appointment_id: str):
+        if self._rows.pop(appointment_id, None) is not None:
+            self._forget(appointment_id)
+
+    def invalidate_slot(self, slot_id: str):
+        for appointment_id in list(self._by_slot.get(slot_id, ())):
+            self.invalidate_appointment(appointment_id)
+
+    def invalidate_customer(self, customer_id: str):
+        for appointment_id in list(self._by_customer.get(customer_id, ())):
+            self.invalidate_appointment(appointment_id)
+
+    def invalidate_provider(self, provider_id: str):
+        for appointment_id in list(self._by_provider.get(provider_id, ())):
+            self.invalidate_appointment(appointment_id)
+
+    def _forget(self, appointment_id: str):
+        sources = self._sources.pop(appointment_id)
+        for ids, source_id in zip(
+            (self._by_slot, self._by_customer, self._by_provider), sources
+        ):
+            appointment_ids = ids[source_id]
+            appointment_ids.discard(appointment_id)
+            if not appointment_ids:
+                del ids[source_id]
+
+    def stats(self) -> dict[str, int]:
+        return {"rows": len(self._rows), "hits": self.hits, "misses": self.misses}
\ No newline at end of file
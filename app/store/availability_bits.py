@@ -0,0 +1,277 @@
+import numpy as np
+from datetime import date, datetime, time, timedelta
+from math import gcd
+from typing import Iterable, Optional
+from app.models import AvailabilityConfig, Slot
+from app.store.availability_rules import DAY_MINUTES, rules_for
+from app.store.availability_versions import AvailabilityVersions
+
+# Searched time of day: slots starting in [from, to).
+TimeWindow = tuple[time, time]
+# Bitmaps start on this grid and refine it when rules or stored slots start
+# off it.
+DEFAULT_GRID_MINUTES = 30
+WORD_BITS = 64
+_WORD_MASK = (1 << WORD_BITS) - 1
+_MINUTE = timedelta(minutes=1)
+
+
+class AvailabilityBitmap:
+    """Offered and booked slots as one bitset per (provider, day).
+
+    Bit i of a day is the slot starting i * grid_minutes after midnight,
+    held in uint64 words. On the default 30-minute grid a day is one word,
+    so a year for 1k providers is two 1k x 366 word arrays (~6MB). A rule
+    or stored slot starting off the grid refines it to the gcd of the
+    starts, with the words a day then needs (3 for 10 minutes, 23 for 1).
+    Free slots and utilization are bitwise operations on these words; Slot
+    dicts are only built for display.
+    """
+
+    def __init__(
+        self, first_day: date, days: int, grid_minutes: int = DEFAULT_GRID_MINUTES
+    ):
+        self.first_day = first_day
+        self.days = days
+        self.grid_minutes = grid_minutes
+        self._rows: dict[str, int] = {}
+        self.offered = np.zeros((0, days, self.words), dtype=np.uint64)
+        self.booked = np.zeros((0, days, self.words), dtype=np.uint64)
+
+    @classmethod
+    def build(
+        cls,
+        versions: AvailabilityVersions,
+        slots: Iterable[Slot],
+        first_day: date,
+        days: int,
+    ):
+        """Builds the days [first_day, first_day + days) from the
+        availability rules of each month, then the stored slots on top."""
+        bitmap = cls(first_day, days)
+        for provider_id in versions.providers():
+            for config, first, last in versions.spans(
+                provider_id, first_day, bitmap.last_day
+            ):
+                bitmap.set_config(config, first, last)
+        for slot in slots:
+            bitmap.put_slot(slot)
+        return bitmap
+
+    @property
+    def nbytes(self) -> int:
+        return self.offered.nbytes + self.booked.nbytes
+
+    @property
+    def last_day(self) -> date:
+        return self.first_day + timedelta(days=self.days - 1)
+
+    @property
+    def slots_per_day(self) -> int:
+        return DAY_MINUTES // self.grid_minutes
+
+    @property
+    def words(self) -> int:
+        return -(-self.slots_per_day // WORD_BITS)
+
+    def _refine(self, minutes: int):
+        """Moves to the coarsest grid that `minutes` after midnight and the
+        current grid both fall on, spreading the set bits out to match."""
+        grid = gcd(self.grid_minutes, minutes)
+        if grid == self.grid_minutes:
+            return
+        factor = self.grid_minutes // grid
+        slots_per_day = self.slots_per_day
+        self.grid_minutes = grid
+        refined = []
+        for array in (self.offered, self.booked):
+            spread = np.zeros(array.shape[:2] + (self.words,), dtype=np.uint64)
+            for bit in range(slots_per_day):
+                word = array[..., bit // WORD_BITS]
+                flags = (word >> np.uint64(bit % WORD_BITS)) & np.uint64(1)
+                moved = bit * factor
+                spread[..., moved // WORD_BITS] |= flags << np.uint64(moved % WORD_BITS)
+            refined.append(spread)
+        self.offered, self.booked = refined
+
+    def _row(self, provider_id: str) -> int:
+        row = self._rows.get(provider_id)
+        if row is None:
+            row = self._rows[provider_id] = len(self._rows)
+            if row == len(self.offered):
+                grow = np.zeros((max(row, 16), self.days, self.words), dtype=np.uint64)
+                self.offered = np.concatenate([self.offered, grow])
+                self.booked = np.concatenate([self.booked, grow])
+        return row
+
+    def _cell(self, when: datetime) -> Optional[tuple[int, int]]:
+        """(day index, bit) of the slot starting at `when`, if in range,
+        refining the grid if it starts off it."""
+        day = (when.date() - self.first_day).days
+        if not 0 <= day < self.days:
+            return None
+        minutes = (when - datetime.combine(when.date(), time.min)) // _MINUTE
+        self._refine(minutes)
+        return day, minutes // self.grid_minutes
+
+    def set_config(
+        self,
+        config: AvailabilityConfig,
+        first: Optional[date] = None,
+        last: Optional[date] = None,
+    ):
+        """Recomputes the provider's offered slots on the days [first, last]
+        (all by default) from the config; booked bits are kept. Stored slots
+        off the rules have to be put again afterwards."""
+        lo = max((first - self.first_day).days, 0) if first else 0
+        hi = min((last - self.first_day).days + 1, self.days) if last else self.days
+        if lo >= hi:
+            return
+        rules = rules_for(config)
+        self._refine(rules.grid)
+        row = self._row(config["provider_id"])
+        grid, words = self.grid_minutes, self.words
+        week = np.array(
+            [_to_words(mask, words) for mask in rules.weekly_masks(grid)],
+            dtype=np.uint64,
+        )
+        weekdays = (np.arange(lo, hi) + self.first_day.weekday()) % 7
+        self.offered[row, lo:hi] = week[weekdays]
+        for day in rules.special_days():
+            index = (day - self.first_day).days
+            if lo <= index < hi:
+                self.offered[row, index] = _to_words(rules.mask(day, grid), words)
+
+    def put_slot(self, slot: Slot):
+        """Records a stored slot; it is offered even off the template."""
+        cell = self._cell(slot["start_datetime"])
+        if cell is None:
+            return
+        day, bit = cell
+        row = self._row(slot["provider_id"])
+        word = bit // WORD_BITS
+        flag = np.uint64(1 << bit % WORD_BITS)
+        self.offered[row, day, word] |= flag
+        if slot["is_booked"]:
+            self.booked[row, day, word] |= flag
+        else:
+            self.booked[row, day, word] &= ~flag
+
+    def free_mask(self, provider_id: str, day: date) -> int:
+        row = self._rows.get(provider_id)
+        index = (day - self.first_day).days
+        if row is None or not 0 <= index < self.days:
+            return 0
+        return _from_words(self.offered[row, index] & ~self.booked[row, index])
+
+    def free_starts(self, provider_id: str, day: date) -> list[datetime]:
+        """Start times of the provider's free slots on `day`, in order."""
+        return _starts(day, self.free_mask(provider_id, day), self.grid_minutes)
+
+    def utilization(
+        self, provider_ids: Iterable[str], first_day: date, last_day: date
+    ) -> float:
+        """Booked share of the offered slots of the providers over the days."""
+        rows = [self._rows[p] for p in provider_ids if p in self._rows]
+        lo = max((first_day - self.first_day).days, 0)
+        hi = min((last_day - self.first_day).days + 1, self.days)
+        if not rows or lo >= hi:
+            return 0.0
+        offered = self.offered[rows, lo:hi]
+        offered_count = int(np.bitwise_count(offered).sum())
+        if not offered_count:
+            return 0.0
+        booked = np.bitwise_count(offered & self.booked[rows, lo:hi]).sum()
+        return int(booked) / offered_count
+
+    def first_free(
+        self,
+        provider_ids: Iterable[str],
+        after: datetime,
+        until: datetime,
+        count: int,
+        window: Optional[TimeWindow] = None,
+    ) -> list[tuple[datetime, str]]:
+        """The `count` earliest (start, provider_id) free slots starting in
+        [after, until), optionally only those starting inside `window`.
+
+        Walks forward a day at a time over the providers' free words of that
+        day, stopping at the day the N-th slot is found.
+        """
+        ids = sorted(p for p in provider_ids if p in self._rows)
+        rows = np.array([self._rows[p] for p in ids], dtype=np.intp)
+        found: list[tuple[datetime, str]] = []
+        day = max(after.date(), self.first_day)
+        while len(found) < count and day <= self.last_day:
+            if datetime.combine(day, time.min) >= until:
+                break
+            index = (day - self.first_day).days
+            mask = _window_mask(day, after, until, window, self.grid_minutes)
+            free = (
+                self.offered[rows, index]
+                & ~self.booked[rows, index]
+                & np.array(_to_words(mask, self.words), dtype=np.uint64)
+            )
+            union = _from_words(np.bitwise_or.reduce(free)) if len(free) else 0
+            midnight = datetime.combine(day, time.min)
+            for bit in _bits(union):
+                start = midnight + bit * self.grid_minutes * _MINUTE
+                column = free[:, bit // WORD_BITS]
+                flag = np.uint64(1 << bit % WORD_BITS)
+                for position in np.flatnonzero(column & flag):
+                    found.append((start, ids[position]))
+                    if len(found) == count:
+                        return found
+            day += timedelta(days=1)
+        return found
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Positions of the set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _to_words(mask: int, words: int) -> list[int]:
+    """A day bitset as its uint64 words, lowest first."""
+    return [(mask >> (WORD_BITS * i)) & _WORD_MASK for i in range(words)]
+
+
+def _from_words(words: np.ndarray) -> int:
+    mask = 0
+    for i, word in enumerate(words.tolist()):
+        mask |= word << (WORD_BITS * i)
+    return mask
+
+
+def _starts(day: date, mask: int, grid_minutes: int) -> list[datetime]:
+    midnight = datetime.combine(day, time.min)
+    step = grid_minutes * _MINUTE
+    return [midnight + bit * step for bit in _bits(mask)]
+
+
+def _window_mask(
+    day: date,
+    after: datetime,
+    until: datetime,
+    window: Optional[TimeWindow],
+    grid_minutes: int,
+) -> int:
+    """Bits of the day's slots starting in [after, until) and inside `window`."""
+    midnight = datetime.combine(day, time.min)
+    lo, hi = after - midnight, until - midnight
+    if window:
+        lo = max(lo, datetime.combine(day, window[0]) - midnight)
+        hi = min(hi, datetime.combine(day, window[1]) - midnight)
+    return _bits_between(lo, hi, grid_minutes)
+
+
+def _bits_between(lo: timedelta, hi: timedelta, grid_minutes: int) -> int:
+    """Bits of the slots starting in [lo, hi) after midnight."""
+    step = grid_minutes * _MINUTE
+    slots_per_day = DAY_MINUTES // grid_minutes
+    first = min(max(-(-lo // step), 0), slots_per_day)
+    end = min(max(-(-hi // step), 0), slots_per_day)
+    return ((1 << end) - 1) & ~((1 << first) - 1)
\ No newline at end of file
@@ -0,0 +1,298 @@
+import json
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from math import gcd
+from typing import Iterable, Iterator, NamedTuple, Optional
+from app.models import AvailabilityConfig
+
+SLOT_DURATION = timedelta(minutes=30)
+DAY_MINUTES = 24 * 60
+HOLIDAY_CALENDARS_FILE = os.getenv("HOLIDAY_CALENDARS_FILE", "")
+_MINUTE = timedelta(minutes=1)
+_ONE_DAY = timedelta(days=1)
+
+
+class Rule(NamedTuple):
+    """A time range of a weekly template or an exception, cut into slots
+    `duration` long with `buffer` between them. `price_cents` of None is
+    the provider's price."""
+
+    start: time
+    end: time
+    duration: timedelta = SLOT_DURATION
+    buffer: timedelta = timedelta(0)
+    price_cents: Optional[int] = None
+
+
+class PlannedSlot(NamedTuple):
+    """A slot of a day plan: minutes after midnight, length in minutes and
+    the rule's price, if any."""
+
+    offset: int
+    minutes: int
+    price_cents: Optional[int]
+
+
+DayPlan = tuple[PlannedSlot, ...]
+
+
+class TimedSlot(NamedTuple):
+    """A planned slot with what expanding it needs precomputed: its start
+    after midnight and length as timedeltas, and its "HHMM" id suffix."""
+
+    offset: timedelta
+    length: timedelta
+    stamp: str
+    price_cents: Optional[int]
+
+
+def _as_time(value) -> time:
+    return time.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def as_rule(entry) -> Rule:
+    """Reads a template entry: a Rule, (start, end) or (start, end, options)
+    with options {"duration_minutes", "buffer_minutes", "price_cents"}, times
+    as time objects or ISO strings. Raises ValueError unless slots are whole
+    minutes."""
+    if isinstance(entry, Rule):
+        rule = entry
+    else:
+        start, end, *rest = entry
+        options = rest[0] if rest else {}
+        rule = Rule(
+            _as_time(start),
+            _as_time(end),
+            options.get("duration_minutes", SLOT_DURATION // _MINUTE) * _MINUTE,
+            options.get("buffer_minutes", 0) * _MINUTE,
+            options.get("price_cents"),
+        )
+    if rule.duration <= timedelta(0) or rule.buffer < timedelta(0):
+        raise ValueError(f"Invalid slot duration or buffer in {entry!r}")
+    if (
+        any(t.second or t.microsecond for t in (rule.start, rule.end))
+        or rule.duration % _MINUTE
+        or rule.buffer % _MINUTE
+    ):
+        raise ValueError(f"Slots of {entry!r} are not whole minutes")
+    return rule
+
+
+def rule_entry(rule) -> list:
+    """The JSON form of a template entry, options only when not the defaults."""
+    rule = as_rule(rule)
+    entry: list = [rule.start.isoformat(), rule.end.isoformat()]
+    options = {}
+    if rule.duration != SLOT_DURATION:
+        options["duration_minutes"] = rule.duration // _MINUTE
+    if rule.buffer:
+        options["buffer_minutes"] = rule.buffer // _MINUTE
+    if rule.price_cents is not None:
+        options["price_cents"] = rule.price_cents
+    if options:
+        entry.append(options)
+    return entry
+
+
+def day_plan(entries: Iterable) -> DayPlan:
+    """The slots the entries offer on a day, in time order. Where ranges
+    overlap, the earlier entry's slot at a start time wins."""
+    planned: dict[int, PlannedSlot] = {}
+    for rule in map(as_rule, entries):
+        start, end = _minutes(rule.start), _minutes(rule.end)
+        minutes = rule.duration // _MINUTE
+        step = minutes + rule.buffer // _MINUTE
+        for offset in range(start, end - minutes + 1, step):
+            planned.setdefault(offset, PlannedSlot(offset, minutes, rule.price_cents))
+    return tuple(planned[offset] for offset in sorted(planned))
+
+
+def plan_mask(plan: DayPlan, grid_minutes: int) -> int:
+    """The plan as a day bitset: bit i is the slot starting i * grid_minutes
+    after midnight. The grid has to divide every slot's offset."""
+    mask = 0
+    for slot in plan:
+        mask |= 1 << (slot.offset // grid_minutes)
+    return mask
+
+
+def plan_grid(plans: Iterable[DayPlan]) -> int:
+    """The coarsest grid, in minutes dividing a day, that every slot of the
+    plans starts on."""
+    return gcd(DAY_MINUTES, *(slot.offset for plan in plans for slot in plan))
+
+
+_holiday_calendars: Optional[dict[str, frozenset[date]]] = None
+
+
+def _calendars() -> dict[str, frozenset[date]]:
+    global _holiday_calendars
+    if _holiday_calendars is None:
+        _holiday_calendars = {}
+        if HOLIDAY_CALENDARS_FILE:
+            with open(HOLIDAY_CALENDARS_FILE) as f:
+                for name, days in json.load(f).items():
+                    register_holiday_calendar(name, map(date.fromisoformat, days))
+    return _holiday_calendars
+
+
+def register_holiday_calendar(name: str, days: Iterable[date]):
+    """Adds or replaces a named set of closed dates. Calendars are also read
+    from the JSON file at HOLIDAY_CALENDARS_FILE ({"name": ["2026-12-25"]})."""
+    _calendars()[name] = frozenset(days)
+
+
+def holidays(name: Optional[str]) -> frozenset[date]:
+    return _calendars().get(name, frozenset()) if name else frozenset()
+
+
+class AvailabilityRules:
+    """A config's weekly template, exceptions and holiday calendar compiled
+    to day plans.
+
+    The seven weekday plans and each exception date's plan are built once;
+    expanding a range is then one lookup per day. An exception date replaces
+    the weekday's ranges (an empty list closes the day) and takes precedence
+    over the holiday calendar, so a provider can open on a holiday.
+    """
+
+    def __init__(self, config: AvailabilityConfig):
+        template = config.get("weekly_template") or {}
+        self.weekly: tuple[DayPlan, ...] = tuple(
+            day_plan(template.get(weekday, [])) for weekday in range(7)
+        )
+        self.overrides: dict[date, DayPlan] = {
+            date.fromisoformat(day): day_plan(entries)
+            for day, entries in (config.get("exceptions") or {}).items()
+        }
+        self.holiday_calendar: Optional[str] = config.get("holiday_calendar")
+        self.grid = plan_grid([*self.weekly, *self.overrides.values()])
+        self._weekly_masks: dict[int, tuple[int, ...]] = {}
+        # id(plan) -> its TimedSlots; the plans live as long as the rules
+        self._timed: dict[int, tuple[TimedSlot, ...]] = {}
+
+    def plan(self, day: date) -> DayPlan:
+        plan = self.overrides.get(day)
+        if plan is not None:
+            return plan
+        if day in holidays(self.holiday_calendar):
+            return ()
+        return self.weekly[day.weekday()]
+
+    def weekly_masks(self, grid_minutes: int) -> tuple[int, ...]:
+        """The weekday plans as bitsets on a grid dividing `self.grid`."""
+        masks = self._weekly_masks.get(grid_minutes)
+        if masks is None:
+            masks = self._weekly_masks[grid_minutes] = tuple(
+                plan_mask(plan, grid_minutes) for plan in self.weekly
+            )
+        return masks
+
+    def mask(self, day: date, grid_minutes: int) -> int:
+        if day in self.overrides or day in holidays(self.holiday_calendar):
+            return plan_mask(self.plan(day), grid_minutes)
+        return self.weekly_masks(grid_minutes)[day.weekday()]
+
+    def planned(self, start: datetime) -> Optional[PlannedSlot]:
+        """The planned slot starting at `start`, if the rules offer one."""
+        offset = start.hour * 60 + start.minute
+        for slot in self.plan(start.date()):
+            if slot.offset == offset:
+                return slot
+        return None
+
+    def rule_price(self, start: datetime) -> Optional[int]:
+        """The price the rules set for the slot starting at `start`, if any."""
+        slot = self.planned(start)
+        return slot.price_cents if slot else None
+
+    def special_days(self) -> set[date]:
+        """The dates whose plan is not their weekday's: exceptions and holidays."""
+        return self.overrides.keys() | holidays(self.holiday_calendar)
+
+    def days(self, first: date, last: date) -> Iterator[tuple[date, DayPlan]]:
+        """Yields (day, plan) for the days in [first, last] that offer slots."""
+        overrides = self.overrides
+        closed = holidays(self.holiday_calendar)
+        weekly = self.weekly
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            plan = overrides.get(day)
+            if plan is None:
+                plan = () if day in closed else weekly[(ordinal - 1) % 7]
+            if plan:
+                yield day, plan
+
+    def timed(self, plan: DayPlan) -> tuple[TimedSlot, ...]:
+        """One of these rules' plans as TimedSlots, built once per plan."""
+        timed = self._timed.get(id(plan))
+        if timed is None:
+            timed = self._timed[id(plan)] = tuple(
+                TimedSlot(
+                    slot.offset * _MINUTE,
+                    slot.minutes * _MINUTE,
+                    f"{slot.offset // 60:02d}{slot.offset % 60:02d}",
+                    slot.price_cents,
+                )
+                for slot in plan
+            )
+        return timed
+
+    def day_slots(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, tuple[TimedSlot, ...]]]:
+        """Yields (midnight, slots) of the days with slots starting in
+        [start, end), in time order, the first and last day's slots trimmed
+        to the window. Callers build what they need per day once (an id
+        prefix, a month key) and one datetime per slot."""
+        if start >= end:
+            return
+        last = (end - timedelta(microseconds=1)).date()
+        for day, plan in self.days(start.date(), last):
+            timed = self.timed(plan)
+            midnight = datetime.combine(day, time.min)
+            if not (start <= midnight and midnight + _ONE_DAY <= end):
+                timed = tuple(
+                    slot for slot in timed if start <= midnight + slot.offset < end
+                )
+                if not timed:
+                    continue
+            yield midnight, timed
+
+    def slots(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, TimedSlot]]:
+        """Yields (start, slot) of the slots starting in [start, end), in
+        time order."""
+        for midnight, timed in self.day_slots(start, end):
+            for slot in timed:
+                yield midnight + slot.offset, slot
+
+
+_compiled_lock = threading.Lock()
+# (provider_id, month) -> the config last compiled for it and its rules; a
+# replaced config overwrites its version's entry, so this holds one entry
+# per version however many providers and months there are. Ad hoc configs
+# without those fields, as the seed builds, share the (None, None) entry.
+_compiled: dict[
+    tuple[Optional[str], Optional[str]], tuple[AvailabilityConfig, AvailabilityRules]
+] = {}
+
+
+def rules_for(config: AvailabilityConfig) -> AvailabilityRules:
+    """The compiled rules of a config, reused while the same config object
+    is current. Configs are replaced when they change, never mutated."""
+    key = (config.get("provider_id"), config.get("month"))
+    with _compiled_lock:
+        cached = _compiled.get(key)
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    rules = AvailabilityRules(config)
+    with _compiled_lock:
+        _compiled[key] = (config, rules)
+    return rules
\ No newline at end of file
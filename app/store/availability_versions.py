@@ -0,0 +1,117 @@
+from bisect import bisect_right, insort
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+from dateutil.relativedelta import relativedelta
+from app.models import AvailabilityConfig
+
+
+def month_of(day: date) -> str:
+    return f"{day:%Y-%m}"
+
+
+def month_days(month: str) -> tuple[date, date]:
+    """The first and last day of a "YYYY-MM" month."""
+    first = date.fromisoformat(f"{month}-01")
+    return first, first + relativedelta(months=1) - timedelta(days=1)
+
+
+class AvailabilityVersions:
+    """Availability configs per (provider_id, "YYYY-MM") month.
+
+    A month without its own config follows the provider's latest earlier
+    one, and months before the first config follow the first, so a provider
+    with a single config offers the same slots on every date. Configs are
+    replaced, never mutated, which keeps their compiled rules cached.
+    """
+
+    def __init__(self, configs: Iterable[AvailabilityConfig] = ()):
+        self._configs: dict[tuple[str, str], AvailabilityConfig] = {}
+        # provider id -> the months with their own config, sorted
+        self._months: dict[str, list[str]] = {}
+        for config in configs:
+            self.put(config)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __contains__(self, provider_id) -> bool:
+        """Whether the provider has any availability config."""
+        return provider_id in self._months
+
+    def values(self) -> Iterable[AvailabilityConfig]:
+        return self._configs.values()
+
+    def providers(self) -> Iterable[str]:
+        return self._months.keys()
+
+    def put(self, config: AvailabilityConfig):
+        key = (config["provider_id"], config["month"])
+        if key not in self._configs:
+            insort(self._months.setdefault(key[0], []), key[1])
+        self._configs[key] = config
+
+    def get(self, provider_id: str, month: str) -> Optional[AvailabilityConfig]:
+        """The config saved for exactly that month, if any."""
+        return self._configs.get((provider_id, month))
+
+    def for_month(self, provider_id: str, month: str) -> Optional[AvailabilityConfig]:
+        """The config in effect for the month."""
+        months = self._months.get(provider_id)
+        if not months:
+            return None
+        position = max(bisect_right(months, month) - 1, 0)
+        return self._configs[provider_id, months[position]]
+
+    def for_day(self, provider_id: str, day: date) -> Optional[AvailabilityConfig]:
+        return self.for_month(provider_id, month_of(day))
+
+    def followers(
+        self, provider_id: str, month: str
+    ) -> list[tuple[str, Optional[AvailabilityConfig]]]:
+        """The months next to `month` that have no config of their own and
+        would follow one saved for `month`, with the config they follow now."""
+        months = self._months.get(provider_id, [])
+        first, last = month_days(month)
+        found = []
+        previous = month_of(first - timedelta(days=1))
+        if (provider_id, previous) not in self._configs and not (
+            months and months[0] < month
+        ):
+            found.append((previous, self.for_month(provider_id, previous)))
+        following = month_of(last + timedelta(days=1))
+        if (provider_id, following) not in self._configs:
+            found.append((following, self.for_month(provider_id, following)))
+        return found
+
+    def spans(
+        self, provider_id: str, first: date, last: date
+    ) -> Iterator[tuple[AvailabilityConfig, date, date]]:
+        """Splits the days [first, last] into (config, from, to) runs, each
+        governed by one config, in order."""
+        months = self._months.get(provider_id)
+        if not months or first > last:
+            return
+        position = max(bisect_right(months, month_of(first)) - 1, 0)
+        start = first
+        while start <= last:
+            following = months[position + 1] if position + 1 < len(months) else None
+            end = last
+            if following is not None:
+                end = min(last, month_days(following)[0] - timedelta(days=1))
+            if start <= end:
+                yield self._configs[provider_id, months[position]], start, end
+            if following is None:
+                return
+            start = max(start, month_days(following)[0])
+            position += 1
+
+    def span_of(
+        self, config: AvailabilityConfig
+    ) -> tuple[Optional[date], Optional[date]]:
+        """The days the config governs, None where that side is unbounded."""
+        months = self._months[config["provider_id"]]
+        position = months.index(config["month"])
+        first = month_days(config["month"])[0] if position else None
+        following = months[position + 1] if position + 1 < len(months) else None
+        last = month_days(following)[0] - timedelta(days=1) if following else None
+        return first, last
\ No newline at end of file
@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+
+class WriteConflictError(Exception):
+    """Storage changed between our checks and our write; nothing was written."""
+
+
+class SlotConflictError(WriteConflictError):
+    """The slot was booked elsewhere between our check and our write."""
+
+
+class StaleRecordError(WriteConflictError):
+    """The record no longer has the values the change was planned from."""
+
+
+class BookingOverlapError(WriteConflictError):
+    """The customer booked an overlapping slot with the provider elsewhere."""
+
+
+class StoreBackend:
+    """Where a DataStore loads its tables from and writes its changes to.
+
+    The store keeps the working set in memory and calls `save`/`delete`
+    inside `transaction()` for every change, so a backend only has to
+    persist records; after `load`, reads only reach it to re-read the rows
+    a write conflicted on. Backends that do
+    I/O set `supports_async` and implement `persist_async` so event handlers
+    can await their writes instead of blocking the event loop.
+    """
+
+    supports_async = False
+
+    def load(self) -> dict:
+        """Returns the initial tables as {table_name: [records]}."""
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self) -> Iterator["StoreBackend"]:
+        yield self
+
+    def save(self, table: str, record: dict):
+        pass
+
+    def claim_slot(self, slot: dict):
+        """Writes the slot as booked only if it is still free in storage.
+
+        Raises SlotConflictError otherwise. In memory the store's lock
+        already makes check-then-set atomic, so there is nothing to do.
+        """
+
+    def update(self, table: str, record: dict, expected: dict):
+        """Writes the record only if the stored one still has the `expected`
+        field values.
+
+        Raises StaleRecordError otherwise. In memory the store's lock keeps
+        the record from changing between the check and the write.
+        """
+        self.save(table, record)
+
+    def check_overlap(self, appointment: dict, slot: dict):
+        """Raises BookingOverlapError if the appointment's customer already
+        has an active appointment with its provider overlapping the slot."""
+
+    def delete(self, table: str, record_id: str):
+        pass
+
+    def delete_many(self, table: str, record_ids: list[str]):
+        """Deletes several records of a table; backends may do it in one
+        statement."""
+        for record_id in record_ids:
+            self.delete(table, record_id)
+
+    def increment(self, table: str, record: dict, deltas: dict[str, int]):
+        """Adds `deltas` to the stored record's counters, inserting `record`
+        if it is not stored yet.
+
+        Relative updates keep concurrent writers from overwriting each
+        other's counts.
+        """
+
+    async def persist_async(
+        self, saves, deletes=(), claims=(), increments=(), updates=(), bookings=()
+    ):
+        raise NotImplementedError
+
+    def reread(
+        self,
+        appointment_ids: Iterable[str] = (),
+        slot_ids: Iterable[str] = (),
+        bookings: Iterable[tuple[dict, dict]] = (),
+    ) -> dict:
+        """Re-reads the rows a conflicting write ran into, as
+        {"appointments": [...], "slots": [...]}.
+
+        That is the appointments with `appointment_ids` or on `slot_ids`,
+        the active ones overlapping each new (appointment, slot) booking,
+        and the slots of all of them. A backend no other process writes to
+        has nothing newer than memory and returns no rows.
+        """
+        return {}
+
+    async def reread_async(
+        self,
+        appointment_ids: Iterable[str] = (),
+        slot_ids: Iterable[str] = (),
+        bookings: Iterable[tuple[dict, dict]] = (),
+    ) -> dict:
+        return self.reread(appointment_ids, slot_ids, bookings)
+
+
+def write_changes(
+    tx,
+    saves: Iterable[tuple[str, dict]],
+    deletes: Iterable[tuple[str, str]] = (),
+    claims: Iterable[dict] = (),
+    increments: Iterable[tuple[str, dict, dict[str, int]]] = (),
+    updates: Iterable[tuple[str, dict, dict]] = (),
+    bookings: Iterable[tuple[dict, dict]] = (),
+):
+    """Applies one store operation to a backend transaction: claims first,
+    then the overlap checks of new (appointment, slot) bookings and the
+    updates guarded by (table, record, expected values), then the rest."""
+    for slot in claims:
+        tx.claim_slot(slot)
+    for appointment, slot in bookings:
+        tx.check_overlap(appointment, slot)
+    for table, record, expected in updates:
+        tx.update(table, record, expected)
+    for table, record in saves:
+        tx.save(table, record)
+    deleted: dict[str, list[str]] = {}
+    for table, record_id in deletes:
+        deleted.setdefault(table, []).append(record_id)
+    for table, record_ids in deleted.items():
+        tx.delete_many(table, record_ids)
+    for table, record, deltas in increments:
+        tx.increment(table, record, deltas)
+
+
+class MemoryBackend(StoreBackend):
+    """Keeps everything in process memory, seeded with the mock dataset."""
+
+    def load(self) -> dict:
+        from app.store.mock_data import mock_tables
+
+        return mock_tables()
+
+
+def _sql_backend() -> StoreBackend:
+    from app.db.repository import SqlRepository
+
+    return SqlRepository()
+
+
+BACKENDS: dict[str, Callable[[], StoreBackend]] = {
+    "memory": MemoryBackend,
+    "sql": _sql_backend,
+}
+
+
+def get_backend(name: str) -> StoreBackend:
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown DATA_STORE_BACKEND '{name}', expected one of {sorted(BACKENDS)}."
+        )
+    return BACKENDS[name]()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable
+from dateutil.relativedelta import relativedelta
+
+CALENDAR_CACHE_MONTHS = int(os.getenv("CALENDAR_CACHE_MONTHS", "256"))
+# Builds {day of month: value} for the slots starting in [start, end).
+DayBuilder = Callable[[datetime, datetime], dict[int, Any]]
+
+
+class CalendarCache:
+    """Built calendar months per (provider_id, "YYYY-MM"), evicting the least
+    recently used.
+
+    A slot change only marks its day stale; the next read rebuilds that day
+    and swaps in a new month dict, so a month handed out earlier is never
+    mutated under its reader. Everything is dropped when the date changes,
+    since the booking horizon moves with it.
+    """
+
+    def __init__(self, max_months: int = CALENDAR_CACHE_MONTHS):
+        self.max_months = max_months
+        self._months: OrderedDict[tuple[str, str], dict[int, Any]] = OrderedDict()
+        self._stale: dict[tuple[str, str], set[int]] = {}
+        self._built_on = date.today()
+        self.hits = 0
+        self.misses = 0
+        self.day_rebuilds = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._months)
+
+    def get_month(self, provider_id: str, month: str, build: DayBuilder) -> dict:
+        if self._built_on != date.today():
+            self._months.clear()
+            self._stale.clear()
+            self._built_on = date.today()
+        key = (provider_id, month)
+        days = self._months.get(key)
+        month_start = datetime.strptime(month, "%Y-%m")
+        if days is None:
+            self.misses += 1
+            days = build(month_start, month_start + relativedelta(months=1))
+        else:
+            self.hits += 1
+            stale = self._stale.pop(key, None)
+            if stale:
+                days = dict(days)
+                for day in stale:
+                    start = month_start.replace(day=day)
+                    rebuilt = build(start, start + timedelta(days=1))
+                    if day in rebuilt:
+                        days[day] = rebuilt[day]
+                    else:
+                        days.pop(day, None)
+                self.day_rebuilds += len(stale)
+        self._months[key] = days
+        self._months.move_to_end(key)
+        while len(self._months) > self.max_months:
+            evicted, _ = self._months.popitem(last=False)
+            self._stale.pop(evicted, None)
+            self.evictions += 1
+        return days
+
+    def invalidate_day(self, provider_id: str, day: date):
+        """Marks one day of a cached month for rebuilding on its next read."""
+        key = (provider_id, day.strftime("%Y-%m"))
+        if key in self._months:
+            self._stale.setdefault(key, set()).add(day.day)
+
+    def invalidate_month(self, provider_id: str, month: str):
+        """Drops one cached month of the provider, e.g. after its
+        availability changed."""
+        self._months.pop((provider_id, month), None)
+        self._stale.pop((provider_id, month), None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "months": len(self._months),
+            "hits": self.hits,
+            "misses": self.misses,
+            "day_rebuilds": self.day_rebuilds,
+            "evictions": self.evictions,
+        }
\ No newline at end of file
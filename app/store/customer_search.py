@@ -0,0 +1,129 @@
+import heapq
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator, Optional
+from app.models import Customer
+
+CUSTOMER_SEARCH_LIMIT = 50
+GRAM = 3
+PHONE_CHARS = frozenset("0123456789+-() ")
+
+
+def normalize_name(text: str) -> str:
+    """Case- and accent-folded text with single spaces."""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def mobile_digits(text: str) -> str:
+    return "".join(c for c in text if c.isdigit())
+
+
+def is_phone_like(text: str) -> bool:
+    """Whether `text` reads as (part of) a phone number: digits and
+    `+ - ( )` or spaces only, with at least one digit."""
+    return any(c.isdigit() for c in text) and set(text) <= PHONE_CHARS
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class CustomerSearchIndex:
+    """Trigram index over normalized customer names and mobile digits.
+
+    Each trigram maps to the sorted row numbers of the customers containing
+    it. A search walks the shortest posting list of the term's trigrams and
+    keeps the rows whose text really contains the term, stopping at the
+    limit; terms shorter than a trigram fall back to a capped scan.
+    """
+
+    def __init__(self):
+        self._ids: list[Optional[str]] = []
+        self._names: list[str] = []
+        self._mobiles: list[str] = []
+        self._rows: dict[str, int] = {}
+        # row numbers as unsigned 32-bit ints, 4 bytes per posting
+        self._postings: dict[str, array] = {}
+
+    @classmethod
+    def build(cls, customers: Iterable[Customer]) -> "CustomerSearchIndex":
+        index = cls()
+        for customer in customers:
+            index.put(customer)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def put(self, customer: Customer):
+        """Indexes a new customer or re-indexes an updated one."""
+        name = normalize_name(customer["full_name"])
+        mobile = mobile_digits(customer["mobile"])
+        row = self._rows.get(customer["id"])
+        if row is None:
+            row = self._rows[customer["id"]] = len(self._ids)
+            self._ids.append(customer["id"])
+            self._names.append(name)
+            self._mobiles.append(mobile)
+            postings = self._postings
+            for gram in _grams(name) | _grams(mobile):
+                rows = postings.get(gram)
+                if rows is None:
+                    rows = postings[gram] = array("I")
+                rows.append(row)
+            return
+        old = _grams(self._names[row]) | _grams(self._mobiles[row])
+        new = _grams(name) | _grams(mobile)
+        self._names[row], self._mobiles[row] = name, mobile
+        for gram in old - new:
+            rows = self._postings[gram]
+            del rows[bisect_left(rows, row)]
+        for gram in new - old:
+            insort(self._postings.setdefault(gram, array("I")), row)
+
+    def remove(self, customer_id: str):
+        row = self._rows.pop(customer_id, None)
+        if row is None:
+            return
+        for gram in _grams(self._names[row]) | _grams(self._mobiles[row]):
+            rows = self._postings[gram]
+            del rows[bisect_left(rows, row)]
+        self._ids[row] = None
+        self._names[row] = self._mobiles[row] = ""
+
+    def search(
+        self, term: str, limit: Optional[int] = CUSTOMER_SEARCH_LIMIT
+    ) -> list[str]:
+        """Ids of the customers whose name contains `term`, or whose mobile
+        contains its digits when the term is phone-like, in insertion order,
+        at most `limit` of them."""
+        name = normalize_name(term)
+        branches = []
+        if name:
+            branches.append(self._matches(name, self._names))
+        if is_phone_like(term):
+            branches.append(self._matches(mobile_digits(term), self._mobiles))
+        ids = []
+        last = -1
+        for row in heapq.merge(*branches):
+            if row != last:
+                ids.append(self._ids[row])
+                last = row
+                if len(ids) == limit:
+                    break
+        return ids
+
+    def _matches(self, text: str, texts: list[str]) -> Iterator[int]:
+        if len(text) < GRAM:
+            rows: Iterable[int] = range(len(texts))
+        else:
+            postings = [self._postings.get(gram, ()) for gram in _grams(text)]
+            rows = min(postings, key=len)
+        for row in rows:
+            if text in texts[row]:
+                yield row
\ No newline at end of file
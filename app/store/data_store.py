@@ -0,0 +1,1144 @@
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Mapping, Optional, Union
+from app.models import (
+    Business,
+    Department,
+    Provider,
+    Customer,
+    Slot,
+    Appointment,
+    AvailabilityConfig,
+    DailyRollup,
+    HistoryLog,
+)
+from app.store.aggregates import AppointmentAggregates
+from app.store.appointment_index import AppointmentKey, AppointmentKeyIndex
+from app.store.appointment_rows import AppointmentRow, AppointmentRowCache
+from app.store.availability_bits import AvailabilityBitmap, TimeWindow
+from app.store.availability_rules import as_rule, rules_for
+from app.store.availability_versions import AvailabilityVersions, month_days
+from app.store.calendar_cache import CalendarCache, DayBuilder
+from app.store.customer_search import CUSTOMER_SEARCH_LIMIT, CustomerSearchIndex
+from app.store.records import AppointmentTable, HistoryLogTable, SlotTable
+from app.store.backends import (
+    BookingOverlapError,
+    StaleRecordError,
+    StoreBackend,
+    WriteConflictError,
+    get_backend,
+    write_changes,
+)
+from app.store.rollups import (
+    RollupTable,
+    add_counters,
+    build_rollups,
+    new_rollup,
+    rollup_deltas,
+    rollup_id,
+)
+from app.store.slot_engine import (
+    BOOKING_HORIZON_DAYS,
+    DEFAULT_SLOT_PRICE_CENTS,
+    booking_horizon,
+    expand_slots,
+    materialize_slot,
+    parse_slot_id,
+    slot_id_for,
+    slots_offered_on,
+)
+from app.store.slot_index import ACTIVE_STATUSES, ProviderSlotIndex
+
+VALID_TRANSITIONS = {
+    "Pending": ["Confirmed", "Cancelled", "Completed", "No-Show"],
+    "Confirmed": ["Cancelled", "Completed", "No-Show"],
+    "No-Show": ["Completed"],
+}
+OVERLAP_ERROR = "Error: Customer has an overlapping appointment with this provider."
+STALE_APPOINTMENT_ERROR = (
+    "Error: Appointment was changed elsewhere; reload and try again."
+)
+
+
+def _by_id(records) -> dict:
+    return {r["id"]: r for r in records}
+
+
+def _guarded_fields(appointment: Appointment) -> dict:
+    """The appointment fields a status or time change is planned from."""
+    return {"status": appointment["status"], "slot_id": appointment["slot_id"]}
+
+
+class PendingWrite:
+    """A validated store operation: the backend writes it needs and the
+    in-memory update to run once they have committed.
+
+    `updates` are (table, record, expected) writes that only go through
+    while the stored record still has the `expected` field values the plan
+    read, and `bookings` the new (appointment, slot) pairs whose customer
+    must not hold an overlapping appointment with the provider; storage
+    checks both, so a plan made from state another writer has since changed
+    fails with `conflict_error` instead of overwriting it.
+    """
+
+    def __init__(
+        self,
+        saves: list[tuple[str, dict]],
+        apply: Callable[[], None],
+        deletes: list[tuple[str, str]] = (),
+        claims: list[Slot] = (),
+        conflict_error: Optional[str] = None,
+        increments: list[tuple[str, dict, dict[str, int]]] = (),
+        updates: list[tuple[str, dict, dict]] = (),
+        bookings: list[tuple[Appointment, Slot]] = (),
+    ):
+        self.saves = saves
+        self.apply = apply
+        self.deletes = deletes
+        self.claims = claims
+        self.conflict_error = conflict_error
+        self.increments = increments
+        self.updates = updates
+        self.bookings = bookings
+
+
+class DataStore:
+    """Process-wide tables shared by every client session.
+
+    Reflex states only keep the view slices their pages render and go
+    through the store for everything else. Writes are serialized by a lock
+    and mirrored to the backend in one transaction per operation.
+    """
+
+    def __init__(self, backend: StoreBackend):
+        self.backend = backend
+        self.lock = threading.RLock()
+        data = backend.load()
+        self.businesses: dict[str, Business] = _by_id(data.get("businesses", []))
+        self.departments: dict[str, Department] = _by_id(data.get("departments", []))
+        self.providers: dict[str, Provider] = _by_id(data.get("providers", []))
+        self.customers: dict[str, Customer] = _by_id(data.get("customers", []))
+        # the indexes below are built from the loaded dicts, which are then
+        # swapped for the compact tables
+        self.slots: Mapping[str, Slot] = _by_id(data.get("slots", []))
+        self.appointments: Mapping[str, Appointment] = _by_id(
+            data.get("appointments", [])
+        )
+        self.availability_configs = AvailabilityVersions(
+            data.get("availability_configs", [])
+        )
+        self.history_logs = HistoryLogTable.build(data.get("history_logs", []))
+        self.slot_index = ProviderSlotIndex.build(
+            self.slots, self.appointments.values()
+        )
+        self.aggregates = AppointmentAggregates.build(
+            self.appointments.values(), self.get_slot
+        )
+        self.appointment_keys = AppointmentKeyIndex.build(self.appointments.values())
+        self.customer_search = CustomerSearchIndex.build(self.customers.values())
+        self.calendar_cache = CalendarCache()
+        self.display_rows = AppointmentRowCache()
+        self.availability = self._build_availability()
+        rollups = data.get("daily_rollups")
+        self.daily_rollups = RollupTable(
+            rollups if rollups is not None else self._build_rollups()
+        )
+        self._rollups_through: Optional[date] = None
+        self._extend_rollups()
+        # appointment and slot ids with an async write committing; a
+        # conflict refresh leaves those rows to that write
+        self._writing: Counter = Counter()
+        self.slots = SlotTable.build(self.slots.values())
+        self.appointments = AppointmentTable.build(self.appointments.values())
+
+    def get_business(self) -> Optional[Business]:
+        return next(iter(self.businesses.values()), None)
+
+    def get_department(self, department_id: str) -> Optional[Department]:
+        return self.departments.get(department_id)
+
+    def get_provider(self, provider_id: str) -> Optional[Provider]:
+        return self.providers.get(provider_id)
+
+    def get_customer(self, customer_id: str) -> Optional[Customer]:
+        return self.customers.get(customer_id)
+
+    def get_appointment(self, appointment_id: str) -> Optional[Appointment]:
+        return self.appointments.get(appointment_id)
+
+    def get_slot_price(self, provider_id: str) -> int:
+        """The provider's saved base price, for slots whose rule sets none."""
+        provider = self.providers.get(provider_id)
+        price_cents = provider.get("slot_price_cents") if provider else None
+        return DEFAULT_SLOT_PRICE_CENTS if price_cents is None else price_cents
+
+    def get_slot(self, slot_id: str) -> Optional[Slot]:
+        """A stored (booked) slot, or the template slot the id describes."""
+        slot = self.slots.get(slot_id)
+        if slot:
+            return slot
+        parsed = parse_slot_id(slot_id)
+        config = (
+            self.availability_configs.for_day(parsed[0], parsed[1].date())
+            if parsed
+            else None
+        )
+        if not config:
+            return None
+        return materialize_slot(slot_id, config, self.get_slot_price(parsed[0]))
+
+    def get_provider_slots(
+        self, provider_id: str, start: datetime, end: datetime
+    ) -> list[Slot]:
+        """The provider's slots starting in [start, end): template slots merged
+        with the stored rows that override them."""
+        stored = {s["id"]: s for s in self.slots.between(provider_id, start, end)}
+        price_cents = self.get_slot_price(provider_id)
+        slots = []
+        last_day = (end - timedelta(microseconds=1)).date()
+        for config, first, last in self.availability_configs.spans(
+            provider_id, start.date(), last_day
+        ):
+            span_start = max(start, datetime.combine(first, time.min))
+            span_end = min(end, datetime.combine(last + timedelta(days=1), time.min))
+            for slot in expand_slots(
+                provider_id, config, span_start, span_end, price_cents
+            ):
+                slots.append(stored.pop(slot["id"], None) or slot)
+        if stored:
+            slots.extend(stored.values())
+            slots.sort(key=lambda s: s["start_datetime"])
+        return slots
+
+    def _business_id_for(self, provider_id: str) -> str:
+        provider = self.get_provider(provider_id)
+        for department_id in provider["department_ids"] if provider else []:
+            department = self.get_department(department_id)
+            if department:
+                return department["business_id"]
+        business = self.get_business()
+        return business["id"] if business else ""
+
+    def _build_rollups(self) -> list[DailyRollup]:
+        """Daily rollups computed from the loaded appointments, for backends
+        that do not store them."""
+        activity = []
+        for appointment in self.appointments.values():
+            slot = self.get_slot(appointment["slot_id"])
+            if slot:
+                activity.append(
+                    (
+                        appointment["provider_id"],
+                        slot["start_datetime"].date(),
+                        appointment["status"],
+                        1,
+                        slot["price_cents"],
+                    )
+                )
+        horizon_end = booking_horizon()[1].date()
+        return build_rollups(
+            activity,
+            self.availability_configs,
+            self._business_id_for,
+            min((a[1] for a in activity), default=datetime.now().date()),
+            horizon_end - timedelta(days=1),
+        )
+
+    def _extend_rollups(self):
+        """Adds the capacity rows of the days the booking horizon reached
+        since the rollups were built or last extended, so reports count the
+        slots offered on them before anyone books one.
+
+        The first call checks every day from today to the end of the
+        horizon; later ones only the days the date has since moved onto.
+        Rows are written as empty increments, which leave a row another
+        worker already added as it is.
+        """
+        horizon_start, horizon_end = booking_horizon()
+        last_day = horizon_end.date() - timedelta(days=1)
+        if last_day == self._rollups_through:
+            return
+        first_day = horizon_start.date()
+        if self._rollups_through:
+            first_day = max(first_day, self._rollups_through + timedelta(days=1))
+        increments = [
+            ("daily_rollups", rollup, {})
+            for rollup in build_rollups(
+                [],
+                self.availability_configs,
+                self._business_id_for,
+                first_day,
+                last_day,
+            )
+            if rollup["id"] not in self.daily_rollups
+        ]
+        if increments:
+            self._persist([], increments=increments)
+            self._apply_increments(increments)
+        self._rollups_through = last_day
+
+    def report_totals(
+        self, first_day: date, last_day: date
+    ) -> dict[str, dict[str, int]]:
+        """Rollup counters summed per provider over first_day..last_day, as
+        RollupTable.provider_totals, after extending the rollups to the
+        current horizon."""
+        with self.lock:
+            self._extend_rollups()
+            return self.daily_rollups.provider_totals(first_day, last_day)
+
+    def _rollup_increments(
+        self, changes: list[tuple[Appointment, Optional[Slot], int]], now: datetime
+    ) -> list[tuple[str, DailyRollup, dict[str, int]]]:
+        """The daily rollup updates for appointments leaving (-1) or entering
+        (+1) a state, as relative increments plus the row to insert if the
+        day has none yet."""
+        increments = []
+        for (provider_id, day), deltas in rollup_deltas(changes).items():
+            rollup = self.daily_rollups.get(rollup_id(provider_id, day))
+            if rollup is None:
+                config = self.availability_configs.for_day(provider_id, day)
+                rollup = new_rollup(
+                    self._business_id_for(provider_id),
+                    provider_id,
+                    day,
+                    slots_offered_on(config, day) if config else 0,
+                    now,
+                )
+            increments.append(
+                ("daily_rollups", add_counters(rollup, deltas, now), deltas)
+            )
+        return increments
+
+    def _apply_increments(self, increments: list[tuple[str, dict, dict[str, int]]]):
+        for _, record, deltas in increments:
+            current = self.daily_rollups.get(record["id"])
+            self.daily_rollups.put(
+                add_counters(current, deltas, record["updated_at"])
+                if current
+                else record
+            )
+
+    def calendar_month(self, provider_id: str, month: str, build: DayBuilder) -> dict:
+        """The provider's built calendar month ("YYYY-MM"), from the cache
+        where possible. Held under the lock so no slot write lands between
+        building a month and caching it."""
+        with self.lock:
+            return self.calendar_cache.get_month(provider_id, month, build)
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Size and hit/miss counters of the calendar month and appointment
+        row caches, served at /metrics/caches."""
+        with self.lock:
+            return {
+                "calendar_months": self.calendar_cache.stats(),
+                "appointment_rows": self.display_rows.stats(),
+            }
+
+    def _build_availability(self) -> AvailabilityBitmap:
+        return AvailabilityBitmap.build(
+            self.availability_configs,
+            self.slots.values(),
+            booking_horizon()[0].date(),
+            BOOKING_HORIZON_DAYS,
+        )
+
+    def _current_availability(self) -> AvailabilityBitmap:
+        """The availability bitmap, rebuilt once the date moves the horizon."""
+        if self.availability.first_day != booking_horizon()[0].date():
+            self.availability = self._build_availability()
+        return self.availability
+
+    def first_available_slots(
+        self,
+        count: int,
+        after: Optional[datetime] = None,
+        department_id: str = "",
+        window: Optional[TimeWindow] = None,
+    ) -> list[Slot]:
+        """The `count` earliest free slots of the active providers, optionally
+        only those in `department_id` and starting inside the time-of-day
+        `window`."""
+        horizon_start, horizon_end = booking_horizon()
+        after = max(after or horizon_start, horizon_start)
+        with self.lock:
+            provider_ids = [
+                p["id"]
+                for p in self.providers.values()
+                if p["status"] == "Active"
+                and p["id"] in self.availability_configs
+                and (not department_id or department_id in p["department_ids"])
+            ]
+            found = self._current_availability().first_free(
+                provider_ids, after, horizon_end, count, window
+            )
+            return [
+                self.get_slot(slot_id_for(provider_id, start))
+                for start, provider_id in found
+            ]
+
+    def search_customers(
+        self, term: str, limit: Optional[int] = CUSTOMER_SEARCH_LIMIT
+    ) -> list[Customer]:
+        """Customers whose name or mobile contains `term`, at most `limit`."""
+        with self.lock:
+            return [
+                self.customers[customer_id]
+                for customer_id in self.customer_search.search(term, limit)
+            ]
+
+    def appointments_page(
+        self,
+        limit: int,
+        before: Optional[AppointmentKey] = None,
+        status: Optional[str] = None,
+        customer_ids: Optional[list[str]] = None,
+    ) -> list[Appointment]:
+        """Up to `limit` appointments created before the `before` cursor,
+        newest first, read through the (created_at, id) key index."""
+        with self.lock:
+            keys = self.appointment_keys.page(limit, before, status, customer_ids)
+            return [self.appointments[appointment_id] for _, appointment_id in keys]
+
+    def appointment_rows(self, appointments: list[Appointment]) -> list[AppointmentRow]:
+        """The display rows of the appointments, built once per appointment
+        and kept until it, its slot, customer or provider changes."""
+        with self.lock:
+            return self.display_rows.rows(appointments, self._build_appointment_row)
+
+    def _build_appointment_row(self, appointment: Appointment) -> AppointmentRow:
+        customer = self.get_customer(appointment["customer_id"])
+        provider = self.get_provider(appointment["provider_id"])
+        slot = self.get_slot(appointment["slot_id"])
+        customer_name = customer["full_name"] if customer else "N/A"
+        return AppointmentRow(
+            id=appointment["id"],
+            status=appointment["status"],
+            customer_name=customer_name,
+            customer_avatar=(
+                f"https://api.dicebear.com/9.x/initials/svg?seed={customer_name}"
+                if customer
+                else ""
+            ),
+            provider_name=provider["name"] if provider else "N/A",
+            date=slot["start_datetime"].strftime("%B %d, %Y") if slot else "",
+            time=(
+                f"{slot['start_datetime'].strftime('%I:%M %p')} - {slot['end_datetime'].strftime('%I:%M %p')}"
+                if slot
+                else ""
+            ),
+            price=f"${slot['price_cents'] / 100:.2f}" if slot else "",
+        )
+
+    def provider_has_active_appointments(self, provider_id: str) -> bool:
+        return self.appointments.provider_has_status(provider_id, ACTIVE_STATUSES)
+
+    def _new_history_log(
+        self,
+        appointment_id: str,
+        action: str,
+        performed_by: str,
+        user_type: str,
+        old_status: Optional[str] = None,
+        new_status: Optional[str] = None,
+        details: Optional[str] = None,
+    ) -> HistoryLog:
+        return HistoryLog(
+            id=str(uuid.uuid4()),
+            appointment_id=appointment_id,
+            action=action,
+            performed_by=performed_by,
+            user_type=user_type,
+            timestamp=datetime.now(),
+            old_status=old_status,
+            new_status=new_status,
+            details=details,
+        )
+
+    def _persist(
+        self,
+        saves: list[tuple[str, dict]],
+        deletes=(),
+        claims=(),
+        increments=(),
+        updates=(),
+        bookings=(),
+    ):
+        """Writes one operation's changes to the backend in a single transaction.
+
+        Slots in `claims` are booked with a conditional write first, so two
+        workers racing for a slot cannot both commit; guarded `updates` and
+        the overlap checks of `bookings` do the same for appointments.
+        Callers apply the same changes to the in-memory tables only after
+        this returns, so a failed commit leaves the store untouched.
+        """
+        with self.backend.transaction() as tx:
+            write_changes(tx, saves, deletes, claims, increments, updates, bookings)
+
+    def _put_slot(self, slot: Slot):
+        self.slots[slot["id"]] = slot
+        self.calendar_cache.invalidate_day(
+            slot["provider_id"], slot["start_datetime"].date()
+        )
+        self.availability.put_slot(slot)
+        self.display_rows.invalidate_slot(slot["id"])
+
+    def _conflict_keys(self, write: PendingWrite) -> tuple:
+        """The backend.reread arguments for the rows a write touched: its
+        guarded appointments, the slots it claimed or planned from, and its
+        new bookings."""
+        appointment_ids = []
+        slot_ids = [slot["id"] for slot in write.claims]
+        for table, record, expected in write.updates:
+            if table == "appointments":
+                appointment_ids.append(record["id"])
+                slot_ids.append(expected["slot_id"])
+        return appointment_ids, slot_ids, list(write.bookings)
+
+    def _written_ids(self, write: PendingWrite) -> list[str]:
+        """The ids of the appointments and slots the write changes."""
+        return [slot["id"] for slot in write.claims] + [
+            record["id"]
+            for table, record, *_ in [*write.saves, *write.updates]
+            if table in ("appointments", "slots")
+        ]
+
+    def _on_conflict(
+        self, write: PendingWrite, error: WriteConflictError, stored: dict
+    ) -> str:
+        """The error to show for a write storage rejected, after bringing
+        the rows it conflicted on up to date from `stored`, as re-read from
+        the backend.
+
+        Another worker made the change memory missed, so without the refresh
+        those rows would stay unchangeable in this process until restart.
+        """
+        if not isinstance(error, (BookingOverlapError, StaleRecordError)):
+            for slot in write.claims:
+                self._put_slot(slot)
+        self._refresh(stored)
+        if isinstance(error, BookingOverlapError):
+            return OVERLAP_ERROR
+        if isinstance(error, StaleRecordError):
+            return STALE_APPOINTMENT_ERROR
+        return write.conflict_error
+
+    def _refresh(self, stored: dict):
+        """Replaces the in-memory appointments and slots with the stored
+        rows, keeping the indexes, aggregates and rollups built from them in
+        step. Rows an async write of this process is committing are left
+        for it to apply."""
+        appointments = stored.get("appointments", [])
+        previous = []
+        for appointment in appointments:
+            old = self.appointments.get(appointment["id"])
+            previous.append((old, self.get_slot(old["slot_id"]) if old else None))
+        for slot in stored.get("slots", []):
+            if not self._writing[slot["id"]]:
+                self._put_slot(slot)
+        now = datetime.now()
+        for appointment, (old, old_slot) in zip(appointments, previous):
+            if old == appointment or self._writing[appointment["id"]]:
+                continue
+            appointment_id = appointment["id"]
+            slot = self.get_slot(appointment["slot_id"])
+            self.appointments[appointment_id] = appointment
+            if old and old["status"] in ACTIVE_STATUSES:
+                self.slot_index.remove_booking(
+                    old["customer_id"], old["provider_id"], appointment_id
+                )
+            if slot and appointment["status"] in ACTIVE_STATUSES:
+                self.slot_index.add_booking(
+                    appointment["customer_id"],
+                    appointment["provider_id"],
+                    slot["start_datetime"],
+                    slot["end_datetime"],
+                    appointment_id,
+                )
+            changes = [(appointment, slot, 1)]
+            if old:
+                changes.insert(0, (old, old_slot, -1))
+                self.aggregates.replace(old, old_slot, appointment, slot)
+                self.appointment_keys.set_status(appointment)
+            else:
+                self.aggregates.add(appointment, slot)
+                self.appointment_keys.add(appointment)
+            self.display_rows.invalidate_appointment(appointment_id)
+            # the other worker already added these to the stored rollups
+            self._apply_increments(self._rollup_increments(changes, now))
+
+    def _recheck(self, write: PendingWrite) -> Optional[str]:
+        """The conflict, if any, between the plan and the records in memory,
+        re-checked under the lock before its in-memory update runs."""
+        for table, record, expected in write.updates:
+            current = getattr(self, table).get(record["id"])
+            if current is None or any(
+                current[field] != value for field, value in expected.items()
+            ):
+                return STALE_APPOINTMENT_ERROR
+        for slot in write.claims:
+            current = self.slots.get(slot["id"])
+            if current and current["is_booked"]:
+                return write.conflict_error
+        for appointment, slot in write.bookings:
+            if self.slot_index.overlaps_booking(
+                appointment["customer_id"],
+                appointment["provider_id"],
+                slot["start_datetime"],
+                slot["end_datetime"],
+            ):
+                return OVERLAP_ERROR
+        return None
+
+    def _commit(self, write: Union[PendingWrite, str]) -> Optional[str]:
+        if isinstance(write, str):
+            return write
+        try:
+            self._persist(
+                write.saves,
+                write.deletes,
+                write.claims,
+                write.increments,
+                write.updates,
+                write.bookings,
+            )
+        except WriteConflictError as e:
+            stored = self.backend.reread(*self._conflict_keys(write))
+            return self._on_conflict(write, e, stored)
+        write.apply()
+        return None
+
+    async def _commit_async(
+        self, plan: Callable[[], Union[PendingWrite, str]]
+    ) -> Optional[str]:
+        """Runs `plan` and persists its writes without blocking the event loop.
+
+        The lock is only held for the in-memory steps, never across the
+        awaited write, so another write may land in between. The database
+        arbitrates that race: slot claims, guarded updates and overlap
+        checks make the later of two conflicting writes fail. The plan is
+        then re-checked under the lock before it is applied, and if memory
+        has moved past the committed write, the rows it touched are re-read
+        from storage instead. A backend without async I/O just runs the
+        write inline.
+        """
+        if not self.backend.supports_async:
+            with self.lock:
+                return self._commit(plan())
+        with self.lock:
+            write = plan()
+            if isinstance(write, str):
+                return write
+            writing = self._written_ids(write)
+            self._writing.update(writing)
+        try:
+            await self.backend.persist_async(
+                write.saves,
+                write.deletes,
+                write.claims,
+                write.increments,
+                write.updates,
+                write.bookings,
+            )
+        except WriteConflictError as e:
+            with self.lock:
+                self._writing.subtract(writing)
+            stored = await self.backend.reread_async(*self._conflict_keys(write))
+            with self.lock:
+                return self._on_conflict(write, e, stored)
+        except BaseException:
+            with self.lock:
+                self._writing.subtract(writing)
+            raise
+        with self.lock:
+            self._writing.subtract(writing)
+            error = self._recheck(write)
+            if not error:
+                write.apply()
+                return None
+        # storage accepted a write memory has moved past; applying it would
+        # count the change twice, so the rows it touched are re-read instead
+        logging.error("Store changed under a committed write: %s", error)
+        stored = await self.backend.reread_async(*self._conflict_keys(write))
+        with self.lock:
+            self._refresh(stored)
+            for table, record in write.saves:
+                if table == "history_logs":
+                    self.history_logs.append(record)
+        return None
+
+    def book_slot(
+        self,
+        customer_id: str,
+        slot_id: str,
+        performed_by: str = "System",
+        user_type: str = "Customer",
+    ) -> Optional[str]:
+        with self.lock:
+            return self._commit(
+                self._plan_booking(customer_id, slot_id, performed_by, user_type)
+            )
+
+    async def book_slot_async(
+        self,
+        customer_id: str,
+        slot_id: str,
+        performed_by: str = "System",
+        user_type: str = "Customer",
+    ) -> Optional[str]:
+        return await self._commit_async(
+            lambda: self._plan_booking(customer_id, slot_id, performed_by, user_type)
+        )
+
+    def _plan_booking(
+        self, customer_id: str, slot_id: str, performed_by: str, user_type: str
+    ) -> Union[PendingWrite, str]:
+        slot = self.get_slot(slot_id)
+        if not slot:
+            return "Error: Slot not found."
+        if slot["is_booked"]:
+            return "Error: Slot is already booked."
+        provider = self.get_provider(slot["provider_id"])
+        if not provider or provider["status"] != "Active":
+            return "Error: Provider is not active."
+        if self.slot_index.overlaps_booking(
+            customer_id,
+            provider["id"],
+            slot["start_datetime"],
+            slot["end_datetime"],
+        ):
+            return OVERLAP_ERROR
+        now = datetime.now()
+        booked_slot = dict(slot, is_booked=True, updated_at=now)
+        appointment_id = str(uuid.uuid4())
+        new_appointment = Appointment(
+            id=appointment_id,
+            slot_id=slot_id,
+            provider_id=slot["provider_id"],
+            customer_id=customer_id,
+            status="Pending",
+            created_at=now,
+            updated_at=now,
+            notes="Appointment booked.",
+        )
+        increments = self._rollup_increments([(new_appointment, booked_slot, 1)], now)
+        log = self._new_history_log(
+            appointment_id,
+            "create",
+            performed_by,
+            user_type,
+            new_status="Pending",
+            details="Appointment created.",
+        )
+
+        def apply():
+            self._put_slot(booked_slot)
+            self.appointments[appointment_id] = new_appointment
+            self.history_logs.append(log)
+            self.slot_index.add_booking(
+                customer_id,
+                provider["id"],
+                slot["start_datetime"],
+                slot["end_datetime"],
+                appointment_id,
+            )
+            self.aggregates.add(new_appointment, booked_slot)
+            self.appointment_keys.add(new_appointment)
+            self._apply_increments(increments)
+
+        return PendingWrite(
+            [("appointments", new_appointment), ("history_logs", log)],
+            apply,
+            claims=[booked_slot],
+            conflict_error="Error: Slot is already booked.",
+            increments=increments,
+            bookings=[(new_appointment, booked_slot)],
+        )
+
+    def change_appointment_status(
+        self, appointment_id: str, new_status: str, performed_by: str, user_type: str
+    ) -> Optional[str]:
+        with self.lock:
+            return self._commit(
+                self._plan_status_change(
+                    appointment_id, new_status, performed_by, user_type
+                )
+            )
+
+    async def change_appointment_status_async(
+        self, appointment_id: str, new_status: str, performed_by: str, user_type: str
+    ) -> Optional[str]:
+        return await self._commit_async(
+            lambda: self._plan_status_change(
+                appointment_id, new_status, performed_by, user_type
+            )
+        )
+
+    def _plan_status_change(
+        self, appointment_id: str, new_status: str, performed_by: str, user_type: str
+    ) -> Union[PendingWrite, str]:
+        appointment = self.get_appointment(appointment_id)
+        if not appointment:
+            return "Error: Appointment not found."
+        old_status = appointment["status"]
+        if old_status in ["Cancelled", "Completed"]:
+            return (
+                f"Error: Cannot change status from a terminal state ('{old_status}')."
+            )
+        if new_status not in VALID_TRANSITIONS.get(old_status, []):
+            return f"Error: Invalid status transition from '{old_status}' to '{new_status}'."
+        now = datetime.now()
+        updated = dict(appointment, status=new_status, updated_at=now)
+        saves = []
+        counted_slot = self.get_slot(appointment["slot_id"])
+        slot = self.slots.get(appointment["slot_id"])
+        if new_status == "Cancelled" and slot:
+            slot = dict(slot, is_booked=False, updated_at=now)
+            saves.append(("slots", slot))
+        log = self._new_history_log(
+            appointment_id,
+            "status_change",
+            performed_by,
+            user_type,
+            old_status,
+            new_status,
+        )
+        saves.append(("history_logs", log))
+        increments = self._rollup_increments(
+            [(appointment, counted_slot, -1), (updated, counted_slot, 1)], now
+        )
+
+        def apply():
+            self.appointments[appointment_id] = updated
+            if slot:
+                self._put_slot(slot)
+            self.history_logs.append(log)
+            if new_status not in ACTIVE_STATUSES:
+                self.slot_index.remove_booking(
+                    appointment["customer_id"],
+                    appointment["provider_id"],
+                    appointment_id,
+                )
+            self.aggregates.replace(appointment, counted_slot, updated, counted_slot)
+            self.appointment_keys.set_status(updated)
+            self.display_rows.invalidate_appointment(appointment_id)
+            self._apply_increments(increments)
+
+        return PendingWrite(
+            saves,
+            apply,
+            increments=increments,
+            updates=[("appointments", updated, _guarded_fields(appointment))],
+        )
+
+    def edit_appointment_time(
+        self, appointment_id: str, new_slot_id: str, performed_by: str, user_type: str
+    ) -> Optional[str]:
+        with self.lock:
+            return self._commit(
+                self._plan_time_edit(
+                    appointment_id, new_slot_id, performed_by, user_type
+                )
+            )
+
+    async def edit_appointment_time_async(
+        self, appointment_id: str, new_slot_id: str, performed_by: str, user_type: str
+    ) -> Optional[str]:
+        return await self._commit_async(
+            lambda: self._plan_time_edit(
+                appointment_id, new_slot_id, performed_by, user_type
+            )
+        )
+
+    def _plan_time_edit(
+        self, appointment_id: str, new_slot_id: str, performed_by: str, user_type: str
+    ) -> Union[PendingWrite, str]:
+        appointment = self.get_appointment(appointment_id)
+        if not appointment:
+            return "Error: Appointment not found."
+        if appointment["status"] in ["Cancelled", "Completed"]:
+            return f"Error: Cannot edit a '{appointment['status']}' appointment."
+        new_slot = self.get_slot(new_slot_id)
+        if not new_slot:
+            return "Error: New slot not found."
+        if new_slot["is_booked"]:
+            return "Error: New slot is already booked."
+        if new_slot["provider_id"] != appointment["provider_id"]:
+            return "Error: Cannot change provider when editing time."
+        now = datetime.now()
+        saves = []
+        counted_slot = self.get_slot(appointment["slot_id"])
+        old_slot = self.slots.get(appointment["slot_id"])
+        if old_slot:
+            old_slot = dict(old_slot, is_booked=False, updated_at=now)
+            saves.append(("slots", old_slot))
+        new_slot = dict(new_slot, is_booked=True, updated_at=now)
+        updated = dict(appointment, slot_id=new_slot_id, updated_at=now)
+        details = f"Time changed from {(old_slot['start_datetime'] if old_slot else 'N/A')} to {new_slot['start_datetime']}"
+        log = self._new_history_log(
+            appointment_id, "update", performed_by, user_type, details=details
+        )
+        saves.append(("history_logs", log))
+        increments = self._rollup_increments(
+            [(appointment, counted_slot, -1), (updated, new_slot, 1)], now
+        )
+
+        def apply():
+            if old_slot:
+                self._put_slot(old_slot)
+            self._put_slot(new_slot)
+            self.appointments[appointment_id] = updated
+            self.history_logs.append(log)
+            if updated["status"] in ACTIVE_STATUSES:
+                self.slot_index.remove_booking(
+                    updated["customer_id"], updated["provider_id"], appointment_id
+                )
+                self.slot_index.add_booking(
+                    updated["customer_id"],
+                    updated["provider_id"],
+                    new_slot["start_datetime"],
+                    new_slot["end_datetime"],
+                    appointment_id,
+                )
+            self.aggregates.replace(appointment, counted_slot, updated, new_slot)
+            self.display_rows.invalidate_appointment(appointment_id)
+            self._apply_increments(increments)
+
+        return PendingWrite(
+            saves,
+            apply,
+            claims=[new_slot],
+            conflict_error="Error: New slot is already booked.",
+            increments=increments,
+            updates=[("appointments", updated, _guarded_fields(appointment))],
+        )
+
+    def set_availability(
+        self,
+        provider_id: str,
+        month: str,
+        weekly_template: dict,
+        exceptions: Optional[dict] = None,
+        holiday_calendar: Optional[str] = None,
+    ) -> Optional[str]:
+        with self.lock:
+            return self._commit(
+                self._plan_availability(
+                    provider_id, month, weekly_template, exceptions, holiday_calendar
+                )
+            )
+
+    async def set_availability_async(
+        self,
+        provider_id: str,
+        month: str,
+        weekly_template: dict,
+        exceptions: Optional[dict] = None,
+        holiday_calendar: Optional[str] = None,
+    ) -> Optional[str]:
+        return await self._commit_async(
+            lambda: self._plan_availability(
+                provider_id, month, weekly_template, exceptions, holiday_calendar
+            )
+        )
+
+    def _plan_availability(
+        self,
+        provider_id: str,
+        month: str,
+        weekly_template: dict,
+        exceptions: Optional[dict],
+        holiday_calendar: Optional[str],
+    ) -> Union[PendingWrite, str]:
+        """Saves the provider's availability for one "YYYY-MM" month.
+
+        Only that month changes: neighbouring months that would start
+        following the new config are pinned to the one they follow now, and
+        the month's future slots are diffed in one write. Stored free slots
+        the new rules no longer offer are deleted and those offered with a
+        new length or price are rewritten; booked slots, slots an
+        appointment refers to and unchanged slots are kept. New slots need
+        no rows, as template slots are materialized on demand.
+        """
+        if not self.get_provider(provider_id):
+            return "Error: Provider not found."
+        try:
+            first, last = month_days(month)
+            template = {
+                int(day): [as_rule(entry) for entry in entries]
+                for day, entries in weekly_template.items()
+            }
+            exceptions = {
+                day: [as_rule(entry) for entry in entries]
+                for day, entries in (exceptions or {}).items()
+            }
+        except (TypeError, ValueError) as e:
+            return f"Error: {e}"
+        now = datetime.now()
+        versions = self.availability_configs
+        current = versions.get(provider_id, month)
+        config = AvailabilityConfig(
+            id=current["id"] if current else str(uuid.uuid4()),
+            provider_id=provider_id,
+            month=month,
+            weekly_template=template,
+            exceptions=exceptions,
+            holiday_calendar=holiday_calendar,
+            created_at=current["created_at"] if current else now,
+            updated_at=now,
+        )
+        pinned = [
+            AvailabilityConfig(
+                id=str(uuid.uuid4()),
+                provider_id=provider_id,
+                month=neighbour,
+                weekly_template=followed["weekly_template"] if followed else {},
+                exceptions=followed["exceptions"] if followed else {},
+                holiday_calendar=followed["holiday_calendar"] if followed else None,
+                created_at=now,
+                updated_at=now,
+            )
+            for neighbour, followed in versions.followers(provider_id, month)
+        ]
+        start = max(datetime.combine(first, time.min), now)
+        end = datetime.combine(last + timedelta(days=1), time.min)
+        rules = rules_for(config)
+        referenced = self.appointments.slot_ids_between(provider_id, start, end)
+        price_cents = self.get_slot_price(provider_id)
+        removed, rewritten = [], []
+        for slot in self.slots.between(provider_id, start, end):
+            if slot["is_booked"] or slot["id"] in referenced:
+                continue
+            planned = rules.planned(slot["start_datetime"])
+            if planned is None:
+                removed.append(slot["id"])
+                continue
+            end_datetime = slot["start_datetime"] + timedelta(minutes=planned.minutes)
+            price = price_cents if planned.price_cents is None else planned.price_cents
+            if (end_datetime, price) != (slot["end_datetime"], slot["price_cents"]):
+                rewritten.append(
+                    dict(
+                        slot,
+                        end_datetime=end_datetime,
+                        price_cents=price,
+                        updated_at=now,
+                    )
+                )
+        increments = []
+        for ordinal in range(max(first, now.date()).toordinal(), last.toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            before = versions.for_day(provider_id, day)
+            offered = slots_offered_on(before, day) if before else 0
+            change = len(rules.plan(day)) - offered
+            if change:
+                rollup = self.daily_rollups.get(
+                    rollup_id(provider_id, day)
+                ) or new_rollup(
+                    self._business_id_for(provider_id), provider_id, day, offered, now
+                )
+                deltas = {"available_slots": change}
+                increments.append(
+                    ("daily_rollups", add_counters(rollup, deltas, now), deltas)
+                )
+
+        def apply():
+            for saved in [config] + pinned:
+                versions.put(saved)
+            for slot_id in removed:
+                del self.slots[slot_id]
+            for slot in rewritten:
+                self.slots[slot["id"]] = slot
+            self.availability.set_config(config, first, last)
+            for slot in self.slots.between(
+                provider_id, datetime.combine(first, time.min), end
+            ):
+                self.availability.put_slot(slot)
+            self.calendar_cache.invalidate_month(provider_id, month)
+            self._apply_increments(increments)
+
+        saves = [("availability_configs", c) for c in [config] + pinned]
+        saves += [("slots", slot) for slot in rewritten]
+        return PendingWrite(
+            saves,
+            apply,
+            deletes=[("slots", slot_id) for slot_id in removed],
+            increments=increments,
+        )
+
+    def archive_provider(self, provider_id: str) -> Optional[str]:
+        with self.lock:
+            if not self.get_provider(provider_id):
+                return "Error: Provider not found."
+            if self.provider_has_active_appointments(provider_id):
+                return "Error: Cannot archive provider with pending or confirmed appointments."
+            self.update_record("providers", provider_id, status="Archived")
+            return None
+
+    def insert_record(self, table: str, record: dict):
+        """Adds a department, provider, customer or business."""
+        with self.lock:
+            self._persist([(table, record)])
+            getattr(self, table)[record["id"]] = record
+            if table == "customers":
+                self.customer_search.put(record)
+
+    def update_record(self, table: str, record_id: str, **fields) -> Optional[dict]:
+        """Updates fields of a stored record and bumps its updated_at."""
+        with self.lock:
+            record = getattr(self, table).get(record_id)
+            if record is None:
+                return None
+            updated = dict(record, **fields, updated_at=datetime.now())
+            self._persist([(table, updated)])
+            getattr(self, table)[record_id] = updated
+            self._invalidate_rows(table, record_id)
+            if table == "customers":
+                self.customer_search.put(updated)
+            return updated
+
+    def delete_record(self, table: str, record_id: str):
+        with self.lock:
+            if record_id in getattr(self, table):
+                self._persist([], deletes=[(table, record_id)])
+                del getattr(self, table)[record_id]
+                self._invalidate_rows(table, record_id)
+                if table == "customers":
+                    self.customer_search.remove(record_id)
+
+    def _invalidate_rows(self, table: str, record_id: str):
+        """Drops the display rows showing a changed customer or provider."""
+        if table == "customers":
+            self.display_rows.invalidate_customer(record_id)
+        elif table == "providers":
+            self.display_rows.invalidate_provider(record_id)
+
+
+_store: Optional[DataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DataStore:
+    """The process-wide store, created on first use from DATA_STORE_BACKEND."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = get_backend(os.getenv("DATA_STORE_BACKEND", "memory"))
+                _store = DataStore(backend)
+    return _store
+
+
+async def preload_store():
+    """Lifespan task: builds the store in a worker thread as the server
+    starts, so the first request does not wait for the load. Imports and
+    CLI commands never run it; if it fails, the first request retries
+    and reports the error."""
+    try:
+        await asyncio.to_thread(get_store)
+    except Exception:
+        logging.exception("Preloading the data store failed.")
\ No newline at end of file
@@ -0,0 +1,255 @@
+import uuid
+from datetime import datetime, time, timedelta
+from itertools import islice
+from app.models import (
+    Business,
+    Department,
+    Provider,
+    Customer,
+    Slot,
+    Appointment,
+    AvailabilityConfig,
+    HistoryLog,
+)
+from app.store.availability_rules import Rule
+from app.store.availability_versions import AvailabilityVersions
+from app.store.slot_engine import (
+    BOOKING_HORIZON_DAYS,
+    DEFAULT_SLOT_PRICE_CENTS,
+    expand_slots,
+)
+
+business_id = str(uuid.uuid4())
+dept_med_id = str(uuid.uuid4())
+dept_dental_id = str(uuid.uuid4())
+provider1_id = str(uuid.uuid4())
+provider2_id = str(uuid.uuid4())
+provider3_id = str(uuid.uuid4())
+cust1_id = str(uuid.uuid4())
+cust2_id = str(uuid.uuid4())
+cust3_id = str(uuid.uuid4())
+mock_business = Business(
+    id=business_id,
+    legal_name="Wellness Group Inc.",
+    display_name="Wellness Group",
+    logo_url="/placeholder.svg",
+    registration_number="U12345ABC67890",
+    gstn="29ABCDE1234F1Z5",
+    address="123 Health St, Med-City, 12345",
+    contact_mobile="+1-202-555-0175",
+    contact_email="contact@wellness.com",
+    created_at=datetime.now(),
+    updated_at=datetime.now(),
+)
+mock_departments = [
+    Department(
+        id=dept_med_id,
+        business_id=business_id,
+        name="General Medicine",
+        description="Consultations and general health check-ups.",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    Department(
+        id=dept_dental_id,
+        business_id=business_id,
+        name="Dental Care",
+        description="Routine dental check-ups, cleaning, and treatments.",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+]
+mock_providers = [
+    Provider(
+        id=provider1_id,
+        name="Dr. Alice Williams",
+        department_ids=[dept_med_id],
+        status="Active",
+        bio="15 years of experience in general medicine.",
+        contact_mobile="555-0101",
+        contact_email="alice.w@wellness.com",
+        slot_price_cents=5000,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    Provider(
+        id=provider2_id,
+        name="Dr. Bob Brown",
+        department_ids=[dept_dental_id],
+        status="Active",
+        bio="Specialist in cosmetic dentistry.",
+        contact_mobile="555-0102",
+        contact_email="bob.b@wellness.com",
+        slot_price_cents=None,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    Provider(
+        id=provider3_id,
+        name="Dr. Charlie Davis",
+        department_ids=[dept_med_id, dept_dental_id],
+        status="Inactive",
+        bio="General practitioner, currently on leave.",
+        contact_mobile="555-0103",
+        contact_email="charlie.d@wellness.com",
+        slot_price_cents=None,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+]
+mock_customers = [
+    Customer(
+        id=cust1_id,
+        full_name="John Smith",
+        mobile="555-0111",
+        email="john.smith@example.com",
+        location="Downtown",
+        age=34,
+        gender="Male",
+        address="123 Main St",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    Customer(
+        id=cust2_id,
+        full_name="Jane Doe",
+        mobile="555-0112",
+        email="jane.doe@example.com",
+        location="Uptown",
+        age=28,
+        gender="Female",
+        address="456 Oak Ave",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    Customer(
+        id=cust3_id,
+        full_name="Peter Jones",
+        mobile="555-0113",
+        email="peter.jones@example.com",
+        location="Midtown",
+        age=45,
+        gender="Male",
+        address="789 Pine Ln",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+]
+# (provider id, "YYYY-MM") -> the availability saved for that month
+mock_availability_configs = {
+    (provider1_id, "2024-07"): AvailabilityConfig(
+        id=str(uuid.uuid4()),
+        provider_id=provider1_id,
+        month="2024-07",
+        weekly_template={
+            1: [(time(9, 0), time(12, 0)), (time(13, 0), time(17, 0))],
+            2: [(time(9, 0), time(12, 0)), (time(13, 0), time(17, 0))],
+            3: [(time(9, 0), time(12, 0))],
+            4: [(time(9, 0), time(12, 0)), (time(13, 0), time(17, 0))],
+            5: [(time(9, 0), time(13, 0))],
+        },
+        exceptions={},
+        holiday_calendar=None,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+    (provider2_id, "2024-07"): AvailabilityConfig(
+        id=str(uuid.uuid4()),
+        provider_id=provider2_id,
+        month="2024-07",
+        weekly_template={
+            0: [(time(10, 0), time(15, 0))],
+            1: [(time(14, 0), time(18, 0))],
+            3: [
+                (time(10, 0), time(14, 0)),
+                Rule(
+                    time(14, 0),
+                    time(18, 0),
+                    timedelta(minutes=45),
+                    timedelta(minutes=15),
+                    9000,
+                ),
+            ],
+            5: [(time(10, 0), time(14, 0))],
+        },
+        exceptions={},
+        holiday_calendar=None,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ),
+}
+
+
+def create_appointment(tables: dict, slot: Slot, customer_id: str, status: str):
+    appointment_id = str(uuid.uuid4())
+    appointment = Appointment(
+        id=appointment_id,
+        slot_id=slot["id"],
+        provider_id=slot["provider_id"],
+        customer_id=customer_id,
+        status=status,
+        created_at=datetime.now() - timedelta(days=5),
+        updated_at=datetime.now() - timedelta(days=5),
+        notes=f"This is a {status.lower()} appointment.",
+    )
+    tables["slots"].append(dict(slot, is_booked=True))
+    tables["appointments"].append(appointment)
+    tables["history_logs"].append(
+        HistoryLog(
+            id=str(uuid.uuid4()),
+            appointment_id=appointment_id,
+            action="create",
+            performed_by="System",
+            user_type="System",
+            timestamp=appointment["created_at"],
+            new_status=status,
+            details="Appointment created",
+        )
+    )
+
+
+def mock_slot_price(provider_id: str) -> int:
+    provider = next(p for p in mock_providers if p["id"] == provider_id)
+    price_cents = provider["slot_price_cents"]
+    return DEFAULT_SLOT_PRICE_CENTS if price_cents is None else price_cents
+
+
+def first_available_slots(provider_id: str, count: int) -> list[Slot]:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    versions = AvailabilityVersions(mock_availability_configs.values())
+    slots = expand_slots(
+        provider_id,
+        versions.for_day(provider_id, today.date()),
+        today + timedelta(minutes=1),
+        today + timedelta(days=BOOKING_HORIZON_DAYS),
+        mock_slot_price(provider_id),
+    )
+    return list(islice(slots, count))
+
+
+def mock_tables() -> dict:
+    """The mock dataset in the shape DataStore loads from a backend.
+
+    The demo bookings are placed on the first free slots from today, so
+    they are built on each call (MemoryBackend.load, once per process)
+    rather than when the module is imported.
+    """
+    tables = {
+        "businesses": [mock_business],
+        "departments": mock_departments,
+        "providers": mock_providers,
+        "customers": mock_customers,
+        "slots": [],
+        "appointments": [],
+        "availability_configs": list(mock_availability_configs.values()),
+        "history_logs": [],
+    }
+    available_slots_p1 = first_available_slots(provider1_id, 3)
+    available_slots_p2 = first_available_slots(provider2_id, 1)
+    if len(available_slots_p1) > 2:
+        create_appointment(tables, available_slots_p1[0], cust1_id, "Pending")
+        create_appointment(tables, available_slots_p1[1], cust2_id, "Confirmed")
+        create_appointment(tables, available_slots_p1[2], cust3_id, "Completed")
+    if len(available_slots_p2) > 0:
+        create_appointment(tables, available_slots_p2[0], cust1_id, "No-Show")
+    return tables
\ No newline at end of file
@@ -0,0 +1,770 @@
+import uuid
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping, Sequence, ValuesView
+from datetime import datetime, timedelta
+from typing import Hashable, Iterable, Iterator, Optional
+from app.models import Appointment, HistoryLog, Slot
+from app.store.slot_engine import slot_id_for
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+MICROSECOND = timedelta(microseconds=1)
+_LOW_64 = (1 << 64) - 1
+# slot start of an appointment whose slot id is not a `provider@stamp` id
+NO_START = -(2**31)
+
+
+def to_minutes(when: datetime) -> int:
+    return (when - EPOCH) // MINUTE
+
+
+def from_minutes(minutes: int) -> datetime:
+    return EPOCH + timedelta(minutes=minutes)
+
+
+def to_micros(when: datetime) -> int:
+    return (when - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def _stamp_minutes(stamp: str) -> Optional[int]:
+    """Epoch minutes of a slot id's YYYYmmddHHMM stamp."""
+    if len(stamp) != 12 or not stamp.isdigit():
+        return None
+    try:
+        when = datetime(
+            int(stamp[:4]),
+            int(stamp[4:6]),
+            int(stamp[6:8]),
+            int(stamp[8:10]),
+            int(stamp[10:]),
+        )
+    except ValueError:
+        return None
+    return to_minutes(when)
+
+
+class Interner:
+    """Small int codes for values that repeat across rows (ids, statuses)."""
+
+    def __init__(self):
+        self.values: list = []
+        self._codes: dict = {}
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class TextColumn:
+    """Optional free text per row, UTF-8 encoded into one buffer.
+
+    A row is an offset and a length into the buffer (length -1 for None),
+    12 bytes plus the encoded text where a str costs ~50 bytes over its
+    characters. Changed text is appended and the old bytes left behind;
+    the buffer is compacted once they are over half of it.
+    """
+
+    NONE = -1
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("q")
+        self._lengths = array("i")
+        self._garbage = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _encode(self, text: Optional[str]) -> tuple[int, int]:
+        if text is None:
+            return len(self._data), self.NONE
+        encoded = text.encode()
+        offset = len(self._data)
+        self._data += encoded
+        return offset, len(encoded)
+
+    def append(self, text: Optional[str]):
+        offset, length = self._encode(text)
+        self._offsets.append(offset)
+        self._lengths.append(length)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        length = self._lengths[row]
+        if length == self.NONE:
+            return None
+        offset = self._offsets[row]
+        return self._data[offset : offset + length].decode()
+
+    def __setitem__(self, row: int, text: Optional[str]):
+        if self[row] == text:
+            return
+        self._garbage += max(self._lengths[row], 0)
+        self._offsets[row], self._lengths[row] = self._encode(text)
+        if self._garbage * 2 > len(self._data):
+            self._compact()
+
+    def _compact(self):
+        texts = [self[row] for row in range(len(self))]
+        self._data = bytearray()
+        self._garbage = 0
+        for row, text in enumerate(texts):
+            self._offsets[row], self._lengths[row] = self._encode(text)
+
+    def take(self, rows: Iterable[int]) -> "TextColumn":
+        """A new column of the given rows' texts, in that order."""
+        column = TextColumn()
+        for row in rows:
+            column.append(self[row])
+        return column
+
+
+class _ProviderSlots:
+    """One provider's stored slots as parallel columns sorted by start."""
+
+    __slots__ = ("starts", "ends", "prices", "booked", "created", "updated")
+
+    def __init__(self):
+        self.starts = array("i")
+        self.ends = array("i")
+        self.prices = array("i")
+        self.booked = bytearray()
+        self.created = array("q")
+        self.updated = array("q")
+
+    def slot(
+        self, provider_id: str, position: int, slot_id: Optional[str] = None
+    ) -> Slot:
+        start = from_minutes(self.starts[position])
+        return Slot(
+            id=slot_id or slot_id_for(provider_id, start),
+            provider_id=provider_id,
+            start_datetime=start,
+            end_datetime=from_minutes(self.ends[position]),
+            price_cents=self.prices[position],
+            is_booked=bool(self.booked[position]),
+            calendar_month=f"{start.year:04d}-{start.month:02d}",
+            created_at=from_micros(self.created[position]),
+            updated_at=from_micros(self.updated[position]),
+        )
+
+    def put(self, position: int, slot: Slot, insert: bool):
+        values = (
+            to_minutes(slot["start_datetime"]),
+            to_minutes(slot["end_datetime"]),
+            slot["price_cents"],
+            1 if slot["is_booked"] else 0,
+            to_micros(slot["created_at"]),
+            to_micros(slot["updated_at"]),
+        )
+        for column, value in zip(self._columns(), values):
+            if insert:
+                column.insert(position, value)
+            else:
+                column[position] = value
+
+    def delete(self, position: int):
+        for column in self._columns():
+            del column[position]
+
+    def _columns(self) -> tuple:
+        return (
+            self.starts,
+            self.ends,
+            self.prices,
+            self.booked,
+            self.created,
+            self.updated,
+        )
+
+
+class _SlotValues(ValuesView):
+    def __iter__(self) -> Iterator[Slot]:
+        return self._mapping.iter_slots()
+
+
+class SlotTable(MutableMapping):
+    """Stored slots keyed by their deterministic `provider@YYYYmmddHHMM` id.
+
+    Each provider's slots are parallel int columns sorted by start (epoch
+    minutes for start/end, epoch microseconds for the timestamps), about
+    30 bytes a slot. The id and calendar month are derived from provider
+    and start, so no per-slot Python objects are kept; Slot dicts are
+    built on read.
+    """
+
+    def __init__(self):
+        self._providers: dict[str, _ProviderSlots] = {}
+        self._count = 0
+
+    @classmethod
+    def build(cls, slots: Iterable[Slot]) -> "SlotTable":
+        table = cls()
+        for slot in sorted(slots, key=lambda s: s["start_datetime"]):
+            columns = table._providers.get(slot["provider_id"])
+            if columns is None or not columns.starts:
+                table[slot["id"]] = slot
+            elif to_minutes(slot["start_datetime"]) > columns.starts[-1]:
+                # in start order, so a new slot goes last
+                columns.put(len(columns.starts), slot, insert=True)
+                table._count += 1
+            else:
+                table[slot["id"]] = slot
+        return table
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _locate(self, slot_id: str) -> Optional[tuple[_ProviderSlots, int, str]]:
+        provider_id, _, stamp = slot_id.rpartition("@")
+        columns = self._providers.get(provider_id)
+        minutes = _stamp_minutes(stamp) if columns else None
+        if minutes is None:
+            return None
+        position = bisect_left(columns.starts, minutes)
+        if position < len(columns.starts) and columns.starts[position] == minutes:
+            return columns, position, provider_id
+        return None
+
+    def __getitem__(self, slot_id: str) -> Slot:
+        found = self._locate(slot_id)
+        if found is None:
+            raise KeyError(slot_id)
+        columns, position, provider_id = found
+        return columns.slot(provider_id, position, slot_id)
+
+    def get(self, slot_id: str, default=None) -> Optional[Slot]:
+        found = self._locate(slot_id)
+        if found is None:
+            return default
+        columns, position, provider_id = found
+        return columns.slot(provider_id, position, slot_id)
+
+    def __contains__(self, slot_id) -> bool:
+        return isinstance(slot_id, str) and self._locate(slot_id) is not None
+
+    def __setitem__(self, slot_id: str, slot: Slot):
+        if slot_id != slot_id_for(slot["provider_id"], slot["start_datetime"]):
+            raise ValueError(f"Slot id {slot_id!r} does not match its start.")
+        columns = self._providers.get(slot["provider_id"])
+        if columns is None:
+            columns = self._providers[slot["provider_id"]] = _ProviderSlots()
+        minutes = to_minutes(slot["start_datetime"])
+        position = bisect_left(columns.starts, minutes)
+        exists = position < len(columns.starts) and columns.starts[position] == minutes
+        columns.put(position, slot, insert=not exists)
+        if not exists:
+            self._count += 1
+
+    def __delitem__(self, slot_id: str):
+        found = self._locate(slot_id)
+        if found is None:
+            raise KeyError(slot_id)
+        columns, position, _ = found
+        columns.delete(position)
+        self._count -= 1
+
+    def __iter__(self) -> Iterator[str]:
+        for provider_id, columns in self._providers.items():
+            for minutes in columns.starts:
+                yield slot_id_for(provider_id, from_minutes(minutes))
+
+    def values(self) -> _SlotValues:
+        return _SlotValues(self)
+
+    def iter_slots(self) -> Iterator[Slot]:
+        for provider_id, columns in self._providers.items():
+            for position in range(len(columns.starts)):
+                yield columns.slot(provider_id, position)
+
+    def between(self, provider_id: str, start: datetime, end: datetime) -> list[Slot]:
+        """The provider's stored slots starting in [start, end), in time order."""
+        columns = self._providers.get(provider_id)
+        if columns is None:
+            return []
+        # starts are whole minutes: the first at or after start, the last
+        # before end
+        lo = bisect_left(columns.starts, -((EPOCH - start) // MINUTE))
+        hi = bisect_left(columns.starts, to_minutes(end - MICROSECOND) + 1, lo)
+        return [columns.slot(provider_id, position) for position in range(lo, hi)]
+
+
+class UuidKeys:
+    """String keys numbered 0, 1, 2... in insertion order.
+
+    Canonical lowercase UUID keys are kept as their 128-bit values in two
+    uint64 columns, found through an open-addressing table of row numbers
+    (linear probing, at most 2/3 full), so a key costs 22-28 bytes and no
+    Python objects, where a dict of id strings to rows costs ~170. Any
+    other key, uppercase or not a UUID at all, is kept as given in a dict,
+    so every key reads back exactly as it was added.
+    """
+
+    EMPTY = -1
+    DELETED = -2
+
+    def __init__(self):
+        self.hi = array("Q")
+        self.lo = array("Q")
+        self._table = array("i", [self.EMPTY]) * 8
+        self._used = 0
+        self._len = 0
+        # rows of the keys that are not canonical UUIDs, both ways
+        self._other_rows: dict[str, int] = {}
+        self._other_keys: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self._len
+
+    def key(self, row: int) -> str:
+        if self._other_keys and row in self._other_keys:
+            return self._other_keys[row]
+        digits = f"{self.hi[row]:016x}{self.lo[row]:016x}"
+        return (
+            f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+        )
+
+    def _find(self, hi: int, lo: int) -> int:
+        """The table position holding the key, or the first free one."""
+        table = self._table
+        mask = len(table) - 1
+        position = (hi ^ lo) & mask
+        free = None
+        while True:
+            row = table[position]
+            if row == self.EMPTY:
+                return position if free is None else free
+            if row == self.DELETED:
+                if free is None:
+                    free = position
+            elif self.lo[row] == lo and self.hi[row] == hi:
+                return position
+            position = (position + 1) & mask
+
+    def get(self, key: str) -> Optional[int]:
+        value = _uuid_int(key)
+        if value is None:
+            return self._other_rows.get(key) if isinstance(key, str) else None
+        row = self._table[self._find(value >> 64, value & _LOW_64)]
+        return row if row >= 0 else None
+
+    def add(self, key: str) -> int:
+        """Numbers a key that is not present yet; returns its row."""
+        row = len(self.hi)
+        value = _uuid_int(key)
+        if value is None:
+            if not isinstance(key, str):
+                raise ValueError(f"Not a string key: {key!r}.")
+            self._other_rows[key] = row
+            self._other_keys[row] = key
+            self.hi.append(0)
+            self.lo.append(0)
+            self._len += 1
+            return row
+        if (self._used + 1) * 3 > len(self._table) * 2:
+            self._resize()
+        hi, lo = value >> 64, value & _LOW_64
+        position = self._find(hi, lo)
+        if self._table[position] == self.EMPTY:
+            self._used += 1
+        self.hi.append(hi)
+        self.lo.append(lo)
+        self._table[position] = row
+        self._len += 1
+        return row
+
+    def pop(self, key: str) -> Optional[int]:
+        """Drops a key; its row number is not reused until `compact`."""
+        value = _uuid_int(key)
+        if value is None:
+            if not isinstance(key, str) or key not in self._other_rows:
+                return None
+            row = self._other_rows.pop(key)
+            del self._other_keys[row]
+            self._len -= 1
+            return row
+        position = self._find(value >> 64, value & _LOW_64)
+        row = self._table[position]
+        if row < 0:
+            return None
+        self._table[position] = self.DELETED
+        self._len -= 1
+        return row
+
+    def compact(self, rows: Sequence[int]):
+        """Keeps only the keys of `rows`, renumbered 0, 1, 2... in the
+        given order."""
+        self.hi = array("Q", [self.hi[row] for row in rows])
+        self.lo = array("Q", [self.lo[row] for row in rows])
+        others = {
+            new: self._other_keys[old]
+            for new, old in enumerate(rows)
+            if old in self._other_keys
+        }
+        self._other_keys = others
+        self._other_rows = {key: row for row, key in others.items()}
+        self._len = len(rows)
+        self._rehash(row for row in range(len(rows)) if row not in others)
+
+    def _resize(self):
+        """Rehashes the live rows, dropping deleted markers, into a table at
+        most a third full."""
+        self._rehash([row for row in self._table if row >= 0])
+
+    def _rehash(self, rows: Iterable[int]):
+        rows = list(rows)
+        capacity = 8
+        while capacity <= (len(rows) + 1) * 3:
+            capacity *= 2
+        self._table = array("i", [self.EMPTY]) * capacity
+        for row in rows:
+            self._table[self._find(self.hi[row], self.lo[row])] = row
+        self._used = len(rows)
+
+
+_UUID_CHARS = frozenset("0123456789abcdef-")
+
+
+def _uuid_int(key) -> Optional[int]:
+    """The 128-bit value of a canonical UUID string, lowercase 8-4-4-4-12
+    hex, which formats back to the same string; None for any other key."""
+    if not isinstance(key, str) or len(key) != 36:
+        return None
+    if key[8] != "-" or key[13] != "-" or key[18] != "-" or key[23] != "-":
+        return None
+    if key.count("-") != 4 or not _UUID_CHARS.issuperset(key):
+        return None
+    return int(key.replace("-", ""), 16)
+
+
+class _AppointmentValues(ValuesView):
+    def __iter__(self) -> Iterator[Appointment]:
+        return self._mapping.iter_appointments()
+
+
+class AppointmentTable(MutableMapping):
+    """Appointments as parallel columns, one row per appointment.
+
+    The id is stored as its 128-bit UUID value and found through UuidKeys;
+    provider, customer and status are interned codes, the slot id is its
+    provider code plus epoch-minute start, and the timestamps are epoch
+    microseconds, so a row is ~110 bytes with its key plus the text of its
+    notes. Notes are free text, so they go to a TextColumn rather than the
+    interner, where deleted or edited notes would pile up. Live rows are
+    also listed per provider and per slot provider and month, so the
+    provider queries read only that provider's rows and a month's booked
+    slots only that month's. Deleted rows are dropped once they are half
+    of the table. Appointment dicts are built on read.
+    """
+
+    def __init__(self):
+        self._keys = UuidKeys()
+        # rows of deleted appointments, renumbered away by _compact
+        self._gone: set[int] = set()
+        self._refs = Interner()
+        self._provider = array("i")
+        self._customer = array("i")
+        self._slot_provider = array("i")
+        self._slot_start = array("i")
+        self._status = array("i")
+        self._notes = TextColumn()
+        self._created = array("q")
+        self._updated = array("q")
+        self._provider_rows: dict[int, array] = {}
+        # (slot provider, slot month) -> rows
+        self._slot_rows: dict[tuple[int, int], array] = {}
+
+    @classmethod
+    def build(cls, appointments: Iterable[Appointment]) -> "AppointmentTable":
+        table = cls()
+        for appointment in appointments:
+            table[appointment["id"]] = appointment
+        return table
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _columns(self) -> tuple:
+        return (
+            self._provider,
+            self._customer,
+            self._slot_provider,
+            self._slot_start,
+            self._status,
+            self._notes,
+            self._created,
+            self._updated,
+        )
+
+    def _slot_key(self, row: int) -> tuple[int, int]:
+        return self._slot_provider[row], _month_key(self._slot_start[row])
+
+    def _slot_id(self, row: int) -> str:
+        slot_ref = self._refs.values[self._slot_provider[row]]
+        if self._slot_start[row] == NO_START:
+            return slot_ref
+        return slot_id_for(slot_ref, from_minutes(self._slot_start[row]))
+
+    def _appointment(
+        self, row: int, appointment_id: Optional[str] = None
+    ) -> Appointment:
+        refs = self._refs.values
+        return Appointment(
+            id=appointment_id or self._keys.key(row),
+            slot_id=self._slot_id(row),
+            provider_id=refs[self._provider[row]],
+            customer_id=refs[self._customer[row]],
+            status=refs[self._status[row]],
+            notes=self._notes[row],
+            created_at=from_micros(self._created[row]),
+            updated_at=from_micros(self._updated[row]),
+        )
+
+    def __getitem__(self, appointment_id: str) -> Appointment:
+        row = self._keys.get(appointment_id)
+        if row is None:
+            raise KeyError(appointment_id)
+        return self._appointment(row, appointment_id)
+
+    def get(self, appointment_id: str, default=None) -> Optional[Appointment]:
+        row = self._keys.get(appointment_id)
+        return default if row is None else self._appointment(row, appointment_id)
+
+    def __contains__(self, appointment_id) -> bool:
+        return self._keys.get(appointment_id) is not None
+
+    def __setitem__(self, appointment_id: str, appointment: Appointment):
+        slot_provider, _, stamp = appointment["slot_id"].rpartition("@")
+        slot_start = _stamp_minutes(stamp)
+        if slot_start is None:
+            # e.g. the raw UUID of a slot row that no longer exists
+            slot_provider, slot_start = appointment["slot_id"], NO_START
+        code = self._refs.code
+        values = (
+            code(appointment["provider_id"]),
+            code(appointment["customer_id"]),
+            code(slot_provider),
+            slot_start,
+            code(appointment["status"]),
+            appointment.get("notes"),
+            to_micros(appointment["created_at"]),
+            to_micros(appointment["updated_at"]),
+        )
+        row = self._keys.get(appointment_id)
+        if row is None:
+            row = self._keys.add(appointment_id)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+            _add_row(self._provider_rows, values[0], row)
+            _add_row(self._slot_rows, (values[2], _month_key(slot_start)), row)
+            return
+        if self._provider[row] != values[0]:
+            _move_row(self._provider_rows, self._provider[row], values[0], row)
+        slot_key = (values[2], _month_key(slot_start))
+        if self._slot_key(row) != slot_key:
+            _move_row(self._slot_rows, self._slot_key(row), slot_key, row)
+        for column, value in zip(self._columns(), values):
+            column[row] = value
+
+    def __delitem__(self, appointment_id: str):
+        row = self._keys.pop(appointment_id)
+        if row is None:
+            raise KeyError(appointment_id)
+        self._gone.add(row)
+        self._notes[row] = None
+        _move_row(self._provider_rows, self._provider[row], None, row)
+        _move_row(self._slot_rows, self._slot_key(row), None, row)
+        if len(self._gone) * 2 > len(self._keys.hi):
+            self._compact()
+
+    def _compact(self):
+        """Drops the deleted rows, renumbering the live ones in order, once
+        they are over half of the rows."""
+        keep = [row for row in range(len(self._keys.hi)) if row not in self._gone]
+        renumbered = dict(zip(keep, range(len(keep))))
+        self._keys.compact(keep)
+        for name in _APPOINTMENT_INT_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[row] for row in keep]))
+        self._notes = self._notes.take(keep)
+        for index in (self._provider_rows, self._slot_rows):
+            for key, rows in index.items():
+                index[key] = array("i", [renumbered[row] for row in rows])
+        self._gone = set()
+
+    def _live_rows(self) -> Iterator[int]:
+        return (row for row in range(len(self._keys.hi)) if row not in self._gone)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._keys.key(row) for row in self._live_rows())
+
+    def values(self) -> _AppointmentValues:
+        return _AppointmentValues(self)
+
+    def iter_appointments(self) -> Iterator[Appointment]:
+        return (self._appointment(row) for row in self._live_rows())
+
+    def provider_has_status(self, provider_id: str, statuses: Iterable[str]) -> bool:
+        """Whether any appointment of the provider is in one of `statuses`,
+        checked on the provider's status codes without building rows."""
+        rows = self._provider_rows.get(self._refs.find(provider_id), ())
+        codes = {self._refs.find(status) for status in statuses} - {None}
+        status = self._status
+        return any(status[row] in codes for row in rows)
+
+    def slot_ids_between(
+        self, provider_id: str, start: datetime, end: datetime
+    ) -> set[str]:
+        """Ids of the provider's slots starting in [start, end) that an
+        appointment in any status refers to, read from the slot columns of
+        the appointments on the provider's slots in the months of the
+        range."""
+        provider = self._refs.find(provider_id)
+        lo, hi = to_minutes(start), to_minutes(end)
+        if provider is None or lo >= hi:
+            return set()
+        slot_start = self._slot_start
+        return {
+            self._slot_id(row)
+            for month in range(_month_key(lo), _month_key(hi - 1) + 1)
+            for row in self._slot_rows.get((provider, month), ())
+            if lo <= slot_start[row] < hi
+        }
+
+
+class HistoryLogTable(Sequence):
+    """The append-only history log as columns: ids as 16-byte UUIDs, the
+    fields that repeat (action, who, statuses) as interned codes and the
+    timestamp in epoch microseconds, ~50 bytes a row. Ids that are not
+    canonical UUIDs are kept as given beside them, and the free-text
+    details go to a TextColumn. HistoryLog dicts are built on read."""
+
+    def __init__(self):
+        self._ids = bytearray()
+        self._appointment_ids = bytearray()
+        # row -> id, for the ids that are not canonical UUIDs
+        self._other_ids: dict[int, str] = {}
+        self._other_appointment_ids: dict[int, str] = {}
+        self._text = Interner()
+        # action, performed_by, user_type, old_status, new_status
+        self._fields = tuple(array("i") for _ in _LOG_CODED_FIELDS)
+        self._details = TextColumn()
+        self._timestamps = array("q")
+
+    @classmethod
+    def build(cls, logs: Iterable[HistoryLog]) -> "HistoryLogTable":
+        table = cls()
+        for log in logs:
+            table.append(log)
+        return table
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append(self, log: HistoryLog):
+        row = len(self)
+        _append_id(self._ids, self._other_ids, row, log["id"])
+        _append_id(
+            self._appointment_ids,
+            self._other_appointment_ids,
+            row,
+            log["appointment_id"],
+        )
+        for column, name in zip(self._fields, _LOG_CODED_FIELDS):
+            column.append(self._text.code(log.get(name)))
+        self._details.append(log.get("details"))
+        self._timestamps.append(to_micros(log["timestamp"]))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        text = self._text.values
+        log = HistoryLog(
+            id=_read_id(self._ids, self._other_ids, index),
+            appointment_id=_read_id(
+                self._appointment_ids, self._other_appointment_ids, index
+            ),
+            timestamp=from_micros(self._timestamps[index]),
+        )
+        for column, name in zip(self._fields, _LOG_CODED_FIELDS):
+            log[name] = text[column[index]]
+        log["details"] = self._details[index]
+        return log
+
+
+_LOG_CODED_FIELDS = (
+    "action",
+    "performed_by",
+    "user_type",
+    "old_status",
+    "new_status",
+)
+_APPOINTMENT_INT_COLUMNS = (
+    "_provider",
+    "_customer",
+    "_slot_provider",
+    "_slot_start",
+    "_status",
+    "_created",
+    "_updated",
+)
+
+
+def _append_id(column: bytearray, others: dict[int, str], row: int, key: str):
+    """Appends the id's 16 bytes, or zeros with the id kept in `others` if
+    it is not a canonical UUID."""
+    value = _uuid_int(key)
+    if value is None:
+        others[row] = key
+        value = 0
+    column += value.to_bytes(16, "big")
+
+
+def _read_id(column: bytearray, others: dict[int, str], row: int) -> str:
+    if others and row in others:
+        return others[row]
+    offset = row * 16
+    return str(uuid.UUID(bytes=bytes(column[offset : offset + 16])))
+
+
+def _month_key(minutes: int) -> int:
+    """The month of an epoch-minute start as year * 12 + month - 1, or
+    NO_START for an appointment whose slot has no start."""
+    if minutes == NO_START:
+        return NO_START
+    when = from_minutes(minutes)
+    return when.year * 12 + when.month - 1
+
+
+def _add_row(index: dict[Hashable, array], key: Hashable, row: int):
+    rows = index.get(key)
+    if rows is None:
+        rows = index[key] = array("i")
+    rows.append(row)
+
+
+def _move_row(
+    index: dict[Hashable, array], old: Hashable, new: Optional[Hashable], row: int
+):
+    """Moves a row from one key's list to another's, or drops it when
+    `new` is None."""
+    rows = index[old]
+    rows.remove(row)
+    if not rows:
+        del index[old]
+    if new is not None:
+        _add_row(index, new, row)
\ No newline at end of file
@@ -0,0 +1,241 @@
+import numpy as np
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional
+from app.models import Appointment, DailyRollup, Slot
+from app.store.availability_rules import rules_for
+from app.store.availability_versions import AvailabilityVersions
+from app.store.records import Interner, from_micros, to_micros
+from app.store.slot_engine import slots_offered_on
+
+ROLLUP_COUNTERS = (
+    "booked_slots",
+    "available_slots",
+    "completed",
+    "cancelled",
+    "no_shows",
+    "revenue_cents",
+)
+_STATUS_COUNTERS = {
+    "Completed": "completed",
+    "Cancelled": "cancelled",
+    "No-Show": "no_shows",
+}
+# (provider_id, day, status, appointment count, summed slot price)
+Activity = tuple[str, date, str, int, int]
+
+
+def rollup_id(provider_id: str, day: date) -> str:
+    return f"{provider_id}@{day:%Y%m%d}"
+
+
+def status_counters(status: str, count: int, price_cents: int) -> dict[str, int]:
+    """What `count` appointments in `status`, worth `price_cents` together,
+    add to their day's rollup."""
+    counters = dict.fromkeys(ROLLUP_COUNTERS, 0)
+    if status != "Cancelled":
+        counters["booked_slots"] = count
+        counters["available_slots"] = -count
+    if status in _STATUS_COUNTERS:
+        counters[_STATUS_COUNTERS[status]] = count
+    if status == "Completed":
+        counters["revenue_cents"] = price_cents
+    return counters
+
+
+def rollup_deltas(
+    changes: Iterable[tuple[Appointment, Optional[Slot], int]],
+) -> dict[tuple[str, date], dict[str, int]]:
+    """Net counter changes per (provider_id, day) when each appointment
+    leaves (-1) or enters (+1) its state; unchanged counters are dropped."""
+    deltas: dict[tuple[str, date], dict[str, int]] = {}
+    for appointment, slot, sign in changes:
+        if not slot:
+            continue
+        key = (appointment["provider_id"], slot["start_datetime"].date())
+        totals = deltas.setdefault(key, dict.fromkeys(ROLLUP_COUNTERS, 0))
+        counters = status_counters(appointment["status"], 1, slot["price_cents"])
+        for name, n in counters.items():
+            totals[name] += sign * n
+    return {
+        key: {name: n for name, n in totals.items() if n}
+        for key, totals in deltas.items()
+        if any(totals.values())
+    }
+
+
+def new_rollup(
+    business_id: str, provider_id: str, day: date, offered: int, now: datetime
+) -> DailyRollup:
+    return DailyRollup(
+        id=rollup_id(provider_id, day),
+        business_id=business_id,
+        provider_id=provider_id,
+        day=day,
+        booked_slots=0,
+        available_slots=offered,
+        completed=0,
+        cancelled=0,
+        no_shows=0,
+        revenue_cents=0,
+        updated_at=now,
+    )
+
+
+def add_counters(
+    rollup: DailyRollup, deltas: dict[str, int], now: datetime
+) -> DailyRollup:
+    return dict(
+        rollup,
+        **{name: rollup[name] + n for name, n in deltas.items()},
+        updated_at=now,
+    )
+
+
+def build_rollups(
+    activity: Iterable[Activity],
+    availability: AvailabilityVersions,
+    business_of: Callable[[str], str],
+    first_day: date,
+    last_day: date,
+    now: Optional[datetime] = None,
+) -> list[DailyRollup]:
+    """Computes every rollup from scratch.
+
+    Each provider gets a row for every day in [first_day, last_day] its
+    availability offers slots on, and for every day it has appointments.
+    """
+    now = now or datetime.now()
+    rows: dict[tuple[str, date], DailyRollup] = {}
+
+    def row(provider_id: str, day: date) -> DailyRollup:
+        if (provider_id, day) not in rows:
+            config = availability.for_day(provider_id, day)
+            offered = slots_offered_on(config, day) if config else 0
+            rows[provider_id, day] = new_rollup(
+                business_of(provider_id), provider_id, day, offered, now
+            )
+        return rows[provider_id, day]
+
+    for provider_id in availability.providers():
+        for config, first, last in availability.spans(provider_id, first_day, last_day):
+            for day, _ in rules_for(config).days(first, last):
+                row(provider_id, day)
+    for provider_id, day, status, count, price_cents in activity:
+        rollup = row(provider_id, day)
+        for name, n in status_counters(status, count, price_cents).items():
+            rollup[name] += n
+    return list(rows.values())
+
+
+class RollupTable:
+    """Daily rollups as columns, one row per provider and day.
+
+    The counters are an int64 matrix with a column per ROLLUP_COUNTERS
+    name, beside int columns for the day (an ordinal), the provider and
+    business (interned codes) and updated_at (epoch microseconds). A
+    report sums its date range per provider with one mask and one int64
+    np.add.at instead of a Python loop over rollup dicts; dicts are built
+    on read.
+    """
+
+    def __init__(self, rollups: Iterable[DailyRollup] = ()):
+        self._providers = Interner()
+        self._businesses = Interner()
+        self._load({rollup["id"]: rollup for rollup in rollups})
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _load(self, rollups: dict[str, DailyRollup]):
+        """Fills the empty table a column at a time."""
+        records = list(rollups.values())
+        self._rows: dict[str, int] = dict(zip(rollups, range(len(records))))
+        self._size = len(records)
+        self._days = np.array([r["day"].toordinal() for r in records], dtype=np.int32)
+        self._provider_codes = np.array(
+            [self._providers.code(r["provider_id"]) for r in records],
+            dtype=np.int32,
+        )
+        self._business_codes = np.array(
+            [self._businesses.code(r["business_id"]) for r in records],
+            dtype=np.int32,
+        )
+        self._updated = np.array(
+            [to_micros(r["updated_at"]) for r in records], dtype=np.int64
+        )
+        self._counters = np.array(
+            [[r[name] for name in ROLLUP_COUNTERS] for r in records],
+            dtype=np.int64,
+        ).reshape(-1, len(ROLLUP_COUNTERS))
+
+    def _reserve(self, size: int):
+        capacity = len(self._days)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        for name in ("_days", "_provider_codes", "_business_codes", "_updated"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+        counters = np.zeros((capacity, len(ROLLUP_COUNTERS)), dtype=np.int64)
+        counters[: self._size] = self._counters[: self._size]
+        self._counters = counters
+
+    def __contains__(self, rollup_id) -> bool:
+        return rollup_id in self._rows
+
+    def get(self, rollup_id: str) -> Optional[DailyRollup]:
+        row = self._rows.get(rollup_id)
+        if row is None:
+            return None
+        counters = self._counters[row].tolist()
+        return DailyRollup(
+            id=rollup_id,
+            business_id=self._businesses.values[self._business_codes[row]],
+            provider_id=self._providers.values[self._provider_codes[row]],
+            day=date.fromordinal(int(self._days[row])),
+            **dict(zip(ROLLUP_COUNTERS, counters)),
+            updated_at=from_micros(int(self._updated[row])),
+        )
+
+    def put(self, rollup: DailyRollup):
+        row = self._rows.get(rollup["id"])
+        if row is None:
+            row = self._rows[rollup["id"]] = self._size
+            self._reserve(self._size + 1)
+            self._size += 1
+        self._days[row] = rollup["day"].toordinal()
+        self._provider_codes[row] = self._providers.code(rollup["provider_id"])
+        self._business_codes[row] = self._businesses.code(rollup["business_id"])
+        self._updated[row] = to_micros(rollup["updated_at"])
+        self._counters[row] = [rollup[name] for name in ROLLUP_COUNTERS]
+
+    def provider_totals(
+        self, first_day: date, last_day: date
+    ) -> dict[str, dict[str, int]]:
+        """Counters summed per provider over first_day..last_day inclusive,
+        for the providers with a rollup in the range.
+
+        Besides ROLLUP_COUNTERS, each total has offered_slots: the booked
+        slots plus each day's open ones, floored at zero per day.
+        """
+        days = self._days[: self._size]
+        rows = np.flatnonzero(
+            (days >= first_day.toordinal()) & (days <= last_day.toordinal())
+        )
+        codes = self._provider_codes[rows]
+        size = len(self._providers.values)
+        counters = self._counters[rows]
+        booked = counters[:, ROLLUP_COUNTERS.index("booked_slots")]
+        available = counters[:, ROLLUP_COUNTERS.index("available_slots")]
+        offered = booked + np.maximum(available, 0)
+        # summed in int64, as bincount's float64 weights could drop cents
+        sums = np.zeros((size, len(ROLLUP_COUNTERS) + 1), dtype=np.int64)
+        np.add.at(sums, codes, np.column_stack([counters, offered]))
+        names = [*ROLLUP_COUNTERS, "offered_slots"]
+        present = np.bincount(codes, minlength=size)
+        return {
+            self._providers.values[code]: dict(zip(names, sums[code].tolist()))
+            for code in np.flatnonzero(present).tolist()
+        }
\ No newline at end of file
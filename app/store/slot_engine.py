@@ -0,0 +1,113 @@
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+from app.models import AvailabilityConfig, Slot
+from app.store.availability_rules import Rule, as_rule, rules_for
+
+DEFAULT_SLOT_PRICE_CENTS = 7500
+BOOKING_HORIZON_DAYS = int(os.getenv("BOOKING_HORIZON_DAYS", "60"))
+SLOT_NAMESPACE = uuid.UUID("6f1c3d2e-8a4b-4c5d-9e7f-0a1b2c3d4e5f")
+
+
+def slot_id_for(provider_id: str, start: datetime) -> str:
+    """Deterministic slot id derived from the provider and the slot start."""
+    return f"{provider_id}@{start:%Y%m%d%H%M}"
+
+
+def parse_slot_id(slot_id: str) -> Optional[tuple[str, datetime]]:
+    provider_id, sep, stamp = slot_id.rpartition("@")
+    if not sep:
+        return None
+    try:
+        return provider_id, datetime.strptime(stamp, "%Y%m%d%H%M")
+    except ValueError:
+        return None
+
+
+def slot_uuid(slot_id: str) -> uuid.UUID:
+    """Stable UUID for a slot id, used as the SlotDB primary key."""
+    return uuid.uuid5(SLOT_NAMESPACE, slot_id)
+
+
+def booking_horizon(now: Optional[datetime] = None) -> tuple[datetime, datetime]:
+    """The [start, end) window in which slots can be offered."""
+    start = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=BOOKING_HORIZON_DAYS)
+
+
+def parse_weekly_template(raw: dict) -> dict[int, list[Rule]]:
+    """Converts a JSON weekly template ({"0": [["09:00:00", "12:00:00"]]}) to
+    rules; an entry may carry a third element of rule options."""
+    return {
+        int(day): [as_rule(entry) for entry in entries]
+        for day, entries in (raw or {}).items()
+    }
+
+
+def slots_offered_on(config: AvailabilityConfig, day: date) -> int:
+    """Slots the provider's template, exceptions and holidays offer on `day`."""
+    return len(rules_for(config).plan(day))
+
+
+def offered_mask(config: AvailabilityConfig, day: date, grid_minutes: int) -> int:
+    """The bitset of the slots the provider's rules offer on `day`, bit i
+    starting i * grid_minutes after midnight."""
+    return rules_for(config).mask(day, grid_minutes)
+
+
+def expand_slots(
+    provider_id: str,
+    config: AvailabilityConfig,
+    start: datetime,
+    end: datetime,
+    price_cents: int,
+) -> Iterator[Slot]:
+    """Yields the provider's offered slots starting in [start, end), in time order.
+
+    Slots are computed from the compiled availability rules on demand;
+    nothing is stored, so the cost is proportional to the queried window.
+    `price_cents` applies to the slots whose rule sets no price.
+    """
+    horizon_start, horizon_end = booking_horizon()
+    start, end = max(start, horizon_start), min(end, horizon_end)
+    stamp = config["updated_at"]
+    for midnight, timed in rules_for(config).day_slots(start, end):
+        # the slot_id_for prefix and the month, formatted once a day
+        prefix = f"{provider_id}@{midnight:%Y%m%d}"
+        month = f"{midnight:%Y-%m}"
+        for slot in timed:
+            slot_start = midnight + slot.offset
+            yield Slot(
+                id=prefix + slot.stamp,
+                provider_id=provider_id,
+                start_datetime=slot_start,
+                end_datetime=slot_start + slot.length,
+                price_cents=(
+                    price_cents if slot.price_cents is None else slot.price_cents
+                ),
+                is_booked=False,
+                calendar_month=month,
+                created_at=stamp,
+                updated_at=stamp,
+            )
+
+
+def materialize_slot(
+    slot_id: str, config: AvailabilityConfig, price_cents: int
+) -> Optional[Slot]:
+    """Builds the slot for a deterministic id if the template offers it."""
+    parsed = parse_slot_id(slot_id)
+    if not parsed:
+        return None
+    provider_id, start = parsed
+    return next(
+        (
+            s
+            for s in expand_slots(
+                provider_id, config, start, start + timedelta(minutes=1), price_cents
+            )
+            if s["id"] == slot_id
+        ),
+        None,
+    )
\ No newline at end of file
@@ -0,0 +1,77 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Iterable, Mapping
+
+ACTIVE_STATUSES = ("Pending", "Confirmed")
+
+
+class ProviderSlotIndex:
+    """Active booked intervals per (customer, provider), kept sorted by start.
+
+    Overlap checks bisect into the sorted start times, so they cost
+    O(log n + k) for k nearby bookings instead of a scan over every
+    appointment. Stored slots themselves are range-queried through the
+    store's SlotTable.
+    """
+
+    def __init__(self):
+        self._booking_starts: dict[tuple[str, str], list[datetime]] = {}
+        self._bookings: dict[tuple[str, str], list[tuple[datetime, datetime, str]]] = {}
+        self._max_booking_span = timedelta(0)
+
+    @classmethod
+    def build(cls, slots: Mapping[str, dict], appointments: Iterable[dict]):
+        """Builds the index from the active appointments on the stored slots."""
+        index = cls()
+        for appt in appointments:
+            if appt["status"] not in ACTIVE_STATUSES:
+                continue
+            slot = slots.get(appt["slot_id"])
+            if slot:
+                index.add_booking(
+                    appt["customer_id"],
+                    appt["provider_id"],
+                    slot["start_datetime"],
+                    slot["end_datetime"],
+                    appt["id"],
+                )
+        return index
+
+    def add_booking(
+        self,
+        customer_id: str,
+        provider_id: str,
+        start: datetime,
+        end: datetime,
+        appointment_id: str,
+    ):
+        key = (customer_id, provider_id)
+        starts = self._booking_starts.setdefault(key, [])
+        position = bisect_left(starts, start)
+        starts.insert(position, start)
+        self._bookings.setdefault(key, []).insert(
+            position, (start, end, appointment_id)
+        )
+        self._max_booking_span = max(self._max_booking_span, end - start)
+
+    def remove_booking(self, customer_id: str, provider_id: str, appointment_id: str):
+        key = (customer_id, provider_id)
+        bookings = self._bookings.get(key, [])
+        for position, booking in enumerate(bookings):
+            if booking[2] == appointment_id:
+                del bookings[position]
+                del self._booking_starts[key][position]
+                return
+
+    def overlaps_booking(
+        self, customer_id: str, provider_id: str, start: datetime, end: datetime
+    ) -> bool:
+        """Whether [start, end) overlaps an active booking of the customer with the provider."""
+        key = (customer_id, provider_id)
+        starts = self._booking_starts.get(key)
+        if not starts:
+            return False
+        lo = bisect_left(starts, start - self._max_booking_span)
+        hi = bisect_left(starts, end, lo)
+        bookings = self._bookings[key]
+        return any(bookings[i][1] > start for i in range(lo, hi))
\ No newline at end of file
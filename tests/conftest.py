@@ -0,0 +1,15 @@
+import pytest
+from app.db import database
+
+
+@pytest.fixture
+def sql_database(tmp_path, monkeypatch):
+    """Points the SQL backend at a fresh SQLite file; SqlRepository seeds
+    it on first load."""
+    url = f"sqlite:///{tmp_path / 'appointment.db'}"
+    monkeypatch.setattr(database, "DATABASE_URL", url)
+    monkeypatch.setattr(database, "ASYNC_DATABASE_URL", database._async_url(url))
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_async_engine", None)
+    yield url
+    database.get_engine().dispose()
@@ -0,0 +1,57 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app.store.availability_bits import AvailabilityBitmap
+from app.store.availability_rules import as_rule, rules_for
+from app.store.availability_versions import AvailabilityVersions
+
+MONDAY = date(2026, 11, 2)
+
+
+def config(provider_id: str, *entries) -> dict:
+    return {
+        "id": provider_id,
+        "provider_id": provider_id,
+        "month": MONDAY.strftime("%Y-%m"),
+        "weekly_template": {0: [as_rule(entry) for entry in entries]},
+        "exceptions": {},
+        "holiday_calendar": None,
+        "updated_at": datetime(2026, 10, 1),
+    }
+
+
+def planned_starts(cfg: dict, day: date) -> list[datetime]:
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    return [start for start, _ in rules_for(cfg).slots(end - timedelta(days=1), end)]
+
+
+@pytest.mark.parametrize("minutes", [15, 20, 45])
+def test_off_grid_durations(minutes):
+    cfg = config("p", ("09:00", "12:00", {"duration_minutes": minutes}))
+    bitmap = AvailabilityBitmap.build(AvailabilityVersions([cfg]), [], MONDAY, 7)
+    assert bitmap.free_starts("p", MONDAY) == planned_starts(cfg, MONDAY)
+
+
+def test_refining_keeps_the_coarser_bits():
+    coarse = config("a", ("09:00", "11:00"))
+    fine = config("b", ("09:05", "10:00", {"duration_minutes": 20}))
+    bitmap = AvailabilityBitmap.build(AvailabilityVersions([coarse]), [], MONDAY, 7)
+    nine = datetime.combine(MONDAY, datetime.min.time()) + timedelta(hours=9)
+    bitmap.put_slot(
+        {
+            "provider_id": "a",
+            "start_datetime": nine,
+            "end_datetime": nine + timedelta(minutes=30),
+            "is_booked": True,
+        }
+    )
+    bitmap.set_config(fine)
+
+    assert bitmap.grid_minutes == 5
+    assert bitmap.free_starts("a", MONDAY) == planned_starts(coarse, MONDAY)[1:]
+    assert bitmap.free_starts("b", MONDAY) == planned_starts(fine, MONDAY)
+    found = bitmap.first_free(["a", "b"], nine, nine + timedelta(hours=1), 3)
+    assert found == [
+        (nine + timedelta(minutes=5), "b"),
+        (nine + timedelta(minutes=25), "b"),
+        (nine + timedelta(minutes=30), "a"),
+    ]
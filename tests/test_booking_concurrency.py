@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from sqlmodel import Session, select
+from app.db import database
+from app.db.models import AppointmentDB
+from app.db.repository import SqlRepository
+from app.store.data_store import DataStore
+from app.store.slot_engine import slot_uuid
+
+SLOT_TAKEN = "Error: Slot is already booked."
+
+
+def stored_bookings(slot_id: str) -> list[AppointmentDB]:
+    with Session(database.get_engine()) as session:
+        return list(
+            session.exec(
+                select(AppointmentDB).where(
+                    AppointmentDB.slot_id == slot_uuid(slot_id),
+                    AppointmentDB.status != "Cancelled",
+                )
+            )
+        )
+
+
+def test_concurrent_bookings_of_one_slot_have_one_winner(sql_database):
+    # four workers, each with its own store on the file
+    stores = [DataStore(SqlRepository()) for _ in range(4)]
+    slot_id = stores[0].first_available_slots(1)[0]["id"]
+    customer_ids = sorted(stores[0].customers)
+    attempts = [
+        (store, customer_ids[i % len(customer_ids)])
+        for i, store in enumerate(stores * 3)
+    ]
+
+    def book(attempt):
+        store, customer_id = attempt
+        return store.book_slot(customer_id, slot_id, "Admin", "Admin")
+
+    async def book_async(attempt):
+        store, customer_id = attempt
+        return await store.book_slot_async(customer_id, slot_id, "Admin", "Admin")
+
+    async def book_all():
+        with ThreadPoolExecutor(4) as pool:
+            threaded = pool.map(book, attempts[0::2])
+            awaited = await asyncio.gather(*map(book_async, attempts[1::2]))
+            return list(threaded) + awaited
+
+    results = asyncio.run(book_all())
+
+    assert results.count(None) == 1
+    assert set(results) == {None, SLOT_TAKEN}
+    assert len(stored_bookings(slot_id)) == 1
+    for store in stores:
+        assert store.get_slot(slot_id)["is_booked"]
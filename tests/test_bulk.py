@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel, select
+from app.db.bulk import bulk_insert
+from app.db.models import AvailabilityConfigDB
+
+
+def test_converter_comes_from_first_non_none_value(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    SQLModel.metadata.create_all(engine)
+    now = datetime(2026, 1, 2, 9, 30)
+    rows = [
+        dict(
+            id=uuid.uuid4(),
+            provider_id=uuid.uuid4(),
+            month="2026-01",
+            weekly_template={"0": [["09:00:00", "12:00:00"]]},
+            # None in the first batch, a dict after
+            exceptions=None if i < 3 else {f"2026-01-0{i}": []},
+            holiday_calendar=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(5)
+    ]
+    with engine.begin() as conn:
+        assert bulk_insert(conn, AvailabilityConfigDB, rows, batch_size=2) == 5
+    with Session(engine) as session:
+        stored = {c.id: c for c in session.exec(select(AvailabilityConfigDB))}
+    for row in rows:
+        assert stored[row["id"]].exceptions == row["exceptions"]
+        assert stored[row["id"]].created_at == now
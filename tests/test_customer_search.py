@@ -0,0 +1,21 @@
+from app.store.customer_search import CustomerSearchIndex
+from app.store.mock_data import mock_tables
+
+
+def search_names(term: str) -> list[str]:
+    customers = mock_tables()["customers"]
+    names = {c["id"]: c["full_name"] for c in customers}
+    index = CustomerSearchIndex.build(customers)
+    return [names[customer_id] for customer_id in index.search(term)]
+
+
+def test_name_and_mobile_terms():
+    assert search_names("JOHN") == ["John Smith"]
+    assert search_names("555-0112") == ["Jane Doe"]
+    assert search_names("(555) 011") == ["John Smith", "Jane Doe", "Peter Jones"]
+
+
+def test_mixed_term_matches_names_only():
+    assert search_names("john 5") == []
+    assert search_names("jane 0111") == []
+    assert search_names("jane d") == ["Jane Doe"]
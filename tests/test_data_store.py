@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.store import data_store
+from app.store.data_store import get_store
+
+
+@pytest.fixture
+def fresh_store(monkeypatch):
+    """No process-wide store yet, so the next get_store builds one from
+    the mock dataset."""
+    monkeypatch.setenv("DATA_STORE_BACKEND", "memory")
+    monkeypatch.setattr(data_store, "_store", None)
+
+
+def session(state_class):
+    """A new client session's instance of a page state."""
+    import app.app  # noqa: F401  registers the states
+    from reflex.state import State
+
+    root = State(_reflex_internal_init=True)
+    return root.get_substate(state_class.get_full_name().split(".")[1:])
+
+
+def test_one_store_per_process(fresh_store):
+    with ThreadPoolExecutor(8) as pool:
+        stores = list(pool.map(lambda _: get_store(), range(32)))
+    assert all(store is stores[0] for store in stores)
+
+
+def test_sessions_share_the_stores_tables(fresh_store):
+    from app.states import AppointmentsState, CalendarState
+
+    calendar, appointments = session(CalendarState), session(AppointmentsState)
+    assert calendar._store is appointments._store
+    calendar.on_calendar_load()
+    slot = calendar._store.first_available_slots(1)[0]
+    calendar.open_view_booking(slot["id"])
+
+    async def confirm():
+        async for _ in calendar.confirm_booking():
+            pass
+
+    asyncio.run(confirm())
+    booked = [
+        a
+        for a in appointments._store.appointments.values()
+        if a["slot_id"] == slot["id"]
+    ]
+    assert len(booked) == 1
+    assert appointments._get_slot_by_id(slot["id"])["is_booked"]
+
+
+def test_no_session_state_copies_the_large_tables():
+    import app.app  # noqa: F401  registers the states
+    from app.states.data_state import DataState
+
+    tables = {"slots", "appointments", "history_logs", "daily_rollups"}
+    for state in DataState.__subclasses__():
+        assert not tables & set(state.vars), state.__name__
@@ -0,0 +1,59 @@
+"""The repository's runtime queries are served by the indexes they were
+designed for, checked with EXPLAIN QUERY PLAN on an empty SQLite schema
+built from the models."""
+
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+from app.db import models  # noqa: F401  registers the tables on SQLModel.metadata
+from app.db.repository import (
+    active_appointments_query,
+    appointments_by_id_or_slot_query,
+    overlapping_appointments_query,
+)
+
+_ID = str(uuid.uuid4())
+_START = datetime(2024, 7, 1)
+_END = _START + timedelta(days=31)
+HOT_QUERIES = {
+    "customer active appointments with provider": (
+        active_appointments_query(_ID, _ID),
+        "ix_appointments_customer_provider_active",
+    ),
+    "customer appointments overlapping a slot": (
+        overlapping_appointments_query(_ID, _ID, _START, _END, _ID),
+        "ix_appointments_customer_provider_active",
+    ),
+    "appointments re-read by slot": (
+        appointments_by_id_or_slot_query([_ID], [uuid.uuid4()]),
+        "ix_appointments_slot_id",
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def explain(engine, query) -> list[str]:
+    """The SQLite query plan lines for a statement."""
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_query_uses_its_index(engine, name):
+    query, index = HOT_QUERIES[name]
+    plan = explain(engine, query)
+    assert any(index in line for line in plan), plan
+    # read in index order, never sorted in a temporary b-tree
+    assert not any("TEMP B-TREE" in line for line in plan), plan
+    assert not any(line.startswith("SCAN appointments") for line in plan), plan
@@ -0,0 +1,57 @@
+from app.store.mock_data import mock_tables
+from app.store.records import AppointmentTable, HistoryLogTable, TextColumn
+
+
+def test_text_column_keeps_edits_and_compacts():
+    column = TextColumn()
+    for text in ["first", "café", None]:
+        column.append(text)
+    for i in range(20):
+        column[0] = f"edit {i}"
+    column[1], column[2] = None, "added"
+    assert [column[row] for row in range(3)] == ["edit 19", None, "added"]
+    assert len(column._data) < 2 * len("edit 19added")
+
+
+def test_appointment_notes_round_trip():
+    appointments = mock_tables()["appointments"]
+    table = AppointmentTable.build(appointments)
+    assert list(table.values()) == appointments
+    first = dict(appointments[0], notes="Moved by phone.")
+    table[first["id"]] = first
+    assert table[first["id"]]["notes"] == "Moved by phone."
+    del table[first["id"]]
+    assert first["id"] not in table
+
+
+def test_keys_that_are_not_canonical_uuids_round_trip():
+    table = AppointmentTable()
+    appointment = mock_tables()["appointments"][0]
+    ids = ["APPT-1", appointment["id"].upper(), appointment["id"]]
+    for appointment_id in ids:
+        table[appointment_id] = dict(appointment, id=appointment_id)
+    assert list(table) == ids
+    assert [table[a]["id"] for a in ids] == ids
+    del table["APPT-1"]
+    assert "APPT-1" not in table and list(table) == ids[1:]
+
+
+def test_deleted_appointment_rows_are_compacted():
+    appointments = mock_tables()["appointments"]
+    table = AppointmentTable.build(appointments)
+    for appointment in appointments[:-1]:
+        del table[appointment["id"]]
+    assert len(table._gone) * 2 <= len(table._keys.hi)
+    assert list(table.values()) == appointments[-1:]
+    last = appointments[-1]
+    assert table.provider_has_status(last["provider_id"], [last["status"]])
+
+
+def test_history_log_ids_and_details_round_trip():
+    logs = [
+        dict(log, old_status=log.get("old_status"))
+        for log in mock_tables()["history_logs"]
+    ]
+    odd = dict(logs[0], id="LOG-1", appointment_id="Legacy", details="café")
+    table = HistoryLogTable.build([*logs, odd])
+    assert list(table) == [*logs, odd]
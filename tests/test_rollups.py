@@ -0,0 +1,36 @@
+from datetime import date, datetime
+from app.store.rollups import RollupTable
+
+
+def rollup(day: int, provider_id: str, revenue_cents: int) -> dict:
+    return dict(
+        id=f"{provider_id}:{day}",
+        business_id="b",
+        provider_id=provider_id,
+        day=date(2026, 3, day),
+        booked_slots=2,
+        available_slots=-1,
+        completed=1,
+        cancelled=0,
+        no_shows=0,
+        revenue_cents=revenue_cents,
+        updated_at=datetime(2026, 3, day),
+    )
+
+
+def test_provider_totals_sum_cents_exactly():
+    table = RollupTable(
+        [rollup(1, "p", 2**53), rollup(2, "p", 1), rollup(3, "q", 7500)]
+    )
+    totals = table.provider_totals(date(2026, 3, 1), date(2026, 3, 2))
+    assert totals == {
+        "p": {
+            "booked_slots": 4,
+            "available_slots": -2,
+            "completed": 2,
+            "cancelled": 0,
+            "no_shows": 0,
+            "revenue_cents": 2**53 + 1,
+            "offered_slots": 4,
+        }
+    }
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+import pytest
+from app.db.repository import SqlRepository
+from app.store.backends import SlotConflictError
+from app.store.data_store import STALE_APPOINTMENT_ERROR, DataStore
+
+
+@pytest.fixture
+def stores(sql_database):
+    """Two stores on one SQLite file, as two workers would load them."""
+    return DataStore(SqlRepository()), DataStore(SqlRepository())
+
+
+def test_stale_status_change_refreshes_the_appointment(stores):
+    first, second = stores
+    appointment = next(
+        a for a in first.appointments.values() if a["status"] == "Pending"
+    )
+    assert second.change_appointment_status(
+        appointment["id"], "Cancelled", "Admin", "Admin"
+    ) is None
+
+    error = first.change_appointment_status(
+        appointment["id"], "Confirmed", "Admin", "Admin"
+    )
+
+    assert error == STALE_APPOINTMENT_ERROR
+    assert first.get_appointment(appointment["id"])["status"] == "Cancelled"
+    assert not first.get_slot(appointment["slot_id"])["is_booked"]
+    assert first.aggregates.status_counts == second.aggregates.status_counts
+    assert first.book_slot(appointment["customer_id"], appointment["slot_id"]) is None
+
+
+def test_lost_slot_claim_loads_the_other_booking(stores):
+    first, second = stores
+    customer_id = sorted(first.customers)[0]
+    slot = first.first_available_slots(1)[0]
+    assert second.book_slot(customer_id, slot["id"]) is None
+
+    assert first.book_slot(customer_id, slot["id"]) == "Error: Slot is already booked."
+    booked = [
+        a for a in first.appointments.values() if a["slot_id"] == slot["id"]
+    ]
+    assert [a["status"] for a in booked] == ["Pending"]
+    assert first.aggregates.status_counts == second.aggregates.status_counts
+
+
+def test_committed_write_memory_moved_past_is_reread(stores, monkeypatch):
+    first, _ = stores
+    appointment = next(
+        a for a in first.appointments.values() if a["status"] == "Pending"
+    )
+    logs = len(first.history_logs)
+    monkeypatch.setattr(first, "_recheck", lambda write: STALE_APPOINTMENT_ERROR)
+
+    result = asyncio.run(
+        first.change_appointment_status_async(
+            appointment["id"], "Confirmed", "Admin", "Admin"
+        )
+    )
+
+    assert result is None
+    assert first.get_appointment(appointment["id"])["status"] == "Confirmed"
+    assert len(first.history_logs) == logs + 1
+    fresh = DataStore(SqlRepository())
+    assert first.aggregates.status_counts == fresh.aggregates.status_counts
+
+
+def test_second_active_appointment_on_a_slot_is_a_slot_conflict(stores):
+    first, _ = stores
+    appointment = next(
+        a for a in first.appointments.values() if a["status"] == "Pending"
+    )
+    with pytest.raises(SlotConflictError):
+        with first.backend.transaction() as tx:
+            tx.save("appointments", dict(appointment, id=str(uuid.uuid4())))